@@ -18,6 +18,12 @@ import app.models.completion_log  # noqa: F401
 import app.models.capture_item  # noqa: F401
 import app.models.push_subscription  # noqa: F401
 import app.models.notification_setting  # noqa: F401
+import app.models.scheduler_lease  # noqa: F401
+import app.models.scheduled_run  # noqa: F401
+import app.models.sync_tombstone  # noqa: F401
+import app.models.change_counter  # noqa: F401
+import app.models.change_event  # noqa: F401
+import app.models.search_index  # noqa: F401
 
 config = context.config
 config.set_main_option("sqlalchemy.url", settings.database_url)
@@ -51,7 +57,8 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
-            render_as_batch=True,
+            # batch モード（テーブル再作成）は ALTER が弱い SQLite でのみ使う
+            render_as_batch=connection.dialect.name == "sqlite",
         )
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,58 @@
+"""add composite indexes for service query shapes
+
+Revision ID: 002
+Revises: 5306c25d27ed
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "002"
+down_revision = "5306c25d27ed"
+branch_labels = None
+depends_on = None
+
+# due_date を持つ行だけを対象にする部分インデックス条件（SQLite / PostgreSQL）
+DUE_DATE_NOT_NULL = sa.text("due_date IS NOT NULL")
+
+
+def upgrade() -> None:
+    # 1. 繰り越し候補: status IN (...) AND due_date < today
+    op.create_index(
+        "ix_tasks_status_due_date",
+        "tasks",
+        ["status", "due_date"],
+        sqlite_where=DUE_DATE_NOT_NULL,
+        postgresql_where=DUE_DATE_NOT_NULL,
+    )
+
+    # 2. 今日期限: due_date = today AND status NOT IN (...) ORDER BY priority
+    op.create_index(
+        "ix_tasks_due_date_priority_status",
+        "tasks",
+        ["due_date", "priority", "status"],
+        sqlite_where=DUE_DATE_NOT_NULL,
+        postgresql_where=DUE_DATE_NOT_NULL,
+    )
+
+    # 3. 放置検知: status IN (...) AND priority = ? AND last_updated_at <= ?
+    op.create_index(
+        "ix_tasks_status_priority_last_updated_at",
+        "tasks",
+        ["status", "priority", "last_updated_at"],
+    )
+
+    # 4. チェックリスト取得: task_id = ? ORDER BY order_no
+    op.create_index(
+        "ix_task_checklist_items_task_id_order_no",
+        "task_checklist_items",
+        ["task_id", "order_no"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_checklist_items_task_id_order_no", table_name="task_checklist_items")
+    op.drop_index("ix_tasks_status_priority_last_updated_at", table_name="tasks")
+    op.drop_index("ix_tasks_due_date_priority_status", table_name="tasks")
+    op.drop_index("ix_tasks_status_due_date", table_name="tasks")
@@ -0,0 +1,40 @@
+"""add failure tracking columns to push_subscriptions
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 5306c25d27ed は push_subscriptions を作成していないため、無ければここで作成する
+    # （オフライン SQL 生成時は新規 DB を前提に作成する）
+    if context.is_offline_mode() or not sa.inspect(op.get_bind()).has_table("push_subscriptions"):
+        op.create_table(
+            "push_subscriptions",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("endpoint", sa.String, nullable=False, unique=True),
+            sa.Column("p256dh", sa.String, nullable=False),
+            sa.Column("auth", sa.String, nullable=False),
+            sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        )
+
+    with op.batch_alter_table("push_subscriptions") as batch_op:
+        batch_op.add_column(sa.Column("failure_count", sa.Integer, nullable=False, server_default="0"))
+        batch_op.add_column(sa.Column("last_failure_at", sa.DateTime, nullable=True))
+        batch_op.add_column(sa.Column("retry_after", sa.DateTime, nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("push_subscriptions") as batch_op:
+        batch_op.drop_column("retry_after")
+        batch_op.drop_column("last_failure_at")
+        batch_op.drop_column("failure_count")
@@ -0,0 +1,40 @@
+"""add scheduler_leases and scheduled_runs tables
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 1. スケジューラのリーダーリース（ワーカー間で 1 行を奪い合う）
+    op.create_table(
+        "scheduler_leases",
+        sa.Column("name", sa.String, primary_key=True),
+        sa.Column("holder", sa.String, nullable=False),
+        sa.Column("expires_at", sa.DateTime, nullable=False),
+    )
+
+    # 2. 定時ジョブの実行記録（run_key が冪等キー）
+    op.create_table(
+        "scheduled_runs",
+        sa.Column("run_key", sa.String, primary_key=True),
+        sa.Column("job_id", sa.String, nullable=False),
+        sa.Column("holder", sa.String, nullable=False),
+        sa.Column("started_at", sa.DateTime, server_default=sa.func.now(), nullable=False),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+        sa.Column("result", sa.String, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduled_runs")
+    op.drop_table("scheduler_leases")
@@ -0,0 +1,68 @@
+"""add change_counters table and write triggers
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = ("tasks", "capture_items")
+EVENTS = ("INSERT", "UPDATE", "DELETE")
+
+
+def upgrade() -> None:
+    # 1. テーブルごとの書き込みカウンタ（一覧 API の ETag に使う）
+    op.create_table(
+        "change_counters",
+        sa.Column("name", sa.String, primary_key=True),
+        sa.Column("version", sa.BigInteger, nullable=False, server_default="0"),
+    )
+    for name in TRACKED_TABLES:
+        op.execute(f"INSERT INTO change_counters (name, version) VALUES ('{name}', 0)")
+
+    # 2. INSERT / UPDATE / DELETE で version を進めるトリガー
+    #    サービス層を通らない書き込み（バルク更新・手動 SQL）も ETag に反映させるため DB 側で数える
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(
+            """
+            CREATE OR REPLACE FUNCTION bump_change_counter() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO change_counters (name, version) VALUES (TG_TABLE_NAME, 1)
+                ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        for name in TRACKED_TABLES:
+            op.execute(
+                f"CREATE TRIGGER trg_{name}_changed AFTER INSERT OR UPDATE OR DELETE ON {name} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter()"
+            )
+    else:
+        for name in TRACKED_TABLES:
+            for event in EVENTS:
+                op.execute(
+                    f"CREATE TRIGGER trg_{name}_{event.lower()}_changed AFTER {event} ON {name} "
+                    f"BEGIN INSERT INTO change_counters (name, version) VALUES ('{name}', 1) "
+                    "ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1; END"
+                )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        for name in TRACKED_TABLES:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{name}_changed ON {name}")
+        op.execute("DROP FUNCTION IF EXISTS bump_change_counter()")
+    else:
+        for name in TRACKED_TABLES:
+            for event in EVENTS:
+                op.execute(f"DROP TRIGGER IF EXISTS trg_{name}_{event.lower()}_changed")
+    op.drop_table("change_counters")
@@ -0,0 +1,33 @@
+"""add change_events table
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "006"
+down_revision = "005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SSE（GET /events）で配信する変更イベント。id が Last-Event-ID になる
+    op.create_table(
+        "change_events",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("event_type", sa.String, nullable=False),
+        sa.Column("payload", sa.Text, nullable=False),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now(), nullable=False),
+        sqlite_autoincrement=True,
+    )
+    # 保持期間を過ぎたイベントの削除用
+    op.create_index("ix_change_events_created_at", "change_events", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_change_events_created_at", table_name="change_events")
+    op.drop_table("change_events")
@@ -0,0 +1,119 @@
+"""add sync_version columns, sync_tombstones and sync triggers
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+SYNC_TABLES = ("tasks", "task_checklist_items", "completion_logs", "capture_items")
+
+SQLITE_BUMP = (
+    "INSERT INTO change_counters (name, version) VALUES ('sync', 1) "
+    "ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1; "
+)
+SQLITE_CURRENT = "(SELECT version FROM change_counters WHERE name = 'sync')"
+
+
+def upgrade() -> None:
+    # 1. 行ごとの変更番号（既存行は 0 = 初回の全件同期でのみ返る）
+    # batch モードのテーブル再作成は 005 のトリガーを消すため、ALTER TABLE で直接追加・削除する
+    for table in SYNC_TABLES:
+        op.add_column(table, sa.Column("sync_version", sa.BigInteger, nullable=False, server_default="0"))
+        op.create_index(f"ix_{table}_sync_version", table, ["sync_version"])
+
+    # 2. 削除の墓標
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("entity", sa.String, nullable=False),
+        sa.Column("entity_id", sa.Integer, nullable=False),
+        sa.Column("sync_version", sa.BigInteger, nullable=False),
+    )
+    op.create_index("ix_sync_tombstones_sync_version", "sync_tombstones", ["sync_version"])
+    op.execute("INSERT INTO change_counters (name, version) VALUES ('sync', 0)")
+
+    # 3. INSERT / UPDATE で sync_version を採番し、DELETE で墓標を残すトリガー
+    #    子タスクの parent_id の付け替えなど、連鎖的な書き込みもすべて差分に載る
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(
+            """
+            CREATE OR REPLACE FUNCTION stamp_sync_version() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO change_counters (name, version) VALUES ('sync', 1)
+                ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1
+                RETURNING version INTO NEW.sync_version;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            """
+            CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+            DECLARE
+                current_version BIGINT;
+            BEGIN
+                INSERT INTO change_counters (name, version) VALUES ('sync', 1)
+                ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1
+                RETURNING version INTO current_version;
+                INSERT INTO sync_tombstones (entity, entity_id, sync_version)
+                VALUES (TG_TABLE_NAME, OLD.id, current_version);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        for table in SYNC_TABLES:
+            op.execute(
+                f"CREATE TRIGGER trg_{table}_sync_stamp BEFORE INSERT OR UPDATE ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION stamp_sync_version()"
+            )
+            op.execute(
+                f"CREATE TRIGGER trg_{table}_sync_delete AFTER DELETE ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()"
+            )
+    else:
+        for table in SYNC_TABLES:
+            op.execute(
+                f"CREATE TRIGGER trg_{table}_sync_insert AFTER INSERT ON {table} BEGIN "
+                f"{SQLITE_BUMP}UPDATE {table} SET sync_version = {SQLITE_CURRENT} WHERE id = NEW.id; END"
+            )
+            op.execute(
+                f"CREATE TRIGGER trg_{table}_sync_update AFTER UPDATE ON {table} "
+                "WHEN NEW.sync_version IS OLD.sync_version BEGIN "
+                f"{SQLITE_BUMP}UPDATE {table} SET sync_version = {SQLITE_CURRENT} WHERE id = NEW.id; END"
+            )
+            op.execute(
+                f"CREATE TRIGGER trg_{table}_sync_delete AFTER DELETE ON {table} BEGIN "
+                f"{SQLITE_BUMP}INSERT INTO sync_tombstones (entity, entity_id, sync_version) "
+                f"VALUES ('{table}', OLD.id, {SQLITE_CURRENT}); END"
+            )
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_context().dialect.name == "postgresql"
+    for table in SYNC_TABLES:
+        if is_postgresql:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_sync_stamp ON {table}")
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_sync_delete ON {table}")
+        else:
+            for kind in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_sync_{kind}")
+    if is_postgresql:
+        op.execute("DROP FUNCTION IF EXISTS stamp_sync_version()")
+        op.execute("DROP FUNCTION IF EXISTS record_sync_tombstone()")
+
+    op.execute("DELETE FROM change_counters WHERE name = 'sync'")
+    op.drop_index("ix_sync_tombstones_sync_version", table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
+    for table in SYNC_TABLES:
+        op.drop_index(f"ix_{table}_sync_version", table_name=table)
+        op.execute(f"ALTER TABLE {table} DROP COLUMN sync_version")
@@ -0,0 +1,66 @@
+"""add FTS5 search index and its triggers
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+# (種別, 元テーブル, title 列の式, body 列の式, 変更を監視する列)
+# rowid = 元の行の id * 4 + 種別
+SEARCH_SOURCES = (
+    (
+        0,
+        "tasks",
+        "{row}.title",
+        "coalesce({row}.done_criteria, '') || char(10) || coalesce({row}.decision_criteria, '')",
+        "title, done_criteria, decision_criteria",
+    ),
+    (1, "task_checklist_items", "{row}.text", "''", "text"),
+    (2, "capture_items", "{row}.text", "''", "text"),
+)
+
+
+def upgrade() -> None:
+    # FTS5 は SQLite 専用。PostgreSQL では search_service が ILIKE にフォールバックする
+    if op.get_context().dialect.name != "sqlite":
+        return
+
+    # 1. trigram トークナイザの全文検索テーブル（日本語も 3 文字以上の部分一致で引ける）
+    op.execute("CREATE VIRTUAL TABLE search_index USING fts5(title, body, tokenize = 'trigram')")
+
+    # 2. 元テーブルの INSERT / UPDATE / DELETE に追従するトリガー
+    for kind, table, title, body, columns in SEARCH_SOURCES:
+        insert = (
+            "INSERT INTO search_index (rowid, title, body) "
+            f"VALUES (NEW.id * 4 + {kind}, {title.format(row='NEW')}, {body.format(row='NEW')});"
+        )
+        delete = f"DELETE FROM search_index WHERE rowid = OLD.id * 4 + {kind};"
+        op.execute(f"CREATE TRIGGER trg_{table}_search_insert AFTER INSERT ON {table} BEGIN {insert} END")
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_search_update AFTER UPDATE OF {columns} ON {table} "
+            f"BEGIN {delete} {insert} END"
+        )
+        op.execute(f"CREATE TRIGGER trg_{table}_search_delete AFTER DELETE ON {table} BEGIN {delete} END")
+
+    # 3. 既存データの取り込み
+    for kind, table, title, body, _ in SEARCH_SOURCES:
+        op.execute(
+            "INSERT INTO search_index (rowid, title, body) "
+            f"SELECT id * 4 + {kind}, {title.format(row=table)}, {body.format(row=table)} FROM {table}"
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "sqlite":
+        return
+    for _, table, *_ in SEARCH_SOURCES:
+        for kind in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_{kind}")
+    op.execute("DROP TABLE IF EXISTS search_index")
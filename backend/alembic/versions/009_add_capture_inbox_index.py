@@ -0,0 +1,26 @@
+"""add capture inbox index
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # キャプチャ受信箱: is_resolved = ? ORDER BY created_at DESC, id DESC のキーセットページング
+    op.create_index(
+        "ix_capture_items_is_resolved_created_at",
+        "capture_items",
+        ["is_resolved", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_capture_items_is_resolved_created_at", table_name="capture_items")
@@ -0,0 +1,27 @@
+"""add retry tracking columns to scheduled_runs
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 失敗した回・取得したまま止まった回を再取得するため、最後に取得した時刻と試行回数を持つ
+    with op.batch_alter_table("scheduled_runs") as batch_op:
+        batch_op.add_column(sa.Column("claimed_at", sa.DateTime, nullable=True))
+        batch_op.add_column(sa.Column("attempts", sa.Integer, nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("scheduled_runs") as batch_op:
+        batch_op.drop_column("attempts")
+        batch_op.drop_column("claimed_at")
@@ -0,0 +1,25 @@
+"""allocate change event ids from change_counters
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+revision = "011"
+down_revision = "010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # change_events.id を commit 順に採番するカウンタ。既存のイベントの続きから数える
+    op.execute(
+        "INSERT INTO change_counters (name, version) "
+        "SELECT 'events', coalesce(max(id), 0) FROM change_events"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM change_counters WHERE name = 'events'")
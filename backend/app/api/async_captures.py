@@ -0,0 +1,55 @@
+"""captures ルーターの async 版（settings.async_db が有効なときに main.py で差し替える）。"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import make_etag, not_modified
+from app.api.tasks import list_response
+from app.db.session import get_async_db
+from app.schemas.capture_item import (
+    CaptureCreateRequest,
+    CaptureItemResponse,
+    CaptureTriageRequest,
+    CaptureTriageResponse,
+    CaptureUpdateRequest,
+)
+from app.services import async_capture_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[CaptureItemResponse])
+async def list_captures(
+    request: Request,
+    response: Response,
+    is_resolved: Optional[bool] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    cached = not_modified(request, response, make_etag(await async_capture_service.get_captures_version(db)))
+    if cached:
+        return cached
+    result = await async_capture_service.get_captures(db, is_resolved=is_resolved, limit=limit, cursor=cursor)
+    return list_response(result, response)
+
+
+@router.post("", response_model=CaptureItemResponse, status_code=status.HTTP_201_CREATED)
+async def create_capture(data: CaptureCreateRequest, db: AsyncSession = Depends(get_async_db)):
+    return await async_capture_service.create_capture(db, data)
+
+
+@router.post("/triage", response_model=CaptureTriageResponse)
+async def triage_captures(data: CaptureTriageRequest, db: AsyncSession = Depends(get_async_db)):
+    return await async_capture_service.triage_captures(db, data)
+
+
+@router.patch("/{capture_id}", response_model=CaptureItemResponse)
+async def update_capture(capture_id: int, data: CaptureUpdateRequest, db: AsyncSession = Depends(get_async_db)):
+    return await async_capture_service.update_capture(db, capture_id, data)
+
+
+@router.delete("/{capture_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_capture(capture_id: int, db: AsyncSession = Depends(get_async_db)):
+    await async_capture_service.delete_capture(db, capture_id)
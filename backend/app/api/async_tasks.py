@@ -0,0 +1,156 @@
+"""tasks ルーターの async 版（settings.async_db が有効なときに main.py で差し替える）。"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import make_etag, not_modified
+from app.api.fast_json import fast_json
+from app.api.tasks import detail_response, list_response, stale_etag
+from app.db.session import get_async_db
+from app.schemas.completion_log import CompleteRequest, CompletionLogResponse
+from app.schemas.enums import Priority, TaskStatus, TaskType
+from app.schemas.task import (
+    BulkResponse,
+    ConvergenceResponse,
+    StaleTaskResponse,
+    TaskBulkRequest,
+    TaskCreateRequest,
+    TaskDetailResponse,
+    TaskResponse,
+    TaskTreeNodeResponse,
+    TaskUpdateRequest,
+)
+from app.services import async_task_service, task_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[TaskResponse])
+async def list_tasks(
+    request: Request,
+    response: Response,
+    status: list[TaskStatus] = Query(default=[]),
+    task_type: Optional[TaskType] = None,
+    priority: Optional[Priority] = None,
+    parent_id: Optional[int] = None,
+    sort_by: str = Query(default="due_date", pattern="^(due_date|created_at)$"),
+    order: str = Query(default="asc", pattern="^(asc|desc)$"),
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, description="カンマ区切りの返却フィールド（id は常に含む）"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    cached = not_modified(request, response, make_etag(await async_task_service.get_tasks_version(db)))
+    if cached:
+        return cached
+    result = await async_task_service.get_tasks(
+        db,
+        statuses=status,
+        task_type=task_type,
+        priority=priority,
+        parent_id=parent_id,
+        sort_by=sort_by,
+        order=order,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
+    )
+    return list_response(result, response)
+
+
+# /stale は /{task_id} より先に定義する必要がある
+@router.get("/stale", response_model=list[StaleTaskResponse])
+async def list_stale_tasks(
+    request: Request,
+    response: Response,
+    priority: Optional[Priority] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    cached = not_modified(request, response, stale_etag(await async_task_service.get_tasks_version(db)))
+    if cached:
+        return cached
+    rows = await async_task_service.get_stale_tasks(db, priority=priority, limit=limit, order=order)
+    return fast_json(rows, response)
+
+
+# /convergence も /{task_id} より先に定義する
+@router.get("/convergence", response_model=list[ConvergenceResponse])
+async def list_convergence(
+    ids: list[int] = Query(min_length=1, max_length=500),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await async_task_service.get_convergence_batch(db, ids)
+
+
+@router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+async def create_task(data: TaskCreateRequest, db: AsyncSession = Depends(get_async_db)):
+    return await async_task_service.create_task(db, data)
+
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_tasks(data: TaskBulkRequest, db: AsyncSession = Depends(get_async_db)):
+    return {"results": await async_task_service.bulk_apply(db, data.operations)}
+
+
+@router.get("/{task_id}", response_model=TaskDetailResponse)
+async def get_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    return detail_response(await async_task_service.get_task_detail(db, task_id))
+
+
+@router.patch("/{task_id}", response_model=TaskResponse)
+async def update_task(task_id: int, data: TaskUpdateRequest, db: AsyncSession = Depends(get_async_db)):
+    return await async_task_service.update_task(db, task_id, data)
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(
+    task_id: int,
+    recursive: bool = Query(default=False, description="true なら子孫タスクもまとめて削除する"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    await async_task_service.delete_task(db, task_id, recursive)
+
+
+@router.get("/{task_id}/children", response_model=list[TaskResponse])
+async def list_children(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await async_task_service.get_children(db, task_id)
+
+
+@router.get("/{task_id}/tree", response_model=list[TaskTreeNodeResponse])
+async def get_task_tree(
+    task_id: int,
+    depth: Optional[int] = Query(default=None, ge=0, le=task_service.TREE_MAX_DEPTH),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await async_task_service.get_task_tree(db, task_id, depth=depth)
+
+
+@router.post(
+    "/{task_id}/children",
+    response_model=TaskResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_child(task_id: int, data: TaskCreateRequest, db: AsyncSession = Depends(get_async_db)):
+    return await async_task_service.create_child(db, task_id, data)
+
+
+@router.post(
+    "/{task_id}/complete",
+    response_model=CompletionLogResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def complete_task(task_id: int, data: CompleteRequest, db: AsyncSession = Depends(get_async_db)):
+    return await async_task_service.complete_task(db, task_id, data)
+
+
+@router.get("/{task_id}/completion-log", response_model=list[CompletionLogResponse])
+async def get_completion_log(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await async_task_service.get_completion_logs(db, task_id)
+
+
+@router.get("/{task_id}/convergence", response_model=ConvergenceResponse)
+async def get_convergence(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await async_task_service.get_convergence(db, task_id)
@@ -0,0 +1,65 @@
+"""GET /export・POST /import: 全データの NDJSON でのバックアップと復元（app/services/backup_service.py）。"""
+from datetime import date
+from typing import Iterator
+
+import anyio
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.fast_json import dumps
+from app.db.session import get_db, get_read_db
+from app.models.notification_setting import NotificationSetting
+from app.schemas.backup import ImportResponse
+from app.services import backup_service
+from app.services.scheduler import update_schedule
+
+router = APIRouter()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _encode(batches: Iterator[list[dict]]) -> Iterator[bytes]:
+    # StreamingResponse は同期イテレータを 1 要素ごとにスレッドプールで進めるため、行ではなくバッチ単位で渡す
+    for records in batches:
+        yield b"".join(dumps(record) + b"\n" for record in records)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "1 行 1 レコードの NDJSON"}},
+)
+def export_data(db: Session = Depends(get_read_db)):
+    # セッションの後始末は iter_export が行う（依存関係の終了処理はストリーム送信前に走るため）
+    filename = f"task_app-{date.today().isoformat()}.ndjson"
+    return StreamingResponse(
+        _encode(backup_service.iter_export(db)),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _iter_body(request: Request) -> Iterator[bytes]:
+    """リクエスト本文を受信しながら同期的に読む（スレッドプールで動く同期ルートから使う）。"""
+    stream = request.stream()
+    while True:
+        try:
+            yield anyio.from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+
+
+@router.post(
+    "/import",
+    response_model=ImportResponse,
+    openapi_extra={
+        "requestBody": {"required": True, "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}}}
+    },
+)
+def import_data(request: Request, db: Session = Depends(get_db)):
+    result = backup_service.import_ndjson(db, _iter_body(request))
+    setting = db.get(NotificationSetting, 1)
+    if setting:
+        update_schedule(setting.notify_time_1, setting.notify_time_2, setting.enabled)
+    return result
@@ -1,18 +1,37 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.schemas.capture_item import CaptureCreateRequest, CaptureItemResponse, CaptureUpdateRequest
+from app.api.conditional import make_etag, not_modified
+from app.api.tasks import list_response
+from app.db.session import get_db, get_read_db
+from app.schemas.capture_item import (
+    CaptureCreateRequest,
+    CaptureItemResponse,
+    CaptureTriageRequest,
+    CaptureTriageResponse,
+    CaptureUpdateRequest,
+)
 from app.services import capture_service
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[CaptureItemResponse])
-def list_captures(is_resolved: Optional[bool] = None, db: Session = Depends(get_db)):
-    return capture_service.get_captures(db, is_resolved=is_resolved)
+def list_captures(
+    request: Request,
+    response: Response,
+    is_resolved: Optional[bool] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    cached = not_modified(request, response, make_etag(capture_service.get_captures_version(db)))
+    if cached:
+        return cached
+    result = capture_service.get_captures(db, is_resolved=is_resolved, limit=limit, cursor=cursor)
+    return list_response(result, response)
 
 
 @router.post("", response_model=CaptureItemResponse, status_code=status.HTTP_201_CREATED)
@@ -20,6 +39,12 @@ def create_capture(data: CaptureCreateRequest, db: Session = Depends(get_db)):
     return capture_service.create_capture(db, data)
 
 
+# /triage は /{capture_id} より先に定義する
+@router.post("/triage", response_model=CaptureTriageResponse)
+def triage_captures(data: CaptureTriageRequest, db: Session = Depends(get_db)):
+    return capture_service.triage_captures(db, data)
+
+
 @router.patch("/{capture_id}", response_model=CaptureItemResponse)
 def update_capture(capture_id: int, data: CaptureUpdateRequest, db: Session = Depends(get_db)):
     return capture_service.update_capture(db, capture_id, data)
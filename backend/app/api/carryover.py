@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.api.conditional import make_etag, not_modified
+from app.api.fast_json import fast_json
+from app.db.session import get_db, get_read_db
 from app.schemas.enums import CarryoverAction
-from app.schemas.task import CarryoverCandidateResponse, TaskResponse
-from app.services import carryover_service
-from pydantic import BaseModel
+from app.schemas.task import BulkResponse, CarryoverCandidateResponse, TaskResponse
+from app.services import carryover_service, task_service
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
@@ -14,10 +18,29 @@ class CarryoverRequest(BaseModel):
     action: CarryoverAction
 
 
+class CarryoverBulkItem(BaseModel):
+    task_id: int
+    action: CarryoverAction
+
+
+class CarryoverBulkRequest(BaseModel):
+    items: list[CarryoverBulkItem] = Field(min_length=1, max_length=500)
+
+
 @router.get("/carryover-candidates", response_model=list[CarryoverCandidateResponse])
-def list_carryover_candidates(db: Session = Depends(get_db)):
-    rows = carryover_service.get_carryover_candidates(db)
-    return [CarryoverCandidateResponse.model_validate(r) for r in rows]
+def list_carryover_candidates(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    # 超過日数は日付で変わるため当日の日付も ETag に含める
+    etag = make_etag(task_service.get_tasks_version(db), date.today().isoformat())
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    return fast_json(carryover_service.get_carryover_candidates(db), response)
+
+
+@router.post("/carryover/bulk", response_model=BulkResponse)
+def do_carryover_bulk(data: CarryoverBulkRequest, db: Session = Depends(get_db)):
+    items = [(item.task_id, item.action) for item in data.items]
+    return {"results": carryover_service.bulk_carryover(db, items)}
 
 
 @router.post("/{task_id}/carryover", response_model=TaskResponse)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas.checklist_item import (
     ChecklistItemCreate,
     ChecklistItemResponse,
@@ -15,7 +15,7 @@ router = APIRouter()
 
 
 @router.get("/{task_id}/checklist", response_model=list[ChecklistItemResponse])
-def get_checklist(task_id: int, db: Session = Depends(get_db)):
+def get_checklist(task_id: int, db: Session = Depends(get_read_db)):
     return task_service.get_checklist(db, task_id)
 
 
@@ -0,0 +1,32 @@
+"""一覧 API の ETag / If-None-Match（条件付き GET）。"""
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts) -> str:
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 弱い比較（W/ 接頭辞は無視する）
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """If-None-Match が一致すれば 304 を返す。一致しなければ response に ETag を付けて None を返す。
+
+    Cache-Control: no-cache でブラウザに毎回の再検証（If-None-Match 付き）をさせる。
+    """
+    headers = {ETAG_HEADER: etag, "Cache-Control": "no-cache"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,91 @@
+"""GET /events: 変更イベントの Server-Sent Events ストリーム。"""
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import get_read_db
+from app.services import event_service
+from app.services.event_broker import broker
+
+router = APIRouter()
+
+RESET_EVENT = event_service.RESET
+RECONNECT_MS = 3000
+
+
+def format_event(event: dict) -> str:
+    data = json.dumps(event["data"], ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+def _backlog(db: Session, last_event_id: int) -> list[dict]:
+    """Last-Event-ID 以降のイベント。保持期間切れで欠落がある場合は reset だけを返す。"""
+    oldest = event_service.oldest_id(db)
+    events = event_service.events_since(db, last_event_id)
+    if oldest is None:
+        # 全件削除済み。発行済みの id より古い位置からの再開なら取りこぼしている
+        latest = event_service.latest_id(db)
+        return [{"id": latest, "type": RESET_EVENT, "data": {}}] if last_event_id < latest else []
+    if oldest > last_event_id + 1:
+        # 取りこぼしがあるのでクライアントに一覧の再取得を促す
+        latest = events[-1]["id"] if events else last_event_id
+        return [{"id": latest, "type": RESET_EVENT, "data": {}}]
+    return events
+
+
+async def event_stream(
+    request: Request,
+    queue: asyncio.Queue,
+    backlog: list[dict],
+    last_event_id: int = 0,
+    heartbeat_seconds: Optional[float] = None,
+) -> AsyncIterator[str]:
+    heartbeat_seconds = heartbeat_seconds or settings.events_heartbeat_seconds
+    sent_id = last_event_id
+    try:
+        yield f"retry: {RECONNECT_MS}\n\n"
+        for event in backlog:
+            yield format_event(event)
+            sent_id = event["id"]
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                # プロキシのアイドル切断を防ぐためのコメント行
+                yield ": heartbeat\n\n"
+                continue
+            if event is None:
+                # 配信が追いつかず切断された。クライアントは Last-Event-ID で再開する
+                break
+            # 購読開始と backlog 取得の間に届いた分は重複するので読み飛ばす
+            if event["id"] <= sent_id:
+                continue
+            yield format_event(event)
+            sent_id = event["id"]
+    finally:
+        broker.unsubscribe(queue)
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[int] = Header(default=None),
+    db: Session = Depends(get_read_db),
+):
+    # 先に購読してから backlog を読むことで、その間のイベントを取りこぼさない
+    queue = broker.subscribe()
+    try:
+        backlog = await asyncio.to_thread(_backlog, db, last_event_id) if last_event_id is not None else []
+    except Exception:
+        broker.unsubscribe(queue)
+        raise
+    return StreamingResponse(
+        event_stream(request, queue, backlog, last_event_id or 0),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
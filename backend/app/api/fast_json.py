@@ -0,0 +1,33 @@
+"""一覧 API の JSON 応答（行ごとの Pydantic 検証を通さない高速経路）。
+
+サービス層が SELECT の結果行から作った dict（レスポンスモデルと同じキー・順序）を、そのまま
+orjson で JSON バイト列にする。
+
+ルートの response_model はそのまま残すため OpenAPI スキーマは変わらない（Response を返すと
+FastAPI は検証・変換を省く）。出力は Pydantic の JSON と同じ形（date / datetime は ISO 8601）。
+"""
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+
+def dumps(content: Any) -> bytes:
+    # date / datetime は ISO 8601、Enum は値になる（Pydantic の JSON 出力と同じ）
+    return orjson.dumps(content)
+
+
+def loads(data: bytes | str) -> Any:
+    return orjson.loads(data)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json(content: Any, response: Response) -> FastJSONResponse:
+    """response に積んだヘッダー（ETag・X-Next-Cursor など）を引き継いで返す。"""
+    return FastJSONResponse(content, headers=dict(response.headers))
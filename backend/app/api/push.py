@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.notification_setting import NotificationSetting
 from app.models.push_subscription import PushSubscription
 from app.schemas.notification_setting import (
@@ -39,11 +39,9 @@ def unsubscribe(req: PushSubscribeRequest, db: Session = Depends(get_db)):
 
 @router.post("/send-test")
 def send_test(req: PushSendRequest, db: Session = Depends(get_db)):
-    subscriptions = db.query(PushSubscription).all()
-    if not subscriptions:
+    if not db.query(PushSubscription.id).first():
         raise HTTPException(status_code=404, detail="No subscriptions found")
-    sent = sum(1 for sub in subscriptions if push_service.send_push(sub, req.title, req.body))
-    return {"sent": sent, "total": len(subscriptions)}
+    return push_service.broadcast(db, req.title, req.body)
 
 
 @router.post("/send-today-due")
@@ -53,7 +51,7 @@ def send_today_due(db: Session = Depends(get_db)):
 
 
 @router.get("/notification-setting", response_model=NotificationSettingResponse)
-def get_notification_setting(db: Session = Depends(get_db)):
+def get_notification_setting(db: Session = Depends(get_read_db)):
     setting = db.query(NotificationSetting).filter(NotificationSetting.id == 1).first()
     if not setting:
         # 初期デフォルト値を返す
@@ -0,0 +1,21 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_read_db
+from app.schemas.search import SearchResponse
+from app.services import search_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(min_length=1, max_length=200, description="空白区切りの検索語（すべてを含む行を返す）"),
+    type: list[Literal["task", "checklist_item", "capture"]] = Query(default=[]),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    return search_service.search(db, q, types=type, limit=limit, offset=offset)
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_read_db
+from app.schemas.sync import SyncResponse
+from app.services import sync_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=SyncResponse)
+def sync(
+    since: Optional[int] = Query(default=None, ge=0, description="前回レスポンスの cursor（省略時は全件）"),
+    db: Session = Depends(get_read_db),
+):
+    return sync_service.get_changes(db, since=since)
@@ -1,18 +1,23 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.api.conditional import make_etag, not_modified
+from app.api.fast_json import fast_json
+from app.db.session import get_db, get_read_db
 from app.schemas.completion_log import CompleteRequest, CompletionLogResponse
 from app.schemas.enums import Priority, TaskStatus, TaskType
 from app.schemas.task import (
+    BulkResponse,
     CarryoverCandidateResponse,
     ConvergenceResponse,
     StaleTaskResponse,
+    TaskBulkRequest,
     TaskCreateRequest,
     TaskDetailResponse,
     TaskResponse,
+    TaskTreeNodeResponse,
     TaskUpdateRequest,
 )
 from app.services import task_service
@@ -20,17 +25,29 @@ from app.services import task_service
 router = APIRouter()
 
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
 @router.get("", response_model=list[TaskResponse])
 def list_tasks(
+    request: Request,
+    response: Response,
     status: list[TaskStatus] = Query(default=[]),
     task_type: Optional[TaskType] = None,
     priority: Optional[Priority] = None,
     parent_id: Optional[int] = None,
     sort_by: str = Query(default="due_date", pattern="^(due_date|created_at)$"),
     order: str = Query(default="asc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, description="カンマ区切りの返却フィールド（id は常に含む）"),
+    db: Session = Depends(get_read_db),
 ):
-    return task_service.get_tasks(
+    # 変更が無ければカウンタ 1 行の参照だけで 304 を返す（一覧の取得・シリアライズをしない）
+    cached = not_modified(request, response, make_etag(task_service.get_tasks_version(db)))
+    if cached:
+        return cached
+    result = task_service.get_tasks(
         db,
         statuses=status,
         task_type=task_type,
@@ -38,17 +55,49 @@ def list_tasks(
         parent_id=parent_id,
         sort_by=sort_by,
         order=order,
+        limit=limit,
+        cursor=cursor,
+        fields=fields,
     )
+    return list_response(result, response)
+
+
+def list_response(result: dict, response: Response):
+    # 次ページのカーソルはボディの形を変えないようヘッダーで返す
+    if result["next_cursor"]:
+        response.headers[NEXT_CURSOR_HEADER] = result["next_cursor"]
+    # items は SELECT 結果の dict なので検証を通さず直接 JSON にする（fields の射影結果・キャプチャも同じ）
+    return fast_json(result["items"], response)
 
 
 # /stale は /{task_id} より先に定義する必要がある
 @router.get("/stale", response_model=list[StaleTaskResponse])
 def list_stale_tasks(
+    request: Request,
+    response: Response,
     priority: Optional[Priority] = None,
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    db: Session = Depends(get_read_db),
+):
+    cached = not_modified(request, response, stale_etag(task_service.get_tasks_version(db)))
+    if cached:
+        return cached
+    return fast_json(task_service.get_stale_tasks(db, priority=priority, limit=limit, order=order), response)
+
+
+def stale_etag(version: int) -> str:
+    # 放置日数は書き込みが無くても時刻の経過で増えるため、分単位で ETag を切り替える
+    return make_etag(version, task_service._now().strftime("%Y%m%d%H%M"))
+
+
+# /convergence も /{task_id} より先に定義する
+@router.get("/convergence", response_model=list[ConvergenceResponse])
+def list_convergence(
+    ids: list[int] = Query(min_length=1, max_length=500),
+    db: Session = Depends(get_read_db),
 ):
-    rows = task_service.get_stale_tasks(db, priority=priority)
-    return [StaleTaskResponse.model_validate(r) for r in rows]
+    return task_service.get_convergence_batch(db, ids)
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -56,16 +105,23 @@ def create_task(data: TaskCreateRequest, db: Session = Depends(get_db)):
     return task_service.create_task(db, data)
 
 
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_tasks(data: TaskBulkRequest, db: Session = Depends(get_db)):
+    return {"results": task_service.bulk_apply(db, data.operations)}
+
+
 @router.get("/{task_id}", response_model=TaskDetailResponse)
-def get_task(task_id: int, db: Session = Depends(get_db)):
-    result = task_service.get_task_detail(db, task_id)
+def get_task(task_id: int, db: Session = Depends(get_read_db)):
+    return detail_response(task_service.get_task_detail(db, task_id))
+
+
+def detail_response(result: dict) -> TaskDetailResponse:
     task = result["task"]
-    origin = result["origin"]
     return TaskDetailResponse(
         **TaskResponse.model_validate(task).model_dump(),
         children=task.children,
         checklist=task.checklist,
-        origin=origin,
+        origin=result["origin"],
     )
 
 
@@ -75,15 +131,28 @@ def update_task(task_id: int, data: TaskUpdateRequest, db: Session = Depends(get
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(task_id: int, db: Session = Depends(get_db)):
-    task_service.delete_task(db, task_id)
+def delete_task(
+    task_id: int,
+    recursive: bool = Query(default=False, description="true なら子孫タスクもまとめて削除する"),
+    db: Session = Depends(get_db),
+):
+    task_service.delete_task(db, task_id, recursive)
 
 
 @router.get("/{task_id}/children", response_model=list[TaskResponse])
-def list_children(task_id: int, db: Session = Depends(get_db)):
+def list_children(task_id: int, db: Session = Depends(get_read_db)):
     return task_service.get_children(db, task_id)
 
 
+@router.get("/{task_id}/tree", response_model=list[TaskTreeNodeResponse])
+def get_task_tree(
+    task_id: int,
+    depth: Optional[int] = Query(default=None, ge=0, le=task_service.TREE_MAX_DEPTH),
+    db: Session = Depends(get_read_db),
+):
+    return task_service.get_task_tree(db, task_id, depth=depth)
+
+
 @router.post(
     "/{task_id}/children",
     response_model=TaskResponse,
@@ -103,10 +172,10 @@ def complete_task(task_id: int, data: CompleteRequest, db: Session = Depends(get
 
 
 @router.get("/{task_id}/completion-log", response_model=list[CompletionLogResponse])
-def get_completion_log(task_id: int, db: Session = Depends(get_db)):
+def get_completion_log(task_id: int, db: Session = Depends(get_read_db)):
     return task_service.get_completion_logs(db, task_id)
 
 
 @router.get("/{task_id}/convergence", response_model=ConvergenceResponse)
-def get_convergence(task_id: int, db: Session = Depends(get_db)):
+def get_convergence(task_id: int, db: Session = Depends(get_read_db)):
     return task_service.get_convergence(db, task_id)
@@ -3,12 +3,53 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./tasks.db"
+    async_db: bool = False                 # True で tasks / captures を async ルーター + AsyncSession で提供（CACHE_BACKEND=memory のみ）
+    # SQLite 接続ごとに適用する PRAGMA（空文字なら適用しない）
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456      # 256MiB
+    sqlite_cache_size: int = -65536        # 負値は KiB 単位（64MiB）
+    sqlite_temp_store: str = "memory"
+    sqlite_read_pool: bool = True          # GET 用の読み取り専用プールを分ける
+    sqlite_read_pool_size: int = 10
+    # PostgreSQL などサーバー型 DB の接続プール（SQLite では使わない）
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30              # 秒。プール枯渇時の待ち時間
+    db_pool_recycle: int = 1800            # 秒。これより古い接続は作り直す
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000   # PostgreSQL の statement_timeout（0 で無効）
+    # 派生ビュー（放置・繰り越し候補・今日期限）の結果キャッシュ
+    cache_backend: str = "memory"          # memory / redis（redis はワーカー間で共有。redis パッケージが必要）
+    cache_ttl_seconds: int = 60            # 0 でキャッシュしない。日付の変わり目（Asia/Tokyo）でも失効する
+    cache_max_entries: int = 256           # memory バックエンドの LRU 上限
+    cache_redis_url: str = "redis://localhost:6379/0"
+    # GET /events（SSE）
+    events_poll_interval_seconds: float = 1.0   # ワーカーごとの change_events ポーリング間隔
+    events_heartbeat_seconds: float = 15.0      # イベントが無いときのコメント行送信間隔
+    events_queue_size: int = 256                # 接続ごとの未送信イベント上限（超えたら切断）
+    events_retention_hours: int = 24            # Last-Event-ID で再開できる期間
+    # GET /metrics（Prometheus 形式）。ルートごとのレイテンシ・SQL 回数と時間・接続プール
+    metrics_enabled: bool = True
+    # SQL のスロークエリログ（実行計画付き）とリクエスト単位のプロファイル
+    slow_query_ms: float = 200             # これ以上かかった SQL を app.sql ロガーに出す（0 で無効）
+    sql_profile: str = "off"               # off / header（X-SQL-Profile: 1 のリクエストだけ）/ always
+    sql_profile_n_plus_one: int = 5        # 1 リクエストで同じ SELECT がこの回数以上なら N+1 として示す
     cors_origins: str = "http://localhost:3000"
     log_level: str = "INFO"
     workers: int = 1
     vapid_public_key: str = ""
     vapid_private_key: str = ""
     vapid_mailto: str = "mailto:admin@localhost"
+    push_max_workers: int = 16            # Web Push 同時送信数
+    push_timeout_seconds: float = 10.0    # 1 件あたりの送信タイムアウト
+    push_backoff_base_seconds: int = 60   # 一時的な失敗後の再送待ち（失敗ごとに倍）
+    push_backoff_max_seconds: int = 86400
+    scheduler_lease_ttl_seconds: int = 60     # リーダーリースの有効期間
+    scheduler_lease_renew_seconds: int = 20   # リース更新と通知設定の再読込の間隔
+    scheduler_retry_window_seconds: int = 1800  # 失敗・中断した回を再実行できる期間（最初の取得から）
+    scheduler_max_attempts: int = 3           # 1 回の定時通知あたりの最大試行回数
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
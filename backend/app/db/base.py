@@ -1,5 +1,16 @@
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import DeclarativeBase
 
+# server_default=func.now() の列用。SQLite の CURRENT_TIMESTAMP は秒精度の文字列で保存されるため、
+# バインド値も同じ書式にしないと文字列比較（キーセットのカーソル条件など）が一致しない
+ServerTimestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -1,14 +1,140 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.services import sql_profiler
+from app.services.metrics import instrument_engine
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False},  # SQLite用
+
+def _sqlite_pragmas(read_only: bool) -> list[str]:
+    pragmas = []
+    # journal_mode の変更は書き込みになるため読み取り専用接続では行わない
+    if settings.sqlite_journal_mode and not read_only:
+        pragmas.append(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    if settings.sqlite_synchronous:
+        pragmas.append(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    pragmas.append(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    pragmas.append(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    pragmas.append(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    if settings.sqlite_temp_store:
+        pragmas.append(f"PRAGMA temp_store={settings.sqlite_temp_store}")
+    return pragmas
+
+
+def apply_sqlite_profile(engine: Engine, read_only: bool = False) -> None:
+    """接続確立ごとに SQLite の PRAGMA を適用する。"""
+    pragmas = _sqlite_pragmas(read_only)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _read_only_url(url: str) -> str | None:
+    """ファイル DB なら読み取り専用（mode=ro）の URI を返す。メモリ DB は None。"""
+    database = make_url(url).database
+    if not database or database == ":memory:" or database.startswith("file:"):
+        return None
+    return f"sqlite:///file:{database}?mode=ro&uri=true"
+
+
+def engine_options(url: str) -> dict:
+    """DB の方言に応じた create_engine の引数を返す。"""
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+
+    options = {
+        "poolclass": QueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if backend == "postgresql" and settings.db_statement_timeout_ms:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+    return options
+
+
+def create_app_engine(url: str) -> Engine:
+    engine = create_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_profile(engine)
+    return engine
+
+
+# 同期 URL に対応する asyncio ドライバ
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def create_async_app_engine(url: str) -> AsyncEngine:
+    backend = make_url(url).get_backend_name()
+    options = {}
+    if backend != "sqlite":
+        # asyncio では QueuePool の代わりに既定の AsyncAdaptedQueuePool を使う
+        options = {k: v for k, v in engine_options(url).items() if k not in ("poolclass", "connect_args")}
+        if settings.db_statement_timeout_ms:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}
+            }
+    async_engine = create_async_engine(async_url(url), **options)
+    if backend == "sqlite":
+        apply_sqlite_profile(async_engine.sync_engine)
+    return async_engine
+
+
+engine = create_app_engine(settings.database_url)
+
+read_engine = engine
+read_url = (
+    _read_only_url(settings.database_url)
+    if engine.dialect.name == "sqlite" and settings.sqlite_read_pool
+    else None
 )
+if read_url:
+    read_engine = create_engine(
+        read_url,
+        connect_args={"check_same_thread": False},
+        pool_size=settings.sqlite_read_pool_size,
+    )
+    apply_sqlite_profile(read_engine, read_only=True)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# async_db 有効時のみ asyncio エンジンを作る（ドライバ未導入の環境でも同期経路は動く）
+async_engine = create_async_app_engine(settings.database_url) if settings.async_db else None
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False) if async_engine else None
+)
+
+if settings.metrics_enabled:
+    instrument_engine(engine, "write")
+    if read_engine is not engine:
+        instrument_engine(read_engine, "read")
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine, "async")
+
+sql_profiler.instrument_engine(engine)
+if read_engine is not engine:
+    sql_profiler.instrument_engine(read_engine)
+if async_engine is not None:
+    sql_profiler.instrument_engine(async_engine.sync_engine)
 
 
 def get_db():
@@ -17,3 +143,17 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """GET 用。書き込みと別の読み取り専用プールからセッションを払い出す。"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
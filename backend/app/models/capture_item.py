@@ -1,14 +1,18 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Index, Integer, String
 from sqlalchemy.sql import func
 
-from app.db.base import Base
+from app.db.base import Base, ServerTimestamp
 
 
 class CaptureItem(Base):
     __tablename__ = "capture_items"
+    # 受信箱: is_resolved = ? ORDER BY created_at DESC（009_add_capture_inbox_index と対応）
+    __table_args__ = (Index("ix_capture_items_is_resolved_created_at", "is_resolved", "created_at"),)
 
     id = Column(Integer, primary_key=True)
     related_task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
     text = Column(String, nullable=False)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(ServerTimestamp, server_default=func.now(), nullable=False)
     is_resolved = Column(Boolean, default=False, nullable=False)
+    # GET /sync の差分カーソル（トリガーで採番する。app/models/sync_tombstone.py 参照）
+    sync_version = Column(BigInteger, nullable=False, server_default="0", index=True)
@@ -0,0 +1,53 @@
+from sqlalchemy import DDL, BigInteger, Column, String, event
+
+from app.db.base import Base
+
+# 書き込みを数えるテーブル（一覧 API の ETag の元）。005_add_change_counters と対応
+TRACKED_TABLES = ("tasks", "capture_items")
+
+
+class ChangeCounter(Base):
+    __tablename__ = "change_counters"
+
+    name = Column(String, primary_key=True)                  # 追跡対象のテーブル名
+    version = Column(BigInteger, nullable=False, default=0)  # INSERT / UPDATE / DELETE のたびに +1
+
+
+# SQLite は FOR EACH ROW のトリガーのみなので、行ごとに version を進める
+SQLITE_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS trg_{table}_{kind}_changed AFTER {event} ON {table} "
+    "BEGIN "
+    "INSERT INTO change_counters (name, version) VALUES ('{table}', 1) "
+    "ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1; "
+    "END"
+)
+
+# PostgreSQL は文単位のトリガーで 1 文につき 1 回だけ進める
+POSTGRESQL_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_change_counter() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO change_counters (name, version) VALUES (TG_TABLE_NAME, 1)
+    ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+POSTGRESQL_TRIGGER = (
+    "CREATE TRIGGER trg_{table}_changed AFTER INSERT OR UPDATE OR DELETE ON {table} "
+    "FOR EACH STATEMENT EXECUTE FUNCTION bump_change_counter()"
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_triggers(metadata, connection, tables=(), **kw) -> None:
+    """create_all でテーブルを作ったときにもトリガーを張る（テスト・新規環境用）。"""
+    names = [t.name for t in tables if t.name in TRACKED_TABLES]
+    if connection.dialect.name == "sqlite":
+        for name in names:
+            for event_name in ("INSERT", "UPDATE", "DELETE"):
+                ddl = SQLITE_TRIGGER.format(table=name, kind=event_name.lower(), event=event_name)
+                connection.execute(DDL(ddl))
+    elif connection.dialect.name == "postgresql" and names:
+        connection.execute(DDL(POSTGRESQL_FUNCTION))
+        for name in names:
+            connection.execute(DDL(POSTGRESQL_TRIGGER.format(table=name)))
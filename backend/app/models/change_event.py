@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base import Base, ServerTimestamp
+
+
+class ChangeEvent(Base):
+    __tablename__ = "change_events"
+    # id は SSE の Last-Event-ID。event_service が commit 時に change_counters('events') から採番する
+    __table_args__ = (
+        Index("ix_change_events_created_at", "created_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String, nullable=False)    # 例: "task.created"
+    payload = Column(Text, nullable=False)         # JSON 文字列（例: {"id": 1}）
+    created_at = Column(ServerTimestamp, server_default=func.now(), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -6,6 +6,8 @@ from app.db.base import Base
 
 class TaskChecklistItem(Base):
     __tablename__ = "task_checklist_items"
+    # チェックリスト取得: task_id = ? ORDER BY order_no
+    __table_args__ = (Index("ix_task_checklist_items_task_id_order_no", "task_id", "order_no"),)
 
     id = Column(Integer, primary_key=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
@@ -13,5 +15,7 @@ class TaskChecklistItem(Base):
     is_done = Column(Boolean, default=False, nullable=False)
     order_no = Column(Integer, nullable=False)
     extracted_task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
+    # GET /sync の差分カーソル（トリガーで採番する。app/models/sync_tombstone.py 参照）
+    sync_version = Column(BigInteger, nullable=False, server_default="0", index=True)
 
     task = relationship("Task", back_populates="checklist", foreign_keys=[task_id])
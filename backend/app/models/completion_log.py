@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -12,5 +12,7 @@ class CompletionLog(Base):
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     completed_at = Column(DateTime, server_default=func.now(), nullable=False)
     note = Column(String, nullable=True)
+    # GET /sync の差分カーソル（トリガーで採番する。app/models/sync_tombstone.py 参照）
+    sync_version = Column(BigInteger, nullable=False, server_default="0", index=True)
 
     task = relationship("Task", back_populates="completion_logs")
@@ -12,3 +12,7 @@ class PushSubscription(Base):
     p256dh = Column(String, nullable=False)
     auth = Column(String, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
+    # 一時的な送信失敗の追跡（成功でリセット。retry_after までは送信をスキップ）
+    failure_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_failure_at = Column(DateTime, nullable=True)
+    retry_after = Column(DateTime, nullable=True)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ScheduledRun(Base):
+    __tablename__ = "scheduled_runs"
+
+    run_key = Column(String, primary_key=True)     # 冪等キー（例: "daily_push_1:2026-10-18"）
+    job_id = Column(String, nullable=False)
+    holder = Column(String, nullable=False)
+    started_at = Column(DateTime, server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    result = Column(String, nullable=True)      # 送信結果の JSON、失敗時は "error: ..."
+    claimed_at = Column(DateTime, nullable=True)  # 最後に取得した時刻（再取得で更新）
+    attempts = Column(Integer, nullable=False, server_default="1")
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, DateTime, String
+
+from app.db.base import Base
+
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String, primary_key=True)        # リース名（例: "scheduler"）
+    holder = Column(String, nullable=False)        # 保持しているワーカー（host:pid）
+    expires_at = Column(DateTime, nullable=False)  # これを過ぎたら他ワーカーが取得できる
@@ -0,0 +1,77 @@
+from sqlalchemy import DDL, event
+
+from app.db.base import Base
+
+# GET /search の全文検索インデックス（SQLite FTS5 の trigram）。008_add_search_index と対応。
+# ORM モデルではない仮想テーブルなので、create_all / drop_all のフックで作成・削除する
+SEARCH_TABLE = "search_index"
+
+# rowid は「元の行の id * 4 + 種別」。トリガーからは rowid 1 件の入れ替えで済む
+KIND_TASK = 0
+KIND_CHECKLIST_ITEM = 1
+KIND_CAPTURE = 2
+
+# 種別 → (元テーブル, title 列の式, body 列の式, 変更を監視する列)
+SEARCH_SOURCES = {
+    KIND_TASK: (
+        "tasks",
+        "{row}.title",
+        "coalesce({row}.done_criteria, '') || char(10) || coalesce({row}.decision_criteria, '')",
+        "title, done_criteria, decision_criteria",
+    ),
+    KIND_CHECKLIST_ITEM: ("task_checklist_items", "{row}.text", "''", "text"),
+    KIND_CAPTURE: ("capture_items", "{row}.text", "''", "text"),
+}
+
+CREATE_SEARCH_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(title, body, tokenize = 'trigram')"
+)
+
+
+def search_trigger_ddl() -> list[str]:
+    statements = []
+    for kind, (table, title, body, columns) in SEARCH_SOURCES.items():
+        insert = (
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, body) "
+            f"VALUES (NEW.id * 4 + {kind}, {title.format(row='NEW')}, {body.format(row='NEW')});"
+        )
+        delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.id * 4 + {kind};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_insert AFTER INSERT ON {table} "
+            f"BEGIN {insert} END",
+            # 検索対象の列が変わったときだけ入れ替える（sync_version などの更新では発火しない）
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_update AFTER UPDATE OF {columns} ON {table} "
+            f"BEGIN {delete} {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_search_delete AFTER DELETE ON {table} "
+            f"BEGIN {delete} END",
+        ]
+    return statements
+
+
+def rebuild_statements() -> list[str]:
+    """インデックスを元テーブルから作り直す SQL（既存 DB への導入・不整合の修復用）。"""
+    statements = [f"DELETE FROM {SEARCH_TABLE}"]
+    for kind, (table, title, body, _) in SEARCH_SOURCES.items():
+        statements.append(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, body) "
+            f"SELECT id * 4 + {kind}, {title.format(row=table)}, {body.format(row=table)} FROM {table}"
+        )
+    statements.append(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    return statements
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(metadata, connection, tables=(), **kw) -> None:
+    """create_all でテーブルを作ったときにも検索インデックスとトリガーを作る（テスト・新規環境用）。"""
+    sources = {table for table, *_ in SEARCH_SOURCES.values()}
+    if connection.dialect.name != "sqlite" or not sources <= {t.name for t in tables}:
+        return
+    connection.execute(DDL(CREATE_SEARCH_TABLE))
+    for ddl in search_trigger_ddl():
+        connection.execute(DDL(ddl))
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(metadata, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.execute(DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
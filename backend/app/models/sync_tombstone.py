@@ -0,0 +1,92 @@
+from sqlalchemy import DDL, BigInteger, Column, Integer, String, event
+
+from app.db.base import Base
+
+# GET /sync の差分対象。各行の sync_version と削除の墓標をトリガーで付ける（007_add_sync_versions と対応）
+SYNC_TABLES = ("tasks", "task_checklist_items", "completion_logs", "capture_items")
+# 全テーブル共通の単調増加カウンタ（change_counters の行名）
+SYNC_COUNTER = "sync"
+
+
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)                          # 削除された行のテーブル名
+    entity_id = Column(Integer, nullable=False)                      # 削除された行の id
+    sync_version = Column(BigInteger, nullable=False, index=True)    # 削除時点のカウンタ値
+
+
+_SQLITE_BUMP = (
+    f"INSERT INTO change_counters (name, version) VALUES ('{SYNC_COUNTER}', 1) "
+    "ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1; "
+)
+_SQLITE_CURRENT = f"(SELECT version FROM change_counters WHERE name = '{SYNC_COUNTER}')"
+
+# SQLite は BEFORE トリガーで NEW を書き換えられないため、AFTER で自分の行を更新する。
+# その UPDATE で sync_version が変わるので WHEN 条件により再帰しない
+SQLITE_SYNC_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_insert AFTER INSERT ON {table} BEGIN "
+    + _SQLITE_BUMP
+    + f"UPDATE {{table}} SET sync_version = {_SQLITE_CURRENT} WHERE id = NEW.id; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_update AFTER UPDATE ON {table} "
+    "WHEN NEW.sync_version IS OLD.sync_version BEGIN "
+    + _SQLITE_BUMP
+    + f"UPDATE {{table}} SET sync_version = {_SQLITE_CURRENT} WHERE id = NEW.id; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_delete AFTER DELETE ON {table} BEGIN "
+    + _SQLITE_BUMP
+    + "INSERT INTO sync_tombstones (entity, entity_id, sync_version) "
+    + f"VALUES ('{{table}}', OLD.id, {_SQLITE_CURRENT}); END",
+]
+
+# PostgreSQL はカウンタ行の行ロックがコミットまで保持されるため、version の順にコミットされる
+# （差分取得でカーソルより小さい version の行が後から現れない）
+POSTGRESQL_SYNC_FUNCTIONS = [
+    f"""
+CREATE OR REPLACE FUNCTION stamp_sync_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO change_counters (name, version) VALUES ('{SYNC_COUNTER}', 1)
+    ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1
+    RETURNING version INTO NEW.sync_version;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""",
+    f"""
+CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+DECLARE
+    current_version BIGINT;
+BEGIN
+    INSERT INTO change_counters (name, version) VALUES ('{SYNC_COUNTER}', 1)
+    ON CONFLICT (name) DO UPDATE SET version = change_counters.version + 1
+    RETURNING version INTO current_version;
+    INSERT INTO sync_tombstones (entity, entity_id, sync_version)
+    VALUES (TG_TABLE_NAME, OLD.id, current_version);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""",
+]
+POSTGRESQL_SYNC_TRIGGERS = [
+    "CREATE TRIGGER trg_{table}_sync_stamp BEFORE INSERT OR UPDATE ON {table} "
+    "FOR EACH ROW EXECUTE FUNCTION stamp_sync_version()",
+    "CREATE TRIGGER trg_{table}_sync_delete AFTER DELETE ON {table} "
+    "FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()",
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_sync_triggers(metadata, connection, tables=(), **kw) -> None:
+    """create_all でテーブルを作ったときにもトリガーを張る（テスト・新規環境用）。"""
+    names = [t.name for t in tables if t.name in SYNC_TABLES]
+    if connection.dialect.name == "sqlite":
+        templates = SQLITE_SYNC_TRIGGERS
+    elif connection.dialect.name == "postgresql" and names:
+        for ddl in POSTGRESQL_SYNC_FUNCTIONS:
+            connection.execute(DDL(ddl))
+        templates = POSTGRESQL_SYNC_TRIGGERS
+    else:
+        return
+    for name in names:
+        for template in templates:
+            connection.execute(DDL(template.format(table=name)))
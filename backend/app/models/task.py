@@ -1,12 +1,34 @@
-from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.base import Base
+from app.db.base import Base, ServerTimestamp
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    # サービス層のクエリ形状に合わせた複合インデックス（002_add_query_indexes と対応）
+    __table_args__ = (
+        # 繰り越し候補: status IN (...) AND due_date < today
+        Index(
+            "ix_tasks_status_due_date",
+            "status",
+            "due_date",
+            sqlite_where=text("due_date IS NOT NULL"),
+            postgresql_where=text("due_date IS NOT NULL"),
+        ),
+        # 今日期限: due_date = today AND status NOT IN (...) ORDER BY priority
+        Index(
+            "ix_tasks_due_date_priority_status",
+            "due_date",
+            "priority",
+            "status",
+            sqlite_where=text("due_date IS NOT NULL"),
+            postgresql_where=text("due_date IS NOT NULL"),
+        ),
+        # 放置検知: status IN (...) AND priority = ? AND last_updated_at <= ?
+        Index("ix_tasks_status_priority_last_updated_at", "status", "priority", "last_updated_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
@@ -21,10 +43,20 @@ class Task(Base):
     reversible = Column(Boolean, nullable=True)
     exploration_limit = Column(Integer, nullable=True)
     origin_checklist_item_id = Column(
-        Integer, ForeignKey("task_checklist_items.id", ondelete="SET NULL"), nullable=True
+        Integer,
+        # tasks <-> task_checklist_items の循環参照のため、制約は後付け（001 と同名）
+        ForeignKey(
+            "task_checklist_items.id",
+            ondelete="SET NULL",
+            use_alter=True,
+            name="fk_tasks_origin_checklist_item_id",
+        ),
+        nullable=True,
     )
     last_updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(ServerTimestamp, server_default=func.now())
+    # GET /sync の差分カーソル（トリガーで採番する。app/models/sync_tombstone.py 参照）
+    sync_version = Column(BigInteger, nullable=False, server_default="0", index=True)
 
     children = relationship(
         "Task",
@@ -44,3 +76,9 @@ class Task(Base):
         order_by="TaskChecklistItem.order_no",
     )
     completion_logs = relationship("CompletionLog", back_populates="task")
+    # 切り出し元のチェックリストアイテム（参照専用。詳細取得時に一括ロードする）
+    origin_checklist_item = relationship(
+        "TaskChecklistItem",
+        foreign_keys=[origin_checklist_item_id],
+        viewonly=True,
+    )
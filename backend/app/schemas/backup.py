@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class ImportCounts(BaseModel):
+    notification_settings: int
+    tasks: int
+    checklist_items: int
+    task_origins: int       # 付け直した tasks.origin_checklist_item_id の件数
+    completion_logs: int
+    captures: int
+
+
+class ImportResponse(BaseModel):
+    imported: ImportCounts
@@ -1,7 +1,10 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.schemas.enums import Priority, TaskType
+from app.schemas.task import TaskResponse
 
 
 class CaptureCreateRequest(BaseModel):
@@ -23,3 +26,26 @@ class CaptureItemResponse(BaseModel):
     is_resolved: bool
 
     model_config = {"from_attributes": True}
+
+
+class CaptureTriageItem(BaseModel):
+    capture_id: int
+    title: Optional[str] = None            # 省略時はキャプチャの本文
+    task_type: TaskType = TaskType.execution
+    priority: Optional[Priority] = None    # 省略時は親タスクの優先度（親なしは should）
+    due_date: Optional[date] = None
+    done_criteria: Optional[str] = None    # 省略時はタイトル
+
+
+class CaptureTriageRequest(BaseModel):
+    parent_id: Optional[int] = None        # 作成するタスクをすべてこのタスクの子にする
+    items: list[CaptureTriageItem] = Field(min_length=1, max_length=500)
+
+
+class CaptureTriageResult(BaseModel):
+    capture: CaptureItemResponse
+    task: TaskResponse
+
+
+class CaptureTriageResponse(BaseModel):
+    results: list[CaptureTriageResult]     # items と同じ順
@@ -0,0 +1,19 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    type: Literal["task", "checklist_item", "capture"]
+    id: int
+    task_id: Optional[int] = None      # チェックリストは親タスク、キャプチャは関連タスク
+    title: str
+    snippet: Optional[str] = None      # 一致箇所の前後（FTS 検索時のみ。フォールバック時はタスクの完了基準）
+    score: Optional[float] = None      # 大きいほど関連が高い（FTS 検索時のみ）
+
+
+class SearchResponse(BaseModel):
+    """next_offset を offset に渡すと次のページを返す。None なら最終ページ。"""
+
+    items: list[SearchHit]
+    next_offset: Optional[int] = None
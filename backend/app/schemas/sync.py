@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+
+from app.schemas.capture_item import CaptureItemResponse
+from app.schemas.checklist_item import ChecklistItemResponse
+from app.schemas.completion_log import CompletionLogResponse
+from app.schemas.task import TaskResponse
+
+
+class SyncDeleted(BaseModel):
+    tasks: list[int] = Field(default_factory=list)
+    checklist_items: list[int] = Field(default_factory=list)
+    completion_logs: list[int] = Field(default_factory=list)
+    captures: list[int] = Field(default_factory=list)
+
+
+class SyncResponse(BaseModel):
+    """cursor は次回の since に渡す。クライアントは deleted を先に、続けて各一覧を upsert で適用する。"""
+
+    cursor: int
+    tasks: list[TaskResponse]
+    checklist_items: list[ChecklistItemResponse]
+    completion_logs: list[CompletionLogResponse]
+    captures: list[CaptureItemResponse]
+    deleted: SyncDeleted
@@ -1,7 +1,7 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import Annotated, Literal, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.checklist_item import ChecklistItemResponse
 from app.schemas.enums import Priority, TaskStatus, TaskType
@@ -33,6 +33,34 @@ class TaskUpdateRequest(BaseModel):
     exploration_limit: Optional[int] = None
 
 
+class TaskBulkCreate(BaseModel):
+    op: Literal["create"]
+    data: TaskCreateRequest
+
+
+class TaskBulkUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TaskUpdateRequest
+
+
+class TaskBulkRequest(BaseModel):
+    operations: list[Annotated[Union[TaskBulkCreate, TaskBulkUpdate], Field(discriminator="op")]] = Field(
+        min_length=1, max_length=500
+    )
+
+
+class BulkResultItem(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    results: list[BulkResultItem]
+
+
 class TaskResponse(BaseModel):
     id: int
     title: str
@@ -74,6 +102,12 @@ class CarryoverCandidateResponse(TaskResponse):
     overdue_days: int
 
 
+class TaskTreeNodeResponse(TaskResponse):
+    depth: int
+    checklist_total: int
+    checklist_done: int
+
+
 class ConvergenceChecklist(BaseModel):
     options_within_limit: bool
     structure_simplified: bool
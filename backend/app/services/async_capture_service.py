@@ -0,0 +1,37 @@
+"""capture_service の asyncio 版（AsyncSession.run_sync で同期版を実行する）。"""
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.capture_item import CaptureItem
+from app.schemas.capture_item import CaptureCreateRequest, CaptureTriageRequest, CaptureUpdateRequest
+from app.services import capture_service
+
+
+async def get_captures(
+    db: AsyncSession,
+    is_resolved: Optional[bool] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> dict:
+    return await db.run_sync(capture_service.get_captures, is_resolved=is_resolved, limit=limit, cursor=cursor)
+
+
+async def get_captures_version(db: AsyncSession) -> int:
+    return await db.run_sync(capture_service.get_captures_version)
+
+
+async def create_capture(db: AsyncSession, data: CaptureCreateRequest) -> CaptureItem:
+    return await db.run_sync(capture_service.create_capture, data)
+
+
+async def update_capture(db: AsyncSession, capture_id: int, data: CaptureUpdateRequest) -> CaptureItem:
+    return await db.run_sync(capture_service.update_capture, capture_id, data)
+
+
+async def delete_capture(db: AsyncSession, capture_id: int) -> None:
+    await db.run_sync(capture_service.delete_capture, capture_id)
+
+
+async def triage_captures(db: AsyncSession, data: CaptureTriageRequest) -> dict:
+    return await db.run_sync(capture_service.triage_captures, data)
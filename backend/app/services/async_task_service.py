@@ -0,0 +1,72 @@
+"""task_service の asyncio 版。
+
+各関数は AsyncSession.run_sync で同期版を AsyncSession の接続上で実行する。
+クエリと業務ルールは同期版と共通で、ここには await の境界だけを置く。
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.completion_log import CompletionLog
+from app.models.task import Task
+from app.schemas.completion_log import CompleteRequest
+from app.schemas.task import TaskBulkCreate, TaskBulkUpdate, TaskCreateRequest, TaskUpdateRequest
+from app.services import task_service
+
+
+async def get_tasks(db: AsyncSession, **filters) -> dict:
+    return await db.run_sync(task_service.get_tasks, **filters)
+
+
+async def get_tasks_version(db: AsyncSession) -> int:
+    return await db.run_sync(task_service.get_tasks_version)
+
+
+async def get_task_detail(db: AsyncSession, task_id: int) -> dict:
+    return await db.run_sync(task_service.get_task_detail, task_id)
+
+
+async def create_task(db: AsyncSession, data: TaskCreateRequest) -> Task:
+    return await db.run_sync(task_service.create_task, data)
+
+
+async def update_task(db: AsyncSession, task_id: int, data: TaskUpdateRequest) -> Task:
+    return await db.run_sync(task_service.update_task, task_id, data)
+
+
+async def bulk_apply(db: AsyncSession, operations: list[TaskBulkCreate | TaskBulkUpdate]) -> list[dict]:
+    return await db.run_sync(task_service.bulk_apply, operations)
+
+
+async def delete_task(db: AsyncSession, task_id: int, recursive: bool = False) -> None:
+    await db.run_sync(task_service.delete_task, task_id, recursive)
+
+
+async def get_children(db: AsyncSession, task_id: int) -> list[Task]:
+    return await db.run_sync(task_service.get_children, task_id)
+
+
+async def get_task_tree(db: AsyncSession, task_id: int, depth: int | None = None) -> list[dict]:
+    return await db.run_sync(task_service.get_task_tree, task_id, depth=depth)
+
+
+async def create_child(db: AsyncSession, task_id: int, data: TaskCreateRequest) -> Task:
+    return await db.run_sync(task_service.create_child, task_id, data)
+
+
+async def complete_task(db: AsyncSession, task_id: int, data: CompleteRequest) -> CompletionLog:
+    return await db.run_sync(task_service.complete_task, task_id, data)
+
+
+async def get_completion_logs(db: AsyncSession, task_id: int) -> list[CompletionLog]:
+    return await db.run_sync(task_service.get_completion_logs, task_id)
+
+
+async def get_convergence(db: AsyncSession, task_id: int) -> dict:
+    return await db.run_sync(task_service.get_convergence, task_id)
+
+
+async def get_convergence_batch(db: AsyncSession, task_ids: list[int]) -> list[dict]:
+    return await db.run_sync(task_service.get_convergence_batch, task_ids)
+
+
+async def get_stale_tasks(db: AsyncSession, **filters) -> list[dict]:
+    return await db.run_sync(task_service.get_stale_tasks, **filters)
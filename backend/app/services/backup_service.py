@@ -0,0 +1,224 @@
+"""全データの NDJSON エクスポート（GET /export）とインポート（POST /import）。
+
+1 行 1 レコードの {"type": ..., "data": {...}}。先頭は {"type": "meta"} で、以降は外部キーを
+満たす順に並べる:
+
+    meta → notification_settings → tasks → checklist_items → task_origins → completion_logs → captures
+
+- tasks.origin_checklist_item_id は tasks と checklist_items が互いを参照するため tasks には含めず、
+  checklist_items の後の task_origins（{"id", "origin_checklist_item_id"}）で付け直す
+- id はそのまま保つ。sync_version はトリガーが採番するため出力しない
+- エクスポートはサーバーサイドカーソル（yield_per）で EXPORT_BATCH_SIZE 行ずつ読み、
+  インポートは同じ種類の行を IMPORT_BATCH_SIZE 行ずつ executemany で入れる。どちらも件数に
+  よらずメモリは一定
+- インポートは 1 トランザクションで、途中で失敗すれば何も残らない。取り込み先の
+  タスク・チェックリスト・完了ログ・キャプチャは空でなければならない（通知設定は置き換える）
+- 取り込みは行ごとのイベントを記録せず、同じトランザクションで reset を 1 件記録する
+  （SSE の接続中のクライアントに一覧の再取得を促す）
+"""
+import json
+from datetime import date, datetime
+from typing import Callable, Iterable, Iterator, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Date, DateTime, Table, delete, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.capture_item import CaptureItem
+from app.models.checklist_item import TaskChecklistItem
+from app.models.completion_log import CompletionLog
+from app.models.notification_setting import NotificationSetting
+from app.models.task import Task
+from app.services import event_service
+from app.services.view_cache import invalidates_views
+
+FORMAT = "task_app.export"
+FORMAT_VERSION = 1
+META = "meta"
+TASK_ORIGINS = "task_origins"
+EXPORT_BATCH_SIZE = 5000
+IMPORT_BATCH_SIZE = 5000
+
+# レコードの type → テーブル（出力順）
+TABLES: dict[str, Table] = {
+    "notification_settings": NotificationSetting.__table__,
+    "tasks": Task.__table__,
+    "checklist_items": TaskChecklistItem.__table__,
+    "completion_logs": CompletionLog.__table__,
+    "captures": CaptureItem.__table__,
+}
+# 出力しないカラム（トリガー採番・後から付け直す参照）
+SKIPPED_COLUMNS = {"sync_version", "origin_checklist_item_id"}
+
+
+def _columns(table: Table) -> list:
+    return [c for c in table.columns if c.key not in SKIPPED_COLUMNS]
+
+
+# ── エクスポート ───────────────────────────────────────────────────────────
+
+
+def _stream(db: Session, type_: str, stmt) -> Iterator[list[dict]]:
+    result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for partition in result.mappings().partitions():
+        yield [{"type": type_, "data": dict(row)} for row in partition]
+
+
+def iter_export(db: Session) -> Iterator[list[dict]]:
+    """レコードを EXPORT_BATCH_SIZE 件ずつのリストで返す。終わったら db を閉じる。
+
+    すべて同じトランザクションで読むため、エクスポート中の書き込みは出力に混ざらない
+    （PostgreSQL は REPEATABLE READ にする。SQLite は明示的に BEGIN した読み取りトランザクションが
+    スナップショットになる）。
+    """
+    try:
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        elif dialect == "sqlite":
+            # pysqlite は DML の前にしか BEGIN を出さず、SELECT ごとに別のスナップショットになる
+            connection = db.connection()
+            if not connection.connection.dbapi_connection.in_transaction:
+                connection.exec_driver_sql("BEGIN")
+        yield [
+            {
+                "type": META,
+                "data": {"format": FORMAT, "version": FORMAT_VERSION, "exported_at": datetime.utcnow()},
+            }
+        ]
+        for type_, table in TABLES.items():
+            yield from _stream(db, type_, select(*_columns(table)).order_by(table.c.id))
+            if type_ == "checklist_items":
+                origins = (
+                    select(Task.id, Task.origin_checklist_item_id)
+                    .where(Task.origin_checklist_item_id.is_not(None))
+                    .order_by(Task.id)
+                )
+                yield from _stream(db, TASK_ORIGINS, origins)
+    finally:
+        db.close()
+
+
+# ── インポート ─────────────────────────────────────────────────────────────
+
+
+def _converters(table: Table) -> dict[str, Callable]:
+    """JSON の文字列を Date / DateTime カラムの値に戻す関数。"""
+    converters = {}
+    for column in _columns(table):
+        if isinstance(column.type, DateTime):
+            converters[column.key] = datetime.fromisoformat
+        elif isinstance(column.type, Date):
+            converters[column.key] = date.fromisoformat
+    return converters
+
+
+def _iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """任意の位置で区切られたバイト列を行に分ける。"""
+    rest = b""
+    for chunk in chunks:
+        rest += chunk
+        *lines, rest = rest.split(b"\n")
+        yield from lines
+    yield rest
+
+
+def _iter_records(chunks: Iterable[bytes]) -> Iterator[tuple[int, str, dict]]:
+    for line_no, line in enumerate(_iter_lines(chunks), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            yield line_no, record["type"], record["data"]
+        except (ValueError, TypeError, KeyError):
+            raise HTTPException(status_code=400, detail=f"{line_no} 行目: NDJSON のレコードとして読めません")
+
+
+def _check_empty(db: Session) -> None:
+    for type_, table in TABLES.items():
+        if type_ == "notification_settings":
+            continue
+        if db.execute(select(table.c.id).limit(1)).first() is not None:
+            raise HTTPException(status_code=400, detail=f"既存のデータがあるため取り込めません（{type_}）")
+
+
+def _reset_sequences(db: Session) -> None:
+    """PostgreSQL の id 採番を取り込んだ最大 id の次に進める（SQLite は max(rowid) から採番するので不要）。"""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in TABLES.values():
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence(:table, 'id'), coalesce(max(id), 0) + 1, false) "
+                f"FROM {table.name}"
+            ),
+            {"table": table.name},
+        )
+
+
+class _Batch:
+    def __init__(self, db: Session):
+        self.db = db
+        self.type: Optional[str] = None
+        self.rows: list[dict] = []
+        self.counts: dict[str, int] = {type_: 0 for type_ in [*TABLES, TASK_ORIGINS]}
+
+    def add(self, type_: str, row: dict) -> None:
+        # 種類が変わったら先に書き出す（ストリームの順序＝外部キーの順序を保つ）
+        if type_ != self.type or len(self.rows) >= IMPORT_BATCH_SIZE:
+            self.flush()
+            self.type = type_
+        self.rows.append(row)
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        if self.type == TASK_ORIGINS:
+            self.db.execute(update(Task), self.rows)
+        else:
+            self.db.execute(insert(TABLES[self.type]), self.rows)
+        self.counts[self.type] += len(self.rows)
+        self.rows = []
+
+
+@invalidates_views
+def import_ndjson(db: Session, chunks: Iterable[bytes]) -> dict:
+    """エクスポートと同じ形式の NDJSON を取り込み、種類ごとの件数を返す。"""
+    records = _iter_records(chunks)
+    _, type_, meta = next(records, (0, None, None))
+    if type_ != META or not isinstance(meta, dict) or meta.get("format") != FORMAT:
+        raise HTTPException(status_code=400, detail="1 行目が task_app のエクスポート形式の meta ではありません")
+    if meta.get("version") != FORMAT_VERSION:
+        raise HTTPException(status_code=400, detail=f"対応していない形式のバージョンです: {meta.get('version')}")
+
+    _check_empty(db)
+    columns = {type_: {c.key for c in _columns(table)} for type_, table in TABLES.items()}
+    columns[TASK_ORIGINS] = {"id", "origin_checklist_item_id"}
+    converters = {type_: _converters(table) for type_, table in TABLES.items()}
+    batch = _Batch(db)
+    try:
+        db.execute(delete(NotificationSetting))
+        for line_no, type_, data in records:
+            if type_ not in columns:
+                raise HTTPException(status_code=400, detail=f"{line_no} 行目: 不明なレコードの種類です: {type_}")
+            try:
+                row = {key: data.get(key) for key in columns[type_]}
+                for key, convert in converters.get(type_, {}).items():
+                    if row[key] is not None:
+                        row[key] = convert(row[key])
+            except (AttributeError, TypeError, ValueError):
+                raise HTTPException(status_code=400, detail=f"{line_no} 行目: {type_} の値が不正です")
+            batch.add(type_, row)
+        batch.flush()
+        _reset_sequences(db)
+        event_service.record(db, event_service.RESET)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"参照または一意制約に違反する行があります: {e.orig}")
+    except BaseException:
+        # 途中の行の誤りや切断でも、それまでに入れたバッチを残さない
+        db.rollback()
+        raise
+    db.commit()
+    return {"imported": batch.counts}
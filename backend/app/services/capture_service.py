@@ -1,22 +1,70 @@
+from datetime import datetime
 from typing import Optional
 
 from fastapi import HTTPException
+from sqlalchemy import and_, insert, or_, update
 from sqlalchemy.orm import Session
 
 from app.models.capture_item import CaptureItem
-from app.schemas.capture_item import CaptureCreateRequest, CaptureUpdateRequest
+from app.models.task import Task
+from app.schemas.capture_item import (
+    CaptureCreateRequest,
+    CaptureItemResponse,
+    CaptureTriageRequest,
+    CaptureUpdateRequest,
+)
+from app.schemas.enums import Priority, TaskStatus
+from app.services import event_service
+from app.services.change_counter_service import get_version
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.view_cache import invalidates_views
 
 
-def get_captures(db: Session, is_resolved: Optional[bool] = None) -> list[CaptureItem]:
-    q = db.query(CaptureItem)
+def get_captures(
+    db: Session,
+    is_resolved: Optional[bool] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> dict:
+    """キャプチャ一覧を新しい順に (created_at, id) のキーセットでページングして返す。
+
+    is_resolved 指定時は ix_capture_items_is_resolved_created_at の範囲走査になる。
+    items は CaptureItemResponse の各カラムの dict（ORM オブジェクトは作らない）。
+    """
+    q = db.query(*[CaptureItem.__table__.c[name] for name in CaptureItemResponse.model_fields])
     if is_resolved is not None:
         q = q.filter(CaptureItem.is_resolved == is_resolved)
-    return q.order_by(CaptureItem.created_at.desc()).all()
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, datetime.fromisoformat)
+        q = q.filter(
+            or_(
+                CaptureItem.created_at < created_at,
+                and_(CaptureItem.created_at == created_at, CaptureItem.id < last_id),
+            )
+        )
+    q = q.order_by(CaptureItem.created_at.desc(), CaptureItem.id.desc())
+
+    if limit is not None:
+        q = q.limit(limit + 1)
+    items = [dict(r._mapping) for r in q.all()]
+
+    next_cursor = None
+    if limit is not None and len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def get_captures_version(db: Session) -> int:
+    """capture_items への書き込み（削除を含む）で必ず変わる値。一覧 API の ETag に使う。"""
+    return get_version(db, CaptureItem.__tablename__)
 
 
 def create_capture(db: Session, data: CaptureCreateRequest) -> CaptureItem:
     item = CaptureItem(**data.model_dump())
     db.add(item)
+    db.flush()
+    event_service.record(db, event_service.CAPTURE_CREATED, id=item.id)
     db.commit()
     db.refresh(item)
     return item
@@ -28,6 +76,7 @@ def update_capture(db: Session, capture_id: int, data: CaptureUpdateRequest) ->
         raise HTTPException(status_code=404, detail="キャプチャアイテムが見つかりません")
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(item, key, value)
+    event_service.record(db, event_service.CAPTURE_UPDATED, id=capture_id)
     db.commit()
     db.refresh(item)
     return item
@@ -38,4 +87,72 @@ def delete_capture(db: Session, capture_id: int) -> None:
     if not item:
         raise HTTPException(status_code=404, detail="キャプチャアイテムが見つかりません")
     db.delete(item)
+    event_service.record(db, event_service.CAPTURE_DELETED, id=capture_id)
     db.commit()
+
+
+@invalidates_views
+def triage_captures(db: Session, data: CaptureTriageRequest) -> dict:
+    """キャプチャをまとめてタスク化し、related_task_id を付けて解決済みにする。
+
+    1 トランザクションの一括 INSERT / UPDATE で適用し、1 件でも対象外があれば何も変更しない。
+    """
+    capture_ids = [item.capture_id for item in data.items]
+    if len(set(capture_ids)) != len(capture_ids):
+        raise HTTPException(status_code=400, detail="同じキャプチャが複数回指定されています")
+
+    parent = None
+    if data.parent_id is not None:
+        parent = db.get(Task, data.parent_id)
+        if not parent:
+            raise HTTPException(status_code=404, detail="親タスクが見つかりません")
+
+    captures = {c.id: c for c in db.query(CaptureItem).filter(CaptureItem.id.in_(capture_ids))}
+    missing = [i for i in capture_ids if i not in captures]
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"キャプチャアイテムが見つかりません: {', '.join(map(str, missing))}"
+        )
+    resolved = [i for i in capture_ids if captures[i].is_resolved]
+    if resolved:
+        raise HTTPException(
+            status_code=400, detail=f"解決済みのキャプチャが含まれています: {', '.join(map(str, resolved))}"
+        )
+
+    default_priority = parent.priority if parent else Priority.should
+    rows = []
+    for item in data.items:
+        title = item.title or captures[item.capture_id].text
+        rows.append(
+            {
+                "title": title,
+                "task_type": item.task_type,
+                "priority": item.priority or default_priority,
+                "due_date": item.due_date,
+                "done_criteria": item.done_criteria or title,
+                "parent_id": data.parent_id,
+                "status": TaskStatus.todo,
+            }
+        )
+    task_ids = db.scalars(insert(Task).returning(Task.id, sort_by_parameter_order=True), rows).all()
+    db.execute(
+        update(CaptureItem),
+        [
+            {"id": capture_id, "is_resolved": True, "related_task_id": task_id}
+            for capture_id, task_id in zip(capture_ids, task_ids)
+        ],
+    )
+    event_service.record_many(
+        db, event_service.TASK_CREATED, [{"id": task_id, "parent_id": data.parent_id} for task_id in task_ids]
+    )
+    event_service.record_many(db, event_service.CAPTURE_UPDATED, [{"id": capture_id} for capture_id in capture_ids])
+    db.commit()
+
+    tasks = {t.id: t for t in db.query(Task).filter(Task.id.in_(task_ids))}
+    captures = {c.id: c for c in db.query(CaptureItem).filter(CaptureItem.id.in_(capture_ids))}
+    return {
+        "results": [
+            {"capture": captures[capture_id], "task": tasks[task_id]}
+            for capture_id, task_id in zip(capture_ids, task_ids)
+        ]
+    }
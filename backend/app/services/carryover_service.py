@@ -1,48 +1,82 @@
 from datetime import date, timedelta
+from typing import Optional
 
-from fastapi import HTTPException
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.models.task import Task
 from app.schemas.enums import CarryoverAction, TaskStatus
-from app.services.task_service import _now, _task_or_404
+from app.services import event_service
+from app.services.task_service import _bulk_result, _now, _task_or_404, task_response_columns
+from app.services.view_cache import cached_view, invalidates_views
 
 
 def get_carryover_candidates(db: Session) -> list[dict]:
     today = date.today()
+    return cached_view("carryover_candidates", db, (today,), lambda: _query_carryover_candidates(db, today))
+
+
+def _query_carryover_candidates(db: Session, today: date) -> list[dict]:
     active = [TaskStatus.todo, TaskStatus.doing]
-    tasks = (
-        db.query(Task)
+    rows = (
+        db.query(*task_response_columns())
         .filter(Task.status.in_(active), Task.due_date < today)
         .all()
     )
     result = []
-    for task in tasks:
-        row = {c.key: getattr(task, c.key) for c in task.__mapper__.column_attrs}
-        row["overdue_days"] = (today - task.due_date).days
+    for r in rows:
+        row = dict(r._mapping)
+        row["overdue_days"] = (today - row["due_date"]).days
         result.append(row)
     return result
 
 
-def do_carryover(db: Session, task_id: int, action: CarryoverAction) -> Task:
-    task = _task_or_404(db, task_id)
-    today = date.today()
-
+def _carryover_values(due_date: Optional[date], action: CarryoverAction, today: date) -> dict:
     if action == CarryoverAction.today:
-        task.due_date = today
-        task.status = TaskStatus.todo
-    elif action == CarryoverAction.plus_2d:
-        base = task.due_date or today
-        task.due_date = base + timedelta(days=2)
-        task.status = TaskStatus.todo
-    elif action == CarryoverAction.plus_7d:
-        base = task.due_date or today
-        task.due_date = base + timedelta(days=7)
-        task.status = TaskStatus.todo
-    elif action == CarryoverAction.needs_redefine:
-        task.status = TaskStatus.needs_redefine
+        return {"due_date": today, "status": TaskStatus.todo}
+    if action == CarryoverAction.plus_2d:
+        return {"due_date": (due_date or today) + timedelta(days=2), "status": TaskStatus.todo}
+    if action == CarryoverAction.plus_7d:
+        return {"due_date": (due_date or today) + timedelta(days=7), "status": TaskStatus.todo}
+    return {"status": TaskStatus.needs_redefine}
 
+
+@invalidates_views
+def do_carryover(db: Session, task_id: int, action: CarryoverAction) -> Task:
+    task = _task_or_404(db, task_id)
+    for key, value in _carryover_values(task.due_date, action, date.today()).items():
+        setattr(task, key, value)
     task.last_updated_at = _now()
+    event_service.record(db, event_service.TASK_UPDATED, id=task_id)
     db.commit()
     db.refresh(task)
     return task
+
+
+@invalidates_views
+def bulk_carryover(db: Session, items: list[tuple[int, CarryoverAction]]) -> list[dict]:
+    """(task_id, action) の一覧を 1 回の SELECT と一括 UPDATE で適用する。"""
+    today = date.today()
+    now = _now()
+    due_dates = dict(
+        db.query(Task.id, Task.due_date).filter(Task.id.in_({task_id for task_id, _ in items})).all()
+    )
+
+    results, updates = [], []
+    for index, (task_id, action) in enumerate(items):
+        if task_id not in due_dates:
+            results.append(_bulk_result(index, task_id, "タスクが見つかりません"))
+            continue
+        values = _carryover_values(due_dates[task_id], action, today)
+        # 同じタスクが複数回指定された場合は前の操作結果を起点にする
+        due_dates[task_id] = values.get("due_date", due_dates[task_id])
+        updates.append({"id": task_id, **values, "last_updated_at": now})
+        results.append(_bulk_result(index, task_id))
+
+    if updates:
+        db.execute(update(Task), updates)
+        # 同じタスクへの複数操作は 1 イベントにまとめる
+        task_ids = dict.fromkeys(u["id"] for u in updates)
+        event_service.record_many(db, event_service.TASK_UPDATED, [{"id": task_id} for task_id in task_ids])
+    db.commit()
+    return results
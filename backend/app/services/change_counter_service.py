@@ -0,0 +1,9 @@
+from sqlalchemy.orm import Session
+
+from app.models.change_counter import ChangeCounter
+
+
+def get_version(db: Session, name: str) -> int:
+    """テーブルの書き込みカウンタを返す（トリガーで INSERT / UPDATE / DELETE ごとに +1）。"""
+    version = db.query(ChangeCounter.version).filter(ChangeCounter.name == name).scalar()
+    return version or 0
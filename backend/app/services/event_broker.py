@@ -0,0 +1,100 @@
+"""変更イベントのファンアウト。
+
+各ワーカーで 1 つのポーリングタスクが change_events を読み、そのワーカーの SSE 接続へ配る。
+DB を経由するため、別ワーカーでの書き込みも全ワーカーの接続に届く。接続数が増えても
+DB への問い合わせはワーカーあたり 1 本のまま。
+"""
+import asyncio
+import time
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services import event_service
+from app.services.task_service import _now
+
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class EventBroker:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: set[asyncio.Queue] = set()
+        self._last_id: Optional[int] = None
+        self._last_prune = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, events: list[dict]) -> None:
+        for queue in list(self._subscribers):
+            for event in events:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # 読み取りが追いつかない接続は切断する（クライアントは Last-Event-ID で再開できる）
+                    self.unsubscribe(queue)
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(None)
+                    break
+
+    def poll_once(self, db: Session) -> list[dict]:
+        """前回以降のイベントを返す。初回は現在の末尾を起点にするだけで何も返さない。"""
+        if self._last_id is None:
+            self._last_id = event_service.latest_id(db)
+            return []
+        events = event_service.events_since(db, self._last_id, limit=1000)
+        if events:
+            self._last_id = events[-1]["id"]
+        if time.monotonic() - self._last_prune > PRUNE_INTERVAL_SECONDS:
+            self._last_prune = time.monotonic()
+            event_service.prune(db, _now() - timedelta(hours=settings.events_retention_hours))
+        return events
+
+    def _poll(self) -> list[dict]:
+        db = SessionLocal()
+        try:
+            return self.poll_once(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # 接続が無い間もカーソルは進めておく（再接続時は Last-Event-ID で補完する）
+                events = await asyncio.to_thread(self._poll)
+                if events:
+                    self.publish(events)
+            except Exception as e:
+                print(f"[events] poll error: {e}", flush=True)
+            await asyncio.sleep(settings.events_poll_interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+broker = EventBroker(settings.events_queue_size)
@@ -0,0 +1,102 @@
+"""変更イベント（GET /events で配信）の記録と取得。
+
+書き込み関数は commit 前に record() し、イベントは業務データと同じトランザクションで確定する。
+
+id は commit の直前に change_counters('events') の行を UPSERT して採番する。行ロックは commit まで
+保持されるため、id の順序は commit の順序と一致し、配信側は「最後に読んだ id より大きいもの」を
+読むだけで取りこぼさない（PostgreSQL の SERIAL は採番順と commit 順がずれる）。採番を
+トランザクションの最後に置くのは、tasks のトリガーが取る 'sync' の行ロックと順序を揃えて
+デッドロックを避けるため。カウンタはイベントを削除しても戻らないので「発行済みの最大 id」でもある。
+"""
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event, func, insert, text
+from sqlalchemy.orm import Session
+
+from app.models.change_event import ChangeEvent
+from app.services.change_counter_service import get_version
+
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_COMPLETED = "task.completed"
+TASK_DELETED = "task.deleted"
+CHECKLIST_UPDATED = "checklist.updated"
+CAPTURE_CREATED = "capture.created"
+CAPTURE_UPDATED = "capture.updated"
+CAPTURE_DELETED = "capture.deleted"
+# 個別のイベントでは表せない一括の置き換え（インポート）。クライアントは一覧を取り直す
+RESET = "reset"
+
+
+COUNTER_NAME = "events"
+_PENDING = "pending_change_events"
+
+_ALLOCATE_IDS = text(
+    "INSERT INTO change_counters (name, version) VALUES (:name, :count) "
+    "ON CONFLICT (name) DO UPDATE SET version = change_counters.version + :count "
+    "RETURNING version"
+)
+
+
+def record(db: Session, event_type: str, **payload) -> None:
+    record_many(db, event_type, [payload])
+
+
+def record_many(db: Session, event_type: str, payloads: list[dict]) -> None:
+    """イベントを積む。commit 時に 1 回の executemany で記録する。"""
+    # 現在のトランザクションに属させ、rollback・close で一緒に捨てられるようにする
+    db.connection()
+    db.info.setdefault(_PENDING, []).extend(
+        {"event_type": event_type, "payload": json.dumps(p, separators=(",", ":"))} for p in payloads
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_pending(session: Session) -> None:
+    rows = session.info.pop(_PENDING, None)
+    if not rows:
+        return
+    # 業務データの書き込み（と 'sync' のロック）を先に済ませ、events のロックを最後に取る
+    session.flush()
+    last_id = session.execute(_ALLOCATE_IDS, {"name": COUNTER_NAME, "count": len(rows)}).scalar_one()
+    first_id = last_id - len(rows) + 1
+    session.execute(insert(ChangeEvent), [{"id": first_id + i, **row} for i, row in enumerate(rows)])
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction) -> None:
+    # rollback・close で終わったトランザクションのイベントは捨てる
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+def _to_dict(event: ChangeEvent) -> dict:
+    return {"id": event.id, "type": event.event_type, "data": json.loads(event.payload)}
+
+
+def events_since(db: Session, after_id: int, limit: Optional[int] = None) -> list[dict]:
+    q = db.query(ChangeEvent).filter(ChangeEvent.id > after_id).order_by(ChangeEvent.id)
+    if limit is not None:
+        q = q.limit(limit)
+    return [_to_dict(e) for e in q.all()]
+
+
+def latest_id(db: Session) -> int:
+    """発行済みの最大 id（保持期間切れで全件削除された後も戻らない）。"""
+    return get_version(db, COUNTER_NAME)
+
+
+def oldest_id(db: Session) -> Optional[int]:
+    return db.query(func.min(ChangeEvent.id)).scalar()
+
+
+def prune(db: Session, before: datetime) -> int:
+    deleted = (
+        db.query(ChangeEvent)
+        .filter(ChangeEvent.created_at < before)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
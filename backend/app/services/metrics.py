@@ -0,0 +1,232 @@
+"""リクエスト・SQL・接続プールの計測と Prometheus テキスト形式での出力（GET /metrics）。
+
+- MetricsMiddleware（ASGI）がルートごとのレイテンシ・クエリ数・クエリ時間を記録する。
+  ラベルは URL ではなくルートのパステンプレート（/tasks/{task_id}）なので系列数は増えない
+- instrument_engine がエンジンの before/after_cursor_execute で SQL の回数と時間を数え、
+  実行中のリクエスト（contextvars）にも加算する。スレッドプールで動く同期ルートにも引き継がれる
+- 値はワーカーごと。複数ワーカーでは Prometheus 側でワーカーごとに集計する
+
+記録は辞書の参照とロック内の加算だけなので、1 リクエストあたりのコストは数マイクロ秒に収まる。
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+QUERY_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# ルーティングに一致しなかったリクエスト（404 など）のラベル
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, le: Optional[str] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        # ラベル → [バケットごとの件数..., +Inf の件数, 合計]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(labels, list(entry)) for labels, entry in self._values.items()]
+        for labels, entry in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), entry[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(entry[-1])}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+REQUESTS = Counter("http_requests_total", "HTTP リクエスト数", ("method", "route", "status"))
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP リクエストの処理時間", LATENCY_BUCKETS, ("method", "route")
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_queries", "1 リクエストで実行した SQL 文の数", QUERY_COUNT_BUCKETS, ("method", "route")
+)
+REQUEST_QUERY_TIME = Histogram(
+    "http_request_query_duration_seconds", "1 リクエストの SQL 実行時間の合計", QUERY_TIME_BUCKETS, ("method", "route")
+)
+DB_QUERIES = Counter("db_queries_total", "実行した SQL 文の数", ("engine",))
+DB_QUERY_TIME = Counter("db_query_duration_seconds_total", "SQL 実行時間の合計", ("engine",))
+
+METRICS = (REQUESTS, REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_QUERY_TIME, DB_QUERIES, DB_QUERY_TIME)
+
+
+class RequestStats:
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+# ── SQLAlchemy ──────────────────────────────────────────────────────────────
+
+_engines: dict[str, Engine] = {}
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """エンジンの SQL 実行を数え、接続プールを /metrics の出力対象に登録する。"""
+    _engines[name] = engine
+    labels = (name,)
+
+    # 開始時刻は実行ごとの context に持たせる（失敗して after が来なくても残らない）
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        DB_QUERIES.inc(labels)
+        DB_QUERY_TIME.inc(labels, elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_seconds += elapsed
+
+
+def _pool_lines() -> Iterable[str]:
+    gauges = {
+        "db_pool_size": ("接続プールの上限（overflow を除く）", "size"),
+        "db_pool_checked_out": ("貸し出し中の接続数", "checkedout"),
+        "db_pool_checked_in": ("プールで待機中の接続数", "checkedin"),
+        "db_pool_overflow": ("上限を超えて作った接続数（負値は未作成の枠）", "overflow"),
+    }
+    for metric, (help_text, method) in gauges.items():
+        values = []
+        for name, engine in _engines.items():
+            # SingletonThreadPool / NullPool などは統計を持たない
+            getter = getattr(engine.pool, method, None)
+            if callable(getter):
+                values.append(f'{metric}{{engine="{name}"}} {getter()}')
+        if values:
+            yield f"# HELP {metric} {help_text}"
+            yield f"# TYPE {metric} gauge"
+            yield from values
+
+
+def _view_cache_lines() -> Iterable[str]:
+    from app.services.view_cache import view_cache
+
+    stats = view_cache.stats()
+    for outcome in ("hits", "misses"):
+        yield f"# HELP view_cache_{outcome}_total 派生ビューキャッシュの{'ヒット' if outcome == 'hits' else 'ミス'}数"
+        yield f"# TYPE view_cache_{outcome}_total counter"
+        for view, counter in stats["views"].items():
+            yield f'view_cache_{outcome}_total{{view="{view}"}} {counter[outcome]}'
+    yield "# HELP view_cache_invalidations_total 派生ビューキャッシュの破棄回数"
+    yield "# TYPE view_cache_invalidations_total counter"
+    yield f"view_cache_invalidations_total {stats['invalidations']}"
+
+
+def render() -> str:
+    lines: list[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(_pool_lines())
+    lines.extend(_view_cache_lines())
+    return "\n".join(lines) + "\n"
+
+
+# ── ASGI ────────────────────────────────────────────────────────────────────
+
+
+class MetricsMiddleware:
+    """HTTP リクエストごとにレイテンシ・ステータス・SQL の回数と時間を記録する。"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            REQUESTS.inc((*labels, status_code))
+            REQUEST_LATENCY.observe(elapsed, labels)
+            REQUEST_QUERIES.observe(stats.queries, labels)
+            REQUEST_QUERY_TIME.observe(stats.query_seconds, labels)
@@ -0,0 +1,25 @@
+"""一覧 API のキーセットページング用カーソル（(ソートキー, id) を base64 にした文字列）。"""
+import base64
+import binascii
+import json
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    value = sort_value.isoformat() if sort_value is not None else None
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parse_value: Callable[[str], Any]) -> tuple:
+    """(ソートキー, id) を返す。ソートキーは parse_value（date.fromisoformat など）で復元する。"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        if value is not None:
+            value = parse_value(value)
+        return value, int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="cursor が不正です")
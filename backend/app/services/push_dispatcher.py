@@ -0,0 +1,130 @@
+"""Web Push の並列送信（ファンアウト）。
+
+購読ごとの送信をスレッドプールで並列化し、プッシュサービスのホストごとに
+HTTP セッション（コネクションプール）を使い回す。
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from pywebpush import WebPushException, webpush
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class PushTarget:
+    """ワーカースレッドへ渡す購読情報（ORM オブジェクトはスレッド間で共有しない）。"""
+
+    subscription_id: int
+    endpoint: str
+    p256dh: str
+    auth: str
+
+
+@dataclass(frozen=True)
+class PushResult:
+    subscription_id: int
+    ok: bool
+    latency_ms: float
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+
+
+# 購読が失効している（削除すべき）ことを示すプッシュサービスの応答
+PERMANENT_FAILURE_STATUS = {404, 410}
+
+
+def is_permanent_failure(result: PushResult) -> bool:
+    return not result.ok and result.status_code in PERMANENT_FAILURE_STATUS
+
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _session_for(endpoint: str) -> requests.Session:
+    host = urlsplit(endpoint).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.push_max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def _deliver(target: PushTarget, data: str) -> PushResult:
+    started = time.perf_counter()
+    status_code, error = None, None
+    try:
+        response = webpush(
+            subscription_info={
+                "endpoint": target.endpoint,
+                "keys": {"p256dh": target.p256dh, "auth": target.auth},
+            },
+            data=data,
+            vapid_private_key=settings.vapid_private_key,
+            vapid_claims={"sub": settings.vapid_mailto},
+            timeout=settings.push_timeout_seconds,
+            requests_session=_session_for(target.endpoint),
+        )
+        status_code = getattr(response, "status_code", None)
+    except WebPushException as e:
+        status_code = e.response.status_code if e.response is not None else None
+        error = f"http_{status_code}" if status_code else "webpush_error"
+    except requests.Timeout:
+        error = "timeout"
+    except Exception as e:
+        error = type(e).__name__
+    latency_ms = (time.perf_counter() - started) * 1000
+    return PushResult(target.subscription_id, error is None, latency_ms, status_code, error)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return round(sorted_values[index], 1)
+
+
+def summarize(results: list[PushResult]) -> dict:
+    latencies = sorted(r.latency_ms for r in results)
+    errors: dict[str, int] = {}
+    for r in results:
+        if not r.ok:
+            errors[r.error] = errors.get(r.error, 0) + 1
+    sent = sum(1 for r in results if r.ok)
+    return {
+        "sent": sent,
+        "failed": len(results) - sent,
+        "total": len(results),
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "max": _percentile(latencies, 100),
+        },
+        "errors": errors,
+    }
+
+
+def fan_out(targets: list[PushTarget], title: str, body: str) -> list[PushResult]:
+    """全購読へ並列送信し、購読ごとの結果を返す（同時送信数は push_max_workers まで）。"""
+    if not targets:
+        return []
+    data = json.dumps({"title": title, "body": body})
+    workers = max(1, min(settings.push_max_workers, len(targets)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="push") as pool:
+        results = list(pool.map(lambda target: _deliver(target, data), targets))
+    for r in results:
+        if not r.ok:
+            print(f"[push] send FAILED: subscription_id={r.subscription_id} error={r.error}", flush=True)
+    return results
@@ -1,12 +1,14 @@
-from datetime import date
-import json
+from datetime import date, timedelta
 
-from pywebpush import WebPushException, webpush
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.push_subscription import PushSubscription
 from app.models.task import Task
+from app.services.push_dispatcher import PushResult, PushTarget, fan_out, is_permanent_failure, summarize
+from app.services.task_service import _now
+from app.services.view_cache import cached_view
 
 
 def upsert_subscription(db: Session, endpoint: str, p256dh: str, auth: str) -> PushSubscription:
@@ -14,6 +16,9 @@ def upsert_subscription(db: Session, endpoint: str, p256dh: str, auth: str) -> P
     if sub:
         sub.p256dh = p256dh
         sub.auth = auth
+        # 再登録された購読はバックオフを解除する
+        sub.failure_count = 0
+        sub.retry_after = None
     else:
         sub = PushSubscription(endpoint=endpoint, p256dh=p256dh, auth=auth)
         db.add(sub)
@@ -31,39 +36,96 @@ def delete_subscription(db: Session, endpoint: str) -> bool:
     return True
 
 
-def send_push(subscription: PushSubscription, title: str, body: str) -> bool:
-    try:
-        webpush(
-            subscription_info={
-                "endpoint": subscription.endpoint,
-                "keys": {"p256dh": subscription.p256dh, "auth": subscription.auth},
-            },
-            data=json.dumps({"title": title, "body": body}),
-            vapid_private_key=settings.vapid_private_key,
-            vapid_claims={"sub": settings.vapid_mailto},
+def _backoff(failure_count: int) -> timedelta:
+    seconds = settings.push_backoff_base_seconds * 2 ** (failure_count - 1)
+    return timedelta(seconds=min(seconds, settings.push_backoff_max_seconds))
+
+
+def _record_results(db: Session, results: list[PushResult], failure_counts: dict[int, int]) -> int:
+    """送信結果を購読に反映する。失効した購読は一括 DELETE し、その件数を返す。"""
+    now = _now()
+    dead_ids = [r.subscription_id for r in results if is_permanent_failure(r)]
+    recovered_ids = [r.subscription_id for r in results if r.ok and failure_counts[r.subscription_id]]
+    failures = []
+    for r in results:
+        if r.ok or is_permanent_failure(r):
+            continue
+        count = failure_counts[r.subscription_id] + 1
+        failures.append(
+            {
+                "id": r.subscription_id,
+                "failure_count": count,
+                "last_failure_at": now,
+                "retry_after": now + _backoff(count),
+            }
         )
-        print(f"[push] sent OK: endpoint={subscription.endpoint[:40]}...", flush=True)
-        return True
-    except Exception as e:
-        print(f"[push] send FAILED: endpoint={subscription.endpoint[:40]}... error={e}", flush=True)
-        return False
 
+    if dead_ids:
+        db.query(PushSubscription).filter(PushSubscription.id.in_(dead_ids)).delete(
+            synchronize_session=False
+        )
+    if recovered_ids:
+        db.query(PushSubscription).filter(PushSubscription.id.in_(recovered_ids)).update(
+            {"failure_count": 0, "retry_after": None}, synchronize_session=False
+        )
+    if failures:
+        db.execute(update(PushSubscription), failures)
+    db.commit()
+    return len(dead_ids)
+
+
+def broadcast(db: Session, title: str, body: str) -> dict:
+    """全購読へ並列送信し、送信件数・レイテンシ・エラー内訳を返す。
 
-def get_today_due_tasks(db: Session) -> list[Task]:
+    retry_after が未来の購読は送信せず skipped_backoff に数える。
+    """
+    now = _now()
+    rows = db.query(
+        PushSubscription.id,
+        PushSubscription.endpoint,
+        PushSubscription.p256dh,
+        PushSubscription.auth,
+        PushSubscription.failure_count,
+        PushSubscription.retry_after,
+    ).all()
+    eligible = [r for r in rows if r.retry_after is None or r.retry_after <= now]
+    targets = [PushTarget(r.id, r.endpoint, r.p256dh, r.auth) for r in eligible]
+
+    results = fan_out(targets, title, body)
+    pruned = _record_results(db, results, {r.id: r.failure_count for r in eligible})
+
+    summary = summarize(results)
+    summary["pruned"] = pruned
+    summary["skipped_backoff"] = len(rows) - len(eligible)
+    print(
+        f"[push] broadcast done: sent={summary['sent']}/{summary['total']} "
+        f"p95={summary['latency_ms']['p95']}ms errors={summary['errors']} "
+        f"pruned={pruned} skipped_backoff={summary['skipped_backoff']}",
+        flush=True,
+    )
+    return summary
+
+
+def get_today_due_tasks(db: Session) -> list[dict]:
+    # キャッシュはセッションをまたぐため ORM オブジェクトではなく行の dict を返す
     today = date.today()
-    return (
-        db.query(Task)
+    return cached_view("today_due_tasks", db, (today,), lambda: _query_today_due_tasks(db, today))
+
+
+def _query_today_due_tasks(db: Session, today: date) -> list[dict]:
+    rows = (
+        db.query(*Task.__table__.columns)
         .filter(Task.due_date == today, Task.status.notin_(["done", "snoozed"]))
         .order_by(Task.priority.desc())
         .all()
     )
+    return [dict(r._mapping) for r in rows]
 
 
 def send_today_due_notification(db: Session) -> dict:
     tasks = get_today_due_tasks(db)
-    subscriptions = db.query(PushSubscription).all()
 
-    if not subscriptions:
+    if not db.query(PushSubscription.id).first():
         return {"sent": 0, "task_count": len(tasks), "skipped": "no_subscriptions"}
 
     if not tasks:
@@ -71,9 +133,18 @@ def send_today_due_notification(db: Session) -> dict:
         body = "今日期限のタスクはありません"
     else:
         title = f"今日の期限タスク（{len(tasks)}件）"
-        body = "・" + "\n・".join(t.title for t in tasks[:5])
+        body = "・" + "\n・".join(t["title"] for t in tasks[:5])
         if len(tasks) > 5:
             body += f"\n他 {len(tasks) - 5} 件"
 
-    sent = sum(1 for sub in subscriptions if send_push(sub, title, body))
-    return {"sent": sent, "total_subscriptions": len(subscriptions), "task_count": len(tasks)}
+    summary = broadcast(db, title, body)
+    return {
+        "sent": summary["sent"],
+        "total_subscriptions": summary["total"],
+        "task_count": len(tasks),
+        "failed": summary["failed"],
+        "latency_ms": summary["latency_ms"],
+        "errors": summary["errors"],
+        "pruned": summary["pruned"],
+        "skipped_backoff": summary["skipped_backoff"],
+    }
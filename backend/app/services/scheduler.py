@@ -1,26 +1,135 @@
+import json
 import logging
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
+from app.core.config import settings
 from app.db.session import SessionLocal
+from app.models.notification_setting import NotificationSetting
 from app.services.push_service import send_today_due_notification
+from app.services.scheduler_lease import (
+    HOLDER_ID,
+    claim_run,
+    finish_run,
+    release_lease,
+    retryable_runs,
+    try_acquire_lease,
+)
 
 logger = logging.getLogger(__name__)
 
-scheduler = BackgroundScheduler(timezone="Asia/Tokyo")
+TIMEZONE = "Asia/Tokyo"
+scheduler = BackgroundScheduler(timezone=TIMEZONE)
 JOB_ID_1 = "daily_push_1"
 JOB_ID_2 = "daily_push_2"
+HEARTBEAT_JOB_ID = "scheduler_heartbeat"
+LEASE_NAME = "scheduler"
 
+# 現在登録済みの (notify_time_1, notify_time_2, enabled)。DB と差分があれば再登録する
+_current_schedule: tuple | None = None
+# 直前のハートビートでリースを持っていたか（引き継ぎの検出用）
+_is_leader = False
 
-def _run_daily_push():
-    print("[scheduler] _run_daily_push fired", flush=True)
+
+def _retry_policy() -> tuple[int, int, int]:
+    return (
+        settings.scheduler_lease_ttl_seconds,
+        settings.scheduler_retry_window_seconds,
+        settings.scheduler_max_attempts,
+    )
+
+
+def _run_daily_push(job_id: str, run_key: str | None = None):
+    print(f"[scheduler] _run_daily_push fired: id={job_id}", flush=True)
     db = SessionLocal()
+    claimed = False
     try:
+        # 全ワーカーでジョブは発火するが、リースを持つ 1 ワーカーだけが送信する
+        if not try_acquire_lease(db, LEASE_NAME, HOLDER_ID, settings.scheduler_lease_ttl_seconds):
+            print(f"[scheduler] not leader, skipped: id={job_id} holder={HOLDER_ID}", flush=True)
+            return
+        # 同じ日・同じジョブは一度だけ（フェイルオーバー後の再送も防ぐ）。失敗・中断した回は取り直せる
+        run_key = run_key or f"{job_id}:{datetime.now(ZoneInfo(TIMEZONE)).date().isoformat()}"
+        if not claim_run(db, run_key, job_id, HOLDER_ID, *_retry_policy()):
+            print(f"[scheduler] already run, skipped: run_key={run_key}", flush=True)
+            return
+        claimed = True
         result = send_today_due_notification(db)
+        finish_run(db, run_key, json.dumps(result, ensure_ascii=False))
         print(f"[scheduler] send result: {result}", flush=True)
     except Exception as e:
         print(f"[scheduler] error in _run_daily_push: {e}", flush=True)
+        if claimed:
+            db.rollback()
+            finish_run(db, run_key, f"error: {e}")
+    finally:
+        db.close()
+
+
+def _missed_slots(now: datetime) -> list[tuple[str, str]]:
+    """時刻を過ぎて再実行期間内にある通知枠の (job_id, run_key)。日付をまたいだ枠も含む。"""
+    if not _current_schedule or not _current_schedule[2]:
+        return []
+    window = timedelta(seconds=settings.scheduler_retry_window_seconds)
+    slots = []
+    for job_id, notify_time in zip((JOB_ID_1, JOB_ID_2), _current_schedule[:2]):
+        if not notify_time:
+            continue
+        hour, minute = (int(part) for part in notify_time.split(":"))
+        today = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        for due in (today - timedelta(days=1), today):
+            if timedelta(0) <= now - due <= window:
+                slots.append((job_id, f"{job_id}:{due.date().isoformat()}"))
+    return slots
+
+
+def _catch_up_missed_runs():
+    """リースを引き継いだとき、前のリーダーが落ちていて誰も実行しなかった枠を実行する。
+
+    発火時にリースが期限切れ前だと全ワーカーが "not leader" で見送り、scheduled_runs に行が
+    残らない。実行済みの枠は claim_run が弾くので、ここでは行の有無を確かめない。
+    """
+    for job_id, run_key in _missed_slots(datetime.now(ZoneInfo(TIMEZONE))):
+        print(f"[scheduler] catching up: run_key={run_key}", flush=True)
+        _run_daily_push(job_id, run_key)
+
+
+def _retry_runs(db):
+    """失敗した回・送信前にリーダーが落ちた回を再実行する（登録中のジョブのみ）。"""
+    for run_key, job_id in retryable_runs(db, HOLDER_ID, *_retry_policy()):
+        if scheduler.get_job(job_id):
+            print(f"[scheduler] retrying: run_key={run_key}", flush=True)
+            _run_daily_push(job_id, run_key)
+
+
+def _heartbeat():
+    """リースを更新し、他ワーカーで変更された通知設定を取り込む。
+
+    リーダーは失敗した回を再実行し、リースを引き継いだ直後は実行されなかった枠を実行する。
+    """
+    global _is_leader
+    db = SessionLocal()
+    try:
+        is_leader = try_acquire_lease(db, LEASE_NAME, HOLDER_ID, settings.scheduler_lease_ttl_seconds)
+        setting = db.query(NotificationSetting).filter(NotificationSetting.id == 1).first()
+        desired = (
+            (setting.notify_time_1, setting.notify_time_2, setting.enabled)
+            if setting
+            else (None, None, False)
+        )
+        if desired != _current_schedule:
+            update_schedule(*desired)
+        if is_leader:
+            if not _is_leader:
+                _catch_up_missed_runs()
+            _retry_runs(db)
+        _is_leader = is_leader
+    except Exception as e:
+        print(f"[scheduler] error in _heartbeat: {e}", flush=True)
     finally:
         db.close()
 
@@ -29,7 +138,8 @@ def _add_job(job_id: str, notify_time: str):
     hour, minute = notify_time.split(":")
     scheduler.add_job(
         _run_daily_push,
-        CronTrigger(hour=int(hour), minute=int(minute), timezone="Asia/Tokyo"),
+        CronTrigger(hour=int(hour), minute=int(minute), timezone=TIMEZONE),
+        args=[job_id],
         id=job_id,
         replace_existing=True,
     )
@@ -37,6 +147,7 @@ def _add_job(job_id: str, notify_time: str):
 
 
 def update_schedule(notify_time_1: str | None, notify_time_2: str | None, enabled: bool):
+    global _current_schedule
     for job_id in (JOB_ID_1, JOB_ID_2):
         if scheduler.get_job(job_id):
             scheduler.remove_job(job_id)
@@ -47,14 +158,29 @@ def update_schedule(notify_time_1: str | None, notify_time_2: str | None, enable
             _add_job(JOB_ID_1, notify_time_1)
         if notify_time_2:
             _add_job(JOB_ID_2, notify_time_2)
+    _current_schedule = (notify_time_1, notify_time_2, enabled)
     print(f"[scheduler] update_schedule done: enabled={enabled} jobs={[j.id for j in scheduler.get_jobs()]}", flush=True)
 
 
 def start_scheduler():
     scheduler.start()
-    print("[scheduler] started", flush=True)
+    scheduler.add_job(
+        _heartbeat,
+        IntervalTrigger(seconds=settings.scheduler_lease_renew_seconds),
+        id=HEARTBEAT_JOB_ID,
+        replace_existing=True,
+    )
+    print(f"[scheduler] started: holder={HOLDER_ID}", flush=True)
 
 
 def stop_scheduler():
     scheduler.shutdown(wait=False)
+    db = SessionLocal()
+    try:
+        # 停止時はリースを手放し、他ワーカーがすぐ引き継げるようにする
+        release_lease(db, LEASE_NAME, HOLDER_ID)
+    except Exception as e:
+        print(f"[scheduler] error releasing lease: {e}", flush=True)
+    finally:
+        db.close()
     print("[scheduler] stopped", flush=True)
@@ -0,0 +1,134 @@
+"""複数ワーカー・複数コンテナ間のスケジューラ協調。
+
+- DB のリース行を取得できたワーカーだけが定時ジョブを実行する（リーダー選出）
+- 定時ジョブは実行前に冪等キー（run_key）を記録し、同じ回を二度送らない
+- ただし失敗した回と、取得したままリース TTL を過ぎても終わらない回（送信前にリーダーが落ちた）は、
+  最初の取得から再実行期間内・最大試行回数までは現在のリーダーが取得し直せる
+"""
+import os
+import socket
+from datetime import timedelta
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.scheduled_run import ScheduledRun
+from app.models.scheduler_lease import SchedulerLease
+from app.services.task_service import _now
+
+HOLDER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def try_acquire_lease(db: Session, name: str, holder: str, ttl_seconds: int) -> bool:
+    """リースを取得または更新する。自分が保持中か期限切れなら取得でき True を返す。"""
+    now = _now()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    updated = (
+        db.query(SchedulerLease)
+        .filter(
+            SchedulerLease.name == name,
+            or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now),
+        )
+        .update({"holder": holder, "expires_at": expires_at}, synchronize_session=False)
+    )
+    if updated:
+        db.commit()
+        return True
+    if db.query(SchedulerLease.name).filter(SchedulerLease.name == name).first():
+        db.rollback()
+        return False
+    # 初回: 行がなければ作成。同時に作成した他ワーカーがいれば負け
+    try:
+        db.add(SchedulerLease(name=name, holder=holder, expires_at=expires_at))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+
+
+def release_lease(db: Session, name: str, holder: str) -> None:
+    db.query(SchedulerLease).filter(
+        SchedulerLease.name == name, SchedulerLease.holder == holder
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def _retryable(holder: str, ttl_seconds: int, retry_window_seconds: int, max_attempts: int):
+    """再取得できる回の条件。実行中の自分の回（TTL 超えの長い送信）は取り直さない。"""
+    now = _now()
+    return and_(
+        ScheduledRun.attempts < max_attempts,
+        ScheduledRun.started_at >= now - timedelta(seconds=retry_window_seconds),
+        or_(
+            ScheduledRun.result.like("error:%"),
+            and_(
+                ScheduledRun.finished_at.is_(None),
+                ScheduledRun.claimed_at < now - timedelta(seconds=ttl_seconds),
+                ScheduledRun.holder != holder,
+            ),
+        ),
+    )
+
+
+def claim_run(
+    db: Session,
+    run_key: str,
+    job_id: str,
+    holder: str,
+    ttl_seconds: int,
+    retry_window_seconds: int,
+    max_attempts: int,
+) -> bool:
+    """run_key を記録する。既に記録済み（他ワーカーが実行済み・実行中）なら False。
+
+    記録済みでも再取得できる回（失敗・中断）なら、条件付き UPDATE で取得し直して True を返す。
+    """
+    now = _now()
+    try:
+        db.add(ScheduledRun(run_key=run_key, job_id=job_id, holder=holder, started_at=now, claimed_at=now))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+    # 条件付き UPDATE なので、同時に取り直そうとしたワーカーのうち 1 つだけが取得できる
+    reclaimed = (
+        db.query(ScheduledRun)
+        .filter(
+            ScheduledRun.run_key == run_key,
+            _retryable(holder, ttl_seconds, retry_window_seconds, max_attempts),
+        )
+        .update(
+            {
+                "holder": holder,
+                "claimed_at": now,
+                "finished_at": None,
+                "result": None,
+                "attempts": ScheduledRun.attempts + 1,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return bool(reclaimed)
+
+
+def retryable_runs(
+    db: Session, holder: str, ttl_seconds: int, retry_window_seconds: int, max_attempts: int
+) -> list[tuple[str, str]]:
+    """再取得できる回の (run_key, job_id)。"""
+    rows = (
+        db.query(ScheduledRun.run_key, ScheduledRun.job_id)
+        .filter(_retryable(holder, ttl_seconds, retry_window_seconds, max_attempts))
+        .order_by(ScheduledRun.started_at)
+        .all()
+    )
+    return [(row.run_key, row.job_id) for row in rows]
+
+
+def finish_run(db: Session, run_key: str, result: str) -> None:
+    db.query(ScheduledRun).filter(ScheduledRun.run_key == run_key).update(
+        {"finished_at": _now(), "result": result}, synchronize_session=False
+    )
+    db.commit()
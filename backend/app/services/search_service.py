@@ -0,0 +1,172 @@
+"""GET /search の全文検索。
+
+SQLite では FTS5（trigram）の search_index を MATCH で引き、bm25 の順に返す（タイトルを重く評価）。
+trigram は 3 文字未満の語を MATCH できないため、短い語を含む検索と PostgreSQL では
+元テーブルへの ILIKE にフォールバックする（新しい順で、スコアは付かない）。
+"""
+import argparse
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, literal, null, or_, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.models.capture_item import CaptureItem
+from app.models.checklist_item import TaskChecklistItem
+from app.models.search_index import (
+    KIND_CAPTURE,
+    KIND_CHECKLIST_ITEM,
+    KIND_TASK,
+    SEARCH_TABLE,
+    rebuild_statements,
+)
+from app.models.task import Task
+
+# レスポンスの type ↔ 種別
+SEARCH_TYPES = {"task": KIND_TASK, "checklist_item": KIND_CHECKLIST_ITEM, "capture": KIND_CAPTURE}
+TYPE_NAMES = {kind: name for name, kind in SEARCH_TYPES.items()}
+
+TRIGRAM_MIN_LENGTH = 3
+# bm25 の列ごとの重み（title, body）
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+SNIPPET_TOKENS = 16
+
+
+def _fts_query(terms: list[str]) -> str:
+    # 各語をフレーズとして引用し、FTS5 の演算子（AND / OR / * など）として解釈させない
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _search_fts(db: Session, terms: list[str], kinds: list[int], limit: int, offset: int) -> list[tuple]:
+    kind_filter = f"AND rowid % 4 IN ({', '.join(str(k) for k in kinds)})" if kinds else ""
+    rows = db.execute(
+        text(
+            f"SELECT rowid, title, snippet({SEARCH_TABLE}, -1, '', '', '…', {SNIPPET_TOKENS}) AS snippet, "
+            f"bm25({SEARCH_TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match {kind_filter} "
+            "ORDER BY score, rowid DESC LIMIT :limit OFFSET :offset"
+        ),
+        {"match": _fts_query(terms), "limit": limit, "offset": offset},
+    ).all()
+    # bm25 は小さいほど良いので、レスポンスでは符号を反転して大きいほど良いスコアにする
+    return [(rowid % 4, rowid // 4, title, snippet, -score) for rowid, title, snippet, score in rows]
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _matches_all(columns: list, terms: list[str]):
+    patterns = [f"%{_escape_like(term)}%" for term in terms]
+    return and_(*[or_(*[column.ilike(p, escape="\\") for column in columns]) for p in patterns])
+
+
+def _search_like(db: Session, terms: list[str], kinds: list[int], limit: int, offset: int) -> list[tuple]:
+    selects = {
+        KIND_TASK: select(
+            literal(KIND_TASK).label("kind"), Task.id.label("id"), Task.title.label("title"),
+            Task.done_criteria.label("snippet"),
+        ).where(_matches_all([Task.title, Task.done_criteria, Task.decision_criteria], terms)),
+        KIND_CHECKLIST_ITEM: select(
+            literal(KIND_CHECKLIST_ITEM).label("kind"), TaskChecklistItem.id.label("id"),
+            TaskChecklistItem.text.label("title"), null().label("snippet"),
+        ).where(_matches_all([TaskChecklistItem.text], terms)),
+        KIND_CAPTURE: select(
+            literal(KIND_CAPTURE).label("kind"), CaptureItem.id.label("id"),
+            CaptureItem.text.label("title"), null().label("snippet"),
+        ).where(_matches_all([CaptureItem.text], terms)),
+    }
+    union = union_all(*[stmt for kind, stmt in selects.items() if not kinds or kind in kinds]).subquery()
+    stmt = (
+        select(union.c.kind, union.c.id, union.c.title, union.c.snippet)
+        .order_by(union.c.id.desc(), union.c.kind)
+        .limit(limit)
+        .offset(offset)
+    )
+    return [(kind, id_, title, snippet, None) for kind, id_, title, snippet in db.execute(stmt)]
+
+
+def _related_task_ids(db: Session, rows: list[tuple]) -> dict[tuple[int, int], Optional[int]]:
+    """ヒットごとの関連タスク id（チェックリストは親タスク、キャプチャは related_task_id）。"""
+    ids = {kind: [id_ for k, id_, *_ in rows if k == kind] for kind in (KIND_CHECKLIST_ITEM, KIND_CAPTURE)}
+    related = {(KIND_TASK, id_): id_ for kind, id_, *_ in rows if kind == KIND_TASK}
+    if ids[KIND_CHECKLIST_ITEM]:
+        q = db.query(TaskChecklistItem.id, TaskChecklistItem.task_id).filter(
+            TaskChecklistItem.id.in_(ids[KIND_CHECKLIST_ITEM])
+        )
+        related.update({(KIND_CHECKLIST_ITEM, id_): task_id for id_, task_id in q})
+    if ids[KIND_CAPTURE]:
+        q = db.query(CaptureItem.id, CaptureItem.related_task_id).filter(CaptureItem.id.in_(ids[KIND_CAPTURE]))
+        related.update({(KIND_CAPTURE, id_): task_id for id_, task_id in q})
+    return related
+
+
+def search(
+    db: Session,
+    q: str,
+    types: Optional[list[str]] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> dict:
+    """q を空白で区切った語をすべて含む行を返す。next_offset が None なら最終ページ。"""
+    terms = q.split()
+    if not terms:
+        raise HTTPException(status_code=400, detail="検索語を入力してください")
+    unknown = sorted(set(types or []) - SEARCH_TYPES.keys())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"不明な種別です: {', '.join(unknown)}")
+    kinds = sorted({SEARCH_TYPES[t] for t in types or []})
+
+    use_fts = db.get_bind().dialect.name == "sqlite" and all(len(t) >= TRIGRAM_MIN_LENGTH for t in terms)
+    find = _search_fts if use_fts else _search_like
+    # 1 件多く読んで次ページの有無を判定する
+    rows = find(db, terms, kinds, limit + 1, offset)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    related = _related_task_ids(db, rows)
+    items = [
+        {
+            "type": TYPE_NAMES[kind],
+            "id": id_,
+            "task_id": related.get((kind, id_)),
+            "title": title,
+            "snippet": snippet,
+            "score": score,
+        }
+        for kind, id_, title, snippet, score in rows
+    ]
+    return {"items": items, "next_offset": offset + limit if has_more else None}
+
+
+def rebuild_index(db: Session) -> int:
+    """search_index を元テーブルから作り直し、登録件数を返す（SQLite のみ）。"""
+    if db.get_bind().dialect.name != "sqlite":
+        raise RuntimeError("検索インデックスは SQLite でのみ使用します")
+    for statement in rebuild_statements():
+        db.execute(text(statement))
+    db.commit()
+    return db.execute(text(f"SELECT count(*) FROM {SEARCH_TABLE}")).scalar()
+
+
+def main() -> None:
+    """python -m app.services.search_service --rebuild"""
+    parser = argparse.ArgumentParser(description="全文検索インデックスの管理")
+    parser.add_argument("--rebuild", action="store_true", help="元テーブルからインデックスを作り直す")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return
+
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"search_index を再構築しました: {rebuild_index(db)} 件")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
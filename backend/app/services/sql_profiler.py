@@ -0,0 +1,190 @@
+"""SQL のスロークエリログとリクエスト単位のプロファイル。
+
+- スロークエリ: SLOW_QUERY_MS を超えた文を、実行計画（SQLite: EXPLAIN QUERY PLAN /
+  PostgreSQL: EXPLAIN）付きの JSON 1 行で app.sql ロガーに出す。常時有効（0 で無効）
+- プロファイル: SQL_PROFILE=always なら全リクエスト、header なら X-SQL-Profile: 1 を付けた
+  リクエストだけ、発行した全 SQL の時間とパラメータの形（値は出さない）を記録し、リクエスト終了時に
+  1 行で出す。同じ SELECT を SQL_PROFILE_N_PLUS_ONE 回以上発行していれば N+1 として示す。
+  レスポンスには Server-Timing（db の合計時間と文数）を付ける
+
+プロファイル中でなければ、SQL 1 文あたりの追加コストは時刻の取得と比較だけ。
+"""
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+PROFILE_HEADER = "X-SQL-Profile"
+_PROFILE_HEADER_KEY = PROFILE_HEADER.lower().encode()
+
+logger = logging.getLogger("app.sql")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(settings.log_level)
+    logger.propagate = False
+
+
+def _log(level: int, payload: dict) -> None:
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps(payload, ensure_ascii=False, default=str))
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """バインドパラメータの値を型名に置き換える（ログに値を残さない）。"""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def _normalize(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+def explain(conn, statement: str, parameters) -> list[str]:
+    """実行計画を返す。DBAPI の接続を直接使うため、計測フックや ORM のイベントは発火しない。"""
+    prefix = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"{prefix} {statement}", parameters)
+        rows = cursor.fetchall()
+    except Exception as e:  # 計画が取れなくても元の処理は止めない
+        return [f"EXPLAIN に失敗しました: {e}"]
+    finally:
+        cursor.close()
+    # SQLite は (id, parent, notused, detail)、PostgreSQL は 1 列の計画行
+    return [str(row[-1]) for row in rows]
+
+
+class RequestProfile:
+    def __init__(self, method: str = "", path: str = ""):
+        self.method = method
+        self.path = path
+        self.statements: list[dict] = []
+
+    def record(self, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+        self.statements.append(
+            {
+                "sql": _normalize(statement),
+                "params": parameter_shape(parameters, executemany),
+                "ms": round(elapsed * 1000, 3),
+            }
+        )
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(s["ms"] for s in self.statements), 3)
+
+    def n_plus_one(self, threshold: Optional[int] = None) -> list[dict]:
+        """同じ SELECT 文の繰り返し（関連の遅延ロードなど）を回数の多い順に返す。"""
+        threshold = threshold or settings.sql_profile_n_plus_one
+        groups: dict[str, list[dict]] = {}
+        for s in self.statements:
+            if s["sql"].upper().startswith("SELECT"):
+                groups.setdefault(s["sql"], []).append(s)
+        suspects = [
+            {"sql": sql, "count": len(runs), "total_ms": round(sum(r["ms"] for r in runs), 3)}
+            for sql, runs in groups.items()
+            if len(runs) >= threshold
+        ]
+        return sorted(suspects, key=lambda s: s["count"], reverse=True)
+
+    def report(self) -> dict:
+        return {
+            "event": "sql_profile",
+            "method": self.method,
+            "path": self.path,
+            "queries": len(self.statements),
+            "total_ms": self.total_ms,
+            "n_plus_one": self.n_plus_one(),
+            "statements": self.statements,
+        }
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+@contextmanager
+def profile_sql(method: str = "", path: str = "") -> Iterator[RequestProfile]:
+    """ブロック内で計測済みエンジンに発行された SQL を記録する。"""
+    profile = RequestProfile(method, path)
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """スロークエリログとプロファイルのフックをエンジンに付ける。"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._profile_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._profile_started
+        profile = _current.get()
+        if profile is not None:
+            profile.record(statement, parameters, executemany, elapsed)
+        if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+            _log(
+                logging.WARNING,
+                {
+                    "event": "slow_query",
+                    "ms": round(elapsed * 1000, 3),
+                    "sql": _normalize(statement),
+                    "params": parameter_shape(parameters, executemany),
+                    "path": profile.path if profile else None,
+                    # executemany は 1 行目の計画で代表させる
+                    "plan": explain(conn, statement, parameters[0] if executemany else parameters),
+                },
+            )
+
+
+class SqlProfileMiddleware:
+    """SQL_PROFILE の設定（または X-SQL-Profile ヘッダー）に応じてリクエストをプロファイルする。"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _enabled(self, scope) -> bool:
+        if settings.sql_profile == "always":
+            return True
+        if settings.sql_profile == "header":
+            return any(k == _PROFILE_HEADER_KEY and v not in (b"", b"0") for k, v in scope["headers"])
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._enabled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        with profile_sql(scope["method"], scope["path"]) as profile:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    timing = f'db;dur={profile.total_ms};desc="{len(profile.statements)} queries"'
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                report = profile.report()
+                _log(logging.WARNING if report["n_plus_one"] else logging.INFO, report)
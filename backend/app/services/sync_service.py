@@ -0,0 +1,52 @@
+"""GET /sync の差分取得。
+
+各行の sync_version と削除の墓標（sync_tombstones）はトリガーが付けるため、サービス層を
+通らない連鎖的な書き込み（delete_task による参照の付け替えなど）も差分に含まれる。
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.capture_item import CaptureItem
+from app.models.change_counter import ChangeCounter
+from app.models.checklist_item import TaskChecklistItem
+from app.models.completion_log import CompletionLog
+from app.models.sync_tombstone import SYNC_COUNTER, SyncTombstone
+from app.models.task import Task
+
+# レスポンスのキー → モデル
+SYNC_ENTITIES = {
+    "tasks": Task,
+    "checklist_items": TaskChecklistItem,
+    "completion_logs": CompletionLog,
+    "captures": CaptureItem,
+}
+
+
+def get_changes(db: Session, since: Optional[int] = None) -> dict:
+    """since より後に変更・削除された行を返す。since 省略時は全件（初回同期）。
+
+    カーソルは最初に読むので、読み取り中に確定した書き込みは次回の差分に回る。
+    """
+    cursor = (
+        db.query(ChangeCounter.version).filter(ChangeCounter.name == SYNC_COUNTER).scalar() or 0
+    )
+    result = {"cursor": cursor}
+    for key, model in SYNC_ENTITIES.items():
+        q = db.query(model).filter(model.sync_version <= cursor)
+        if since is not None:
+            q = q.filter(model.sync_version > since)
+        result[key] = q.order_by(model.sync_version).all()
+
+    deleted = {key: [] for key in SYNC_ENTITIES}
+    if since is not None:
+        entity_keys = {model.__tablename__: key for key, model in SYNC_ENTITIES.items()}
+        tombstones = (
+            db.query(SyncTombstone.entity, SyncTombstone.entity_id)
+            .filter(SyncTombstone.sync_version > since, SyncTombstone.sync_version <= cursor)
+            .order_by(SyncTombstone.sync_version)
+        )
+        for entity, entity_id in tombstones:
+            deleted[entity_keys[entity]].append(entity_id)
+    result["deleted"] = deleted
+    return result
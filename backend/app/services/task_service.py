@@ -2,7 +2,8 @@ from datetime import date, datetime, timedelta
 from typing import Optional
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, delete, func, insert, literal_column, nulls_last, or_, select, update
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 
 from app.models.capture_item import CaptureItem
 from app.models.checklist_item import TaskChecklistItem
@@ -11,9 +12,20 @@ from app.models.task import Task
 from app.schemas.checklist_item import ChecklistItemCreate, ChecklistItemUpdate, ExtractRequest
 from app.schemas.completion_log import CompleteRequest
 from app.schemas.enums import Priority, TaskStatus, TaskType
-from app.schemas.task import TaskCreateRequest, TaskUpdateRequest
+from app.schemas.task import (
+    TaskBulkCreate,
+    TaskBulkUpdate,
+    TaskCreateRequest,
+    TaskResponse,
+    TaskUpdateRequest,
+)
+from app.services import event_service
+from app.services.change_counter_service import get_version
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.view_cache import cached_view, invalidates_views
 
 STALE_THRESHOLD = {Priority.must: 7, Priority.should: 21}
+TREE_MAX_DEPTH = 50
 
 
 def _now() -> datetime:
@@ -27,6 +39,10 @@ def _task_or_404(db: Session, task_id: int) -> Task:
     return task
 
 
+def _bulk_result(index: int, task_id: Optional[int] = None, error: Optional[str] = None) -> dict:
+    return {"index": index, "ok": error is None, "id": task_id, "error": error}
+
+
 def _item_or_404(db: Session, task_id: int, item_id: int) -> TaskChecklistItem:
     item = db.get(TaskChecklistItem, item_id)
     if not item or item.task_id != task_id:
@@ -37,6 +53,28 @@ def _item_or_404(db: Session, task_id: int, item_id: int) -> TaskChecklistItem:
 # ── Task CRUD ──────────────────────────────────────────────────────────────
 
 
+# fields= で選択可能なカラム（TaskResponse のフィールドと一致させる）
+TASK_LIST_FIELDS = tuple(TaskResponse.model_fields)
+# NULL にできない列。一括更新で明示的に null を指定された操作はその操作だけエラーにする
+NOT_NULL_COLUMNS = frozenset(c.key for c in Task.__table__.columns if not c.nullable)
+
+
+def task_response_columns() -> list:
+    """TaskResponse と同じ順序のカラム。一覧系はこれを SELECT して行を dict のまま返す。"""
+    return [Task.__table__.c[name] for name in TASK_LIST_FIELDS]
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    if not fields:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in TASK_LIST_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"不明なフィールドです: {', '.join(unknown)}")
+    # id はカーソル生成と行の識別に必須のため常に含める
+    return ["id"] + [f for f in names if f != "id"]
+
+
 def get_tasks(
     db: Session,
     statuses: list[str] = [],
@@ -45,10 +83,21 @@ def get_tasks(
     parent_id: Optional[int] = None,
     sort_by: str = "due_date",
     order: str = "asc",
-) -> list[Task]:
-    from sqlalchemy import nulls_last
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> dict:
+    """タスク一覧を (sort_by, id) のキーセットでページングして返す。
+
+    items は TaskResponse の各カラム（fields 指定時は指定カラムのみ）の dict。ORM オブジェクトは作らない。
+    """
+    columns = _parse_fields(fields) or list(TASK_LIST_FIELDS)
+    col = Task.due_date if sort_by == "due_date" else Task.created_at
+
+    # ソートキーはカーソル生成に使うので選択カラムに無くても取得する
+    selected = columns if col.key in columns else columns + [col.key]
+    q = db.query(*[Task.__table__.c[name] for name in selected])
 
-    q = db.query(Task)
     if statuses:
         q = q.filter(Task.status.in_(statuses))
     if task_type:
@@ -57,37 +106,83 @@ def get_tasks(
         q = q.filter(Task.priority == priority)
     if parent_id is not None:
         q = q.filter(Task.parent_id == parent_id)
-    col = Task.due_date if sort_by == "due_date" else Task.created_at
-    sort_expr = nulls_last(col.asc()) if order == "asc" else nulls_last(col.desc())
-    return q.order_by(sort_expr).all()
+
+    # NULLs LAST を保ったまま id をタイブレーカーにしたキーセット条件
+    if cursor:
+        value, last_id = decode_cursor(
+            cursor, date.fromisoformat if sort_by == "due_date" else datetime.fromisoformat
+        )
+        after_id = Task.id > last_id if order == "asc" else Task.id < last_id
+        if value is None:
+            q = q.filter(col.is_(None), after_id)
+        else:
+            after_value = col > value if order == "asc" else col < value
+            q = q.filter(or_(after_value, and_(col == value, after_id), col.is_(None)))
+
+    if order == "asc":
+        q = q.order_by(nulls_last(col.asc()), Task.id.asc())
+    else:
+        q = q.order_by(nulls_last(col.desc()), Task.id.desc())
+
+    if limit is not None:
+        q = q.limit(limit + 1)
+    rows = q.all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, col.key), last.id)
+
+    # 末尾に足したソートキーは zip で落ちる
+    items = [dict(zip(columns, row)) for row in rows]
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def get_tasks_version(db: Session) -> int:
+    """tasks への書き込み（削除を含む）で必ず変わる値。一覧 API の ETag に使う。"""
+    return get_version(db, Task.__tablename__)
 
 
 def get_task_detail(db: Session, task_id: int) -> dict:
-    task = _task_or_404(db, task_id)
+    # 本体 + origin（JOIN）、子タスク、チェックリストの 3 クエリで取得する
+    task = (
+        db.query(Task)
+        .options(
+            joinedload(Task.origin_checklist_item).joinedload(TaskChecklistItem.task),
+            selectinload(Task.children),
+            selectinload(Task.checklist),
+        )
+        .filter(Task.id == task_id)
+        .one_or_none()
+    )
+    if not task:
+        raise HTTPException(status_code=404, detail="タスクが見つかりません")
     origin = None
-    if task.origin_checklist_item_id:
-        item = db.get(TaskChecklistItem, task.origin_checklist_item_id)
-        if item:
-            parent = db.get(Task, item.task_id)
-            if parent:
-                origin = {
-                    "parent_task_id": parent.id,
-                    "parent_task_title": parent.title,
-                    "checklist_item_text": item.text,
-                }
+    item = task.origin_checklist_item
+    if item and item.task:
+        origin = {
+            "parent_task_id": item.task.id,
+            "parent_task_title": item.task.title,
+            "checklist_item_text": item.text,
+        }
     return {"task": task, "origin": origin}
 
 
+@invalidates_views
 def create_task(db: Session, data: TaskCreateRequest) -> Task:
     if data.parent_id:
         _task_or_404(db, data.parent_id)
     task = Task(**data.model_dump())
     db.add(task)
+    db.flush()
+    event_service.record(db, event_service.TASK_CREATED, id=task.id, parent_id=task.parent_id)
     db.commit()
     db.refresh(task)
     return task
 
 
+@invalidates_views
 def update_task(db: Session, task_id: int, data: TaskUpdateRequest) -> Task:
     task = _task_or_404(db, task_id)
     updates = data.model_dump(exclude_unset=True)
@@ -101,12 +196,73 @@ def update_task(db: Session, task_id: int, data: TaskUpdateRequest) -> Task:
     for key, value in updates.items():
         setattr(task, key, value)
     task.last_updated_at = _now()
+    event_service.record(db, event_service.TASK_UPDATED, id=task_id)
     db.commit()
     db.refresh(task)
     return task
 
 
-def delete_task(db: Session, task_id: int) -> None:
+@invalidates_views
+def bulk_apply(db: Session, operations: list[TaskBulkCreate | TaskBulkUpdate]) -> list[dict]:
+    """複数の作成・更新を 1 トランザクションの一括 INSERT / UPDATE で適用する。
+
+    個別ルール（親タスク・対象タスクの存在、PATCH での done 禁止、必須項目への null）に
+    反する操作は適用せず、その操作の結果に error を入れて返す。
+    """
+    results: list[Optional[dict]] = [None] * len(operations)
+    referenced = {op.id for op in operations if op.op == "update"} | {
+        op.data.parent_id for op in operations if op.op == "create" and op.data.parent_id
+    }
+    existing = set(db.scalars(select(Task.id).where(Task.id.in_(referenced)))) if referenced else set()
+
+    now = _now()
+    creates, create_indexes, updates = [], [], []
+    for index, op in enumerate(operations):
+        if op.op == "create":
+            if op.data.parent_id and op.data.parent_id not in existing:
+                results[index] = _bulk_result(index, error="親タスクが見つかりません")
+                continue
+            creates.append(op.data.model_dump())
+            create_indexes.append(index)
+        else:
+            values = op.data.model_dump(exclude_unset=True)
+            nulls = sorted(key for key, value in values.items() if value is None and key in NOT_NULL_COLUMNS)
+            if op.id not in existing:
+                results[index] = _bulk_result(index, op.id, "タスクが見つかりません")
+            elif nulls:
+                results[index] = _bulk_result(index, op.id, f"null にできない項目です: {', '.join(nulls)}")
+            elif values.get("status") == TaskStatus.done:
+                results[index] = _bulk_result(
+                    index, op.id, "完了処理は POST /tasks/{id}/complete から実行してください"
+                )
+            else:
+                updates.append({"id": op.id, **values, "last_updated_at": now})
+                results[index] = _bulk_result(index, op.id)
+
+    if creates:
+        new_ids = db.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), creates
+        ).all()
+        for index, task_id in zip(create_indexes, new_ids):
+            results[index] = _bulk_result(index, task_id)
+        event_service.record_many(
+            db,
+            event_service.TASK_CREATED,
+            [{"id": task_id, "parent_id": c.get("parent_id")} for task_id, c in zip(new_ids, creates)],
+        )
+    if updates:
+        db.execute(update(Task), updates)
+        event_service.record_many(db, event_service.TASK_UPDATED, [{"id": u["id"]} for u in updates])
+    db.commit()
+    return results
+
+
+@invalidates_views
+def delete_task(db: Session, task_id: int, recursive: bool = False) -> None:
+    """タスクを削除する。子タスクは親から切り離して残す（recursive=True なら部分木ごと削除する）。"""
+    if recursive:
+        _delete_subtree(db, task_id)
+        return
     task = _task_or_404(db, task_id)
 
     # 子タスクの parent_id を NULL に
@@ -130,6 +286,48 @@ def delete_task(db: Session, task_id: int) -> None:
         synchronize_session=False
     )
     db.delete(task)
+    event_service.record(db, event_service.TASK_DELETED, id=task_id)
+    db.commit()
+
+
+def _delete_subtree(db: Session, task_id: int) -> None:
+    """task_id を根とする部分木を、件数によらず一定数の文（SELECT 1 + UPDATE 3 + DELETE 3 + イベント 1）で削除する。
+
+    各文は部分木を WITH RECURSIVE で条件に埋め込む（id の列挙をパラメータに展開しないため、
+    SQLite の変数上限に当たらない）。tasks は最後に 1 文で消すので、部分木内の parent_id は外さない。
+    """
+    tree = select(Task.id).where(Task.id == task_id).cte("subtree", recursive=True)
+    # UNION（重複除去）なので parent_id の循環があっても止まる
+    tree = tree.union(select(Task.id).where(Task.parent_id == tree.c.id))
+    subtree = select(tree.c.id)
+
+    task_ids = db.scalars(subtree).all()
+    if not task_ids:
+        raise HTTPException(status_code=404, detail="タスクが見つかりません")
+
+    # 部分木のチェックリストを origin とする他タスク、部分木から切り出された外のアイテム、キャプチャの参照を NULL に
+    items = select(TaskChecklistItem.id).where(TaskChecklistItem.task_id.in_(subtree))
+    db.execute(
+        update(Task).where(Task.origin_checklist_item_id.in_(items)).values(origin_checklist_item_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    db.execute(
+        update(TaskChecklistItem)
+        .where(TaskChecklistItem.extracted_task_id.in_(subtree))
+        .values(extracted_task_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    db.execute(
+        update(CaptureItem).where(CaptureItem.related_task_id.in_(subtree)).values(related_task_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    for model in (TaskChecklistItem, CompletionLog):
+        db.execute(
+            delete(model).where(model.task_id.in_(subtree)),
+            execution_options={"synchronize_session": False},
+        )
+    db.execute(delete(Task).where(Task.id.in_(subtree)), execution_options={"synchronize_session": False})
+    event_service.record_many(db, event_service.TASK_DELETED, [{"id": i} for i in task_ids])
     db.commit()
 
 
@@ -141,12 +339,58 @@ def get_children(db: Session, task_id: int) -> list[Task]:
     return db.query(Task).filter(Task.parent_id == task_id).all()
 
 
+def get_task_tree(db: Session, task_id: int, depth: Optional[int] = None) -> list[dict]:
+    """task_id を根とする部分木を WITH RECURSIVE で 1 クエリ取得し、隣接リストで返す。
+
+    各行は depth（根=0）とチェックリストの件数（checklist_total / checklist_done）を持つ。
+    """
+    max_depth = TREE_MAX_DEPTH if depth is None else min(depth, TREE_MAX_DEPTH)
+
+    tree = (
+        select(Task.id, literal_column("0").label("depth"))
+        .where(Task.id == task_id)
+        .cte("task_tree", recursive=True)
+    )
+    tree = tree.union_all(
+        select(Task.id, (tree.c.depth + 1).label("depth"))
+        .where(Task.parent_id == tree.c.id, tree.c.depth < max_depth)
+    )
+    progress = (
+        select(
+            TaskChecklistItem.task_id,
+            func.count().label("checklist_total"),
+            func.sum(case((TaskChecklistItem.is_done.is_(True), 1), else_=0)).label("checklist_done"),
+        )
+        .where(TaskChecklistItem.task_id.in_(select(tree.c.id)))
+        .group_by(TaskChecklistItem.task_id)
+        .subquery()
+    )
+    rows = (
+        db.query(
+            *Task.__table__.columns,
+            tree.c.depth,
+            func.coalesce(progress.c.checklist_total, 0).label("checklist_total"),
+            func.coalesce(progress.c.checklist_done, 0).label("checklist_done"),
+        )
+        .join(tree, Task.id == tree.c.id)
+        .outerjoin(progress, progress.c.task_id == Task.id)
+        .order_by(tree.c.depth, Task.id)
+        .all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="タスクが見つかりません")
+    return [dict(r._mapping) for r in rows]
+
+
+@invalidates_views
 def create_child(db: Session, task_id: int, data: TaskCreateRequest) -> Task:
     _task_or_404(db, task_id)
     d = data.model_dump()
     d["parent_id"] = task_id
     task = Task(**d)
     db.add(task)
+    db.flush()
+    event_service.record(db, event_service.TASK_CREATED, id=task.id, parent_id=task_id)
     db.commit()
     db.refresh(task)
     return task
@@ -155,6 +399,7 @@ def create_child(db: Session, task_id: int, data: TaskCreateRequest) -> Task:
 # ── Complete ───────────────────────────────────────────────────────────────
 
 
+@invalidates_views
 def complete_task(db: Session, task_id: int, data: CompleteRequest) -> CompletionLog:
     task = _task_or_404(db, task_id)
 
@@ -171,6 +416,7 @@ def complete_task(db: Session, task_id: int, data: CompleteRequest) -> Completio
 
     log = CompletionLog(task_id=task_id, completed_at=_now(), note=data.note)
     db.add(log)
+    event_service.record(db, event_service.TASK_COMPLETED, id=task_id)
     db.commit()
     db.refresh(log)
     return log
@@ -189,30 +435,44 @@ def get_completion_logs(db: Session, task_id: int) -> list[CompletionLog]:
 # ── Convergence ────────────────────────────────────────────────────────────
 
 
-def get_convergence(db: Session, task_id: int) -> dict:
-    task = _task_or_404(db, task_id)
-    exploration_used = len(task.children)
+def _convergence_query(db: Session):
+    # 子タスクはロードせず、parent_id インデックスを使う相関サブクエリで件数だけ数える
+    child = aliased(Task)
+    exploration_used = (
+        select(func.count(child.id)).where(child.parent_id == Task.id).scalar_subquery()
+    )
+    return db.query(
+        Task.id,
+        Task.exploration_limit,
+        Task.reversible,
+        Task.decision_criteria,
+        exploration_used.label("exploration_used"),
+    )
+
+
+def _convergence_result(row) -> dict:
+    exploration_used = row.exploration_used
     exploration_remaining = (
-        task.exploration_limit - exploration_used
-        if task.exploration_limit is not None
+        row.exploration_limit - exploration_used
+        if row.exploration_limit is not None
         else None
     )
     options_within_limit = (
-        exploration_used <= task.exploration_limit
-        if task.exploration_limit is not None
+        exploration_used <= row.exploration_limit
+        if row.exploration_limit is not None
         else True
     )
     structure_simplified = exploration_used <= 3
-    reversible_confirmed = task.reversible is True
+    reversible_confirmed = row.reversible is True
     is_convergeable = options_within_limit and structure_simplified and reversible_confirmed
 
     return {
-        "task_id": task_id,
-        "exploration_limit": task.exploration_limit,
+        "task_id": row.id,
+        "exploration_limit": row.exploration_limit,
         "exploration_used": exploration_used,
         "exploration_remaining": exploration_remaining,
-        "reversible": task.reversible,
-        "decision_criteria": task.decision_criteria,
+        "reversible": row.reversible,
+        "decision_criteria": row.decision_criteria,
         "is_convergeable": is_convergeable,
         "convergence_checklist": {
             "options_within_limit": options_within_limit,
@@ -222,26 +482,69 @@ def get_convergence(db: Session, task_id: int) -> dict:
     }
 
 
+def get_convergence(db: Session, task_id: int) -> dict:
+    row = _convergence_query(db).filter(Task.id == task_id).one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="タスクが見つかりません")
+    return _convergence_result(row)
+
+
+def get_convergence_batch(db: Session, task_ids: list[int]) -> list[dict]:
+    """複数タスクの収束状態を 1 クエリで返す。存在しない ID は結果に含めない（順序は引数順）。"""
+    rows = {row.id: row for row in _convergence_query(db).filter(Task.id.in_(task_ids))}
+    return [_convergence_result(rows[i]) for i in dict.fromkeys(task_ids) if i in rows]
+
+
 # ── Stale ──────────────────────────────────────────────────────────────────
 
 
-def get_stale_tasks(db: Session, priority: Optional[str] = None) -> list[dict]:
+def get_stale_tasks(
+    db: Session,
+    priority: Optional[str] = None,
+    limit: Optional[int] = None,
+    order: str = "desc",
+) -> list[dict]:
+    """放置タスクを返す。閾値判定は SQL 側で行い、放置行のみを取得する。
+
+    order は放置日数の並び順（desc で放置の長い順）。結果は view_cache に載せる。
+    """
+    return cached_view(
+        "stale_tasks", db, (priority, limit, order), lambda: _query_stale_tasks(db, priority, limit, order)
+    )
+
+
+def _query_stale_tasks(db: Session, priority: Optional[str], limit: Optional[int], order: str) -> list[dict]:
     now = _now()
     active = [TaskStatus.todo, TaskStatus.doing, TaskStatus.needs_redefine]
-    q = db.query(Task).filter(Task.status.in_(active))
-    if priority:
-        q = q.filter(Task.priority == priority)
 
+    # (now - last_updated_at).days >= threshold  <=>  last_updated_at <= now - threshold日
+    thresholds = {p: days for p, days in STALE_THRESHOLD.items() if not priority or p == priority}
+    stale_predicates = [
+        and_(Task.priority == p, Task.last_updated_at <= now - timedelta(days=days))
+        for p, days in thresholds.items()
+    ]
+    if not stale_predicates:
+        return []
+    threshold_days = case(STALE_THRESHOLD, value=Task.priority, else_=21).label("threshold_days")
+
+    q = db.query(*task_response_columns(), threshold_days).filter(
+        Task.status.in_(active), or_(*stale_predicates)
+    )
+    if order == "desc":
+        q = q.order_by(Task.last_updated_at.asc(), Task.id.asc())
+    else:
+        q = q.order_by(Task.last_updated_at.desc(), Task.id.desc())
+    if limit is not None:
+        q = q.limit(limit)
+
+    # キーの順序は StaleTaskResponse に合わせる（TaskResponse の項目, stale_days, threshold_days）
     result = []
-    for task in q.all():
-        threshold = STALE_THRESHOLD.get(task.priority, 21)
-        if task.last_updated_at:
-            days = (now - task.last_updated_at).days
-            if days >= threshold:
-                row = {c.key: getattr(task, c.key) for c in task.__mapper__.column_attrs}
-                row["stale_days"] = days
-                row["threshold_days"] = threshold
-                result.append(row)
+    for r in q.all():
+        row = dict(r._mapping)
+        threshold = row.pop("threshold_days")
+        row["stale_days"] = (now - row["last_updated_at"]).days
+        row["threshold_days"] = threshold
+        result.append(row)
     return result
 
 
@@ -258,6 +561,7 @@ def get_checklist(db: Session, task_id: int) -> list[TaskChecklistItem]:
     )
 
 
+@invalidates_views
 def create_checklist_item(db: Session, task_id: int, data: ChecklistItemCreate) -> TaskChecklistItem:
     _task_or_404(db, task_id)
     if data.order_no is None:
@@ -272,22 +576,27 @@ def create_checklist_item(db: Session, task_id: int, data: ChecklistItemCreate)
 
     item = TaskChecklistItem(task_id=task_id, text=data.text, order_no=order_no)
     db.add(item)
+    db.flush()
+    event_service.record(db, event_service.CHECKLIST_UPDATED, task_id=task_id, item_id=item.id)
     db.commit()
     db.refresh(item)
     return item
 
 
+@invalidates_views
 def update_checklist_item(
     db: Session, task_id: int, item_id: int, data: ChecklistItemUpdate
 ) -> TaskChecklistItem:
     item = _item_or_404(db, task_id, item_id)
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(item, key, value)
+    event_service.record(db, event_service.CHECKLIST_UPDATED, task_id=task_id, item_id=item_id)
     db.commit()
     db.refresh(item)
     return item
 
 
+@invalidates_views
 def extract_checklist_item(
     db: Session, task_id: int, item_id: int, data: ExtractRequest
 ) -> dict:
@@ -316,6 +625,8 @@ def extract_checklist_item(
 
     item.extracted_task_id = new_task.id
     item.is_done = True
+    event_service.record(db, event_service.TASK_CREATED, id=new_task.id, parent_id=task_id)
+    event_service.record(db, event_service.CHECKLIST_UPDATED, task_id=task_id, item_id=item_id)
 
     db.commit()
     db.refresh(new_task)
@@ -0,0 +1,177 @@
+"""派生ビュー（放置タスク・繰り越し候補・今日期限タスク）の結果キャッシュ。
+
+- キーには tasks の変更カウンタ（change_counters.version）を含めるため、どのワーカー・
+  どの経路で書き込まれても次の読み取りは必ずミスになる
+- task_service / carryover_service の書き込み関数は @invalidates_views で明示的にも破棄する
+  （メモリの解放と共有バックエンドの世代更新）
+- 日付で結果が変わるため、TTL は Asia/Tokyo の日付が変わる時刻で打ち切る
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+from zoneinfo import ZoneInfo
+
+from app.api.fast_json import dumps, loads
+from app.core.config import settings
+from app.services.change_counter_service import get_version
+
+DAY_BOUNDARY_TZ = ZoneInfo("Asia/Tokyo")
+_MISSING = object()
+
+
+class MemoryBackend:
+    """プロセス内の LRU + TTL。"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """uvicorn ワーカー間で共有するバックエンド（redis パッケージが必要）。
+
+    clear は世代番号を進めるだけで、古い世代のキーは TTL で消える。
+    値は JSON で保存する（pickle は共有 Redis に書ける者が全ワーカーでコードを実行できてしまう）。
+    date / datetime は ISO 8601 の文字列で戻るが、派生ビューはどれも JSON にして返すだけなので応答は変わらない。
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "task_app:view_cache"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis には redis パッケージが必要です") from e
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        generation = int(self._client.get(f"{self._prefix}:generation") or 0)
+        return f"{self._prefix}:{generation}:{key}"
+
+    def get(self, key: str) -> Any:
+        raw = self._client.get(self._key(key))
+        return _MISSING if raw is None else loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(self._key(key), dumps(value), px=max(int(ttl * 1000), 1))
+
+    def clear(self) -> None:
+        self._client.incr(f"{self._prefix}:generation")
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def seconds_until_day_boundary(now: Optional[datetime] = None) -> float:
+    now = now or datetime.now(DAY_BOUNDARY_TZ)
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+
+class ViewCache:
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._counters: dict[str, dict[str, int]] = {}
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def _count(self, view: str, outcome: str) -> None:
+        with self._lock:
+            counter = self._counters.setdefault(view, {"hits": 0, "misses": 0})
+            counter[outcome] += 1
+
+    def get_or_compute(self, view: str, key_parts: tuple, compute: Callable[[], Any]) -> Any:
+        key = ":".join([view, *(str(p) for p in key_parts)])
+        value = self.backend.get(key)
+        if value is not _MISSING:
+            self._count(view, "hits")
+            return value
+        self._count(view, "misses")
+        value = compute()
+        ttl = min(self.ttl_seconds, seconds_until_day_boundary())
+        if ttl > 0:
+            self.backend.set(key, value, ttl)
+        return value
+
+    def invalidate(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            views = {view: dict(counter) for view, counter in self._counters.items()}
+            invalidations = self._invalidations
+        return {
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": self.backend.size(),
+            "invalidations": invalidations,
+            "views": views,
+        }
+
+
+def _make_backend(cache_backend: str, async_db: bool):
+    if cache_backend == "redis":
+        # async ルートはサービス関数を AsyncSession.run_sync（イベントループのスレッド）で動かすため、
+        # 同期の redis クライアントの往復がループを止める。async 経路ではメモリバックエンドに限る
+        if async_db:
+            raise RuntimeError("ASYNC_DB=true では CACHE_BACKEND=redis を使えません（memory を指定してください）")
+        return RedisBackend(settings.cache_redis_url)
+    return MemoryBackend(settings.cache_max_entries)
+
+
+view_cache = ViewCache(_make_backend(settings.cache_backend, settings.async_db), settings.cache_ttl_seconds)
+
+
+def cached_view(view: str, db, key_parts: tuple, compute: Callable[[], Any]) -> Any:
+    """派生ビューをキャッシュ経由で返す。CACHE_TTL_SECONDS=0 なら常に再計算する。"""
+    if view_cache.ttl_seconds <= 0:
+        return compute()
+    return view_cache.get_or_compute(view, (get_version(db, "tasks"), *key_parts), compute)
+
+
+def invalidates_views(func):
+    """タスクを書き換えるサービス関数に付け、成功後に派生ビューのキャッシュを破棄する。"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        view_cache.invalidate()
+        return result
+
+    return wrapper
@@ -0,0 +1,140 @@
+"""同期ルーターと async ルーターの負荷比較ベンチマーク。
+
+同じ SQLite ファイルに対して tasks ルーターの同期版（スレッドプール経由）と
+async 版（AsyncSession + aiosqlite）を ASGI で直接叩き、req/s と p99 レイテンシを比較する。
+
+    cd backend && python -m benchmarks.async_load --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.models.capture_item  # noqa: F401
+import app.models.checklist_item  # noqa: F401
+import app.models.completion_log  # noqa: F401
+from app.api import async_tasks, tasks
+from app.db.base import Base
+from app.db.session import (
+    apply_sqlite_profile,
+    create_async_app_engine,
+    engine_options,
+    get_async_db,
+    get_db,
+    get_read_db,
+)
+from app.models.task import Task
+
+SEED_TASKS = 2000
+
+
+def _seed(url: str) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(
+            Task(title=f"task {i}", task_type="execution", priority="must", done_criteria="done")
+            for i in range(SEED_TASKS)
+        )
+        db.commit()
+    engine.dispose()
+
+
+def _sync_app(url: str):
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_profile(engine)
+    SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = SessionFactory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(tasks.router, prefix="/tasks")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    return app, engine.dispose
+
+
+def _async_app(url: str):
+    engine = create_async_app_engine(url)
+    SessionFactory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with SessionFactory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(async_tasks.router, prefix="/tasks")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app, engine.dispose
+
+
+async def _load(app: FastAPI, requests: int, concurrency: int) -> dict:
+    # 一覧と詳細を交互に叩く読み取り中心の負荷
+    paths = [
+        "/tasks?limit=50" if i % 2 == 0 else f"/tasks/{i % SEED_TASKS + 1}" for i in range(requests)
+    ]
+    latencies = []
+    queue = iter(paths)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def worker():
+            for path in queue:
+                started = time.perf_counter()
+                res = await client.get(path)
+                res.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "req_per_sec": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+async def _run(name: str, factory, url: str, requests: int, concurrency: int) -> None:
+    app, dispose = factory(url)
+    try:
+        # ウォームアップ（接続プールの生成など）を計測から外す
+        await _load(app, min(requests, concurrency * 2), concurrency)
+        result = await _load(app, requests, concurrency)
+    finally:
+        outcome = dispose()
+        if asyncio.iscoroutine(outcome):
+            await outcome
+    print(f"{name:6s} {result}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        _seed(url)
+        asyncio.run(_run("sync", _sync_app, url, args.requests, args.concurrency))
+        asyncio.run(_run("async", _async_app, url, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
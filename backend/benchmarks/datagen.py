@@ -0,0 +1,197 @@
+"""ベンチマーク用の合成データ生成。
+
+同じ --tasks / --seed からは常に同じデータ（id・木構造・文面）を作る。日付だけは
+実行日を基準にするため、放置・繰り越し・今日期限の各ビューには毎回同じ割合で行が載る。
+
+- タスク: 約 35% がルート、残りは直近 500 件のどれかの子（深さ 5 まで）
+- チェックリスト: 40% のタスクに 1〜6 件、完了ログ: done のタスクに 1〜2 件
+- キャプチャ: タスク数の 1/5（半数は解決済み）、プッシュ購読: --subscriptions 件
+
+トリガー（変更カウンタ・sync_version・検索インデックス）もすべて通常どおり発火する。
+
+    cd backend && python -m benchmarks.datagen --tasks 100000 --out /tmp/bench-100k.db
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+
+import app.models.capture_item  # noqa: F401
+import app.models.change_counter  # noqa: F401
+import app.models.change_event  # noqa: F401
+import app.models.completion_log  # noqa: F401
+import app.models.notification_setting  # noqa: F401
+import app.models.push_subscription  # noqa: F401
+import app.models.search_index  # noqa: F401
+import app.models.sync_tombstone  # noqa: F401
+from app.db.base import Base
+from app.models.capture_item import CaptureItem
+from app.models.checklist_item import TaskChecklistItem
+from app.models.completion_log import CompletionLog
+from app.models.notification_setting import NotificationSetting
+from app.models.push_subscription import PushSubscription
+from app.models.task import Task
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+CHUNK_SIZE = 10_000
+MAX_DEPTH = 5
+PARENT_WINDOW = 500
+
+VERBS = ["調査する", "比較する", "決める", "書く", "見直す", "共有する", "整理する", "確認する", "準備する", "申請する"]
+NOUNS = [
+    "見積書", "議事録", "週次レポート", "請求書", "設計書", "契約書", "採用計画", "引っ越し",
+    "確定申告", "旅行の日程", "ライブラリ選定", "バックアップ", "家計簿", "発表資料", "健康診断",
+]
+STATUSES = [("todo", 40), ("doing", 15), ("done", 30), ("carryover_candidate", 5), ("needs_redefine", 5), ("snoozed", 5)]
+TASK_TYPES = [("execution", 60), ("research", 25), ("decision", 15)]
+
+
+def _weighted(rng: random.Random, choices: list[tuple[str, int]]) -> str:
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+def _phrase(rng: random.Random) -> str:
+    return f"{rng.choice(NOUNS)}を{rng.choice(VERBS)}"
+
+
+def _task_rows(rng: random.Random, count: int, now: datetime, today: date):
+    depth = [0] * (count + 1)
+    for task_id in range(1, count + 1):
+        parent_id = None
+        if task_id > 1 and rng.random() >= 0.35:
+            candidate = rng.randint(max(1, task_id - PARENT_WINDOW), task_id - 1)
+            if depth[candidate] < MAX_DEPTH:
+                parent_id = candidate
+                depth[task_id] = depth[candidate] + 1
+        task_type = _weighted(rng, TASK_TYPES)
+        created_at = now - timedelta(days=rng.uniform(0, 365))
+        title = _phrase(rng)
+        yield {
+            "id": task_id,
+            "title": f"{title} #{task_id}",
+            "task_type": task_type,
+            "category": rng.choice([None, "仕事", "家", "学習"]),
+            "priority": "must" if rng.random() < 0.4 else "should",
+            "status": _weighted(rng, STATUSES),
+            "due_date": today + timedelta(days=rng.randint(-30, 30)) if rng.random() < 0.7 else None,
+            "parent_id": parent_id,
+            "done_criteria": f"{title}が終わっている",
+            "decision_criteria": "費用と期間で比較する" if task_type == "decision" else None,
+            "reversible": rng.random() < 0.5 if task_type == "decision" else None,
+            "exploration_limit": rng.randint(1, 5) if task_type == "research" else None,
+            "last_updated_at": created_at + (now - created_at) * rng.random(),
+            "created_at": created_at,
+        }
+
+
+def _insert_chunks(conn, table, rows) -> int:
+    total, chunk = 0, []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            conn.execute(insert(table), chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        conn.execute(insert(table), chunk)
+        total += len(chunk)
+    return total
+
+
+def generate(url: str, tasks: int, seed: int = 0, subscriptions: int = 50) -> dict:
+    """url の DB にスキーマを作ってデータを投入し、テーブルごとの件数を返す。"""
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    today = date.today()
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+
+    counts = {}
+    done_ids: list[int] = []
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+
+        def tasks_with_status():
+            for row in _task_rows(rng, tasks, now, today):
+                if row["status"] == "done":
+                    done_ids.append(row["id"])
+                yield row
+
+        counts["tasks"] = _insert_chunks(conn, Task.__table__, tasks_with_status())
+
+        def checklist_rows():
+            for task_id in range(1, tasks + 1):
+                if rng.random() < 0.4:
+                    for order_no in range(1, rng.randint(1, 6) + 1):
+                        yield {
+                            "task_id": task_id,
+                            "text": _phrase(rng),
+                            "is_done": rng.random() < 0.5,
+                            "order_no": order_no,
+                        }
+
+        counts["task_checklist_items"] = _insert_chunks(conn, TaskChecklistItem.__table__, checklist_rows())
+
+        def completion_rows():
+            for task_id in done_ids:
+                for _ in range(1 if rng.random() < 0.9 else 2):
+                    yield {
+                        "task_id": task_id,
+                        "completed_at": now - timedelta(days=rng.uniform(0, 180)),
+                        "note": rng.choice([None, "予定どおり", "前倒しで完了"]),
+                    }
+
+        counts["completion_logs"] = _insert_chunks(conn, CompletionLog.__table__, completion_rows())
+
+        def capture_rows():
+            for _ in range(tasks // 5):
+                resolved = rng.random() < 0.5
+                yield {
+                    "text": f"{_phrase(rng)}（メモ）",
+                    "related_task_id": rng.randint(1, tasks) if resolved else None,
+                    "created_at": now - timedelta(days=rng.uniform(0, 90)),
+                    "is_resolved": resolved,
+                }
+
+        counts["capture_items"] = _insert_chunks(conn, CaptureItem.__table__, capture_rows())
+
+        counts["push_subscriptions"] = _insert_chunks(
+            conn,
+            PushSubscription.__table__,
+            (
+                {"endpoint": f"https://push.invalid/{i}", "p256dh": f"p256dh-{i}", "auth": f"auth-{i}"}
+                for i in range(subscriptions)
+            ),
+        )
+        conn.execute(
+            insert(NotificationSetting.__table__),
+            {"id": 1, "notify_time_1": "08:00", "notify_time_2": "19:00", "enabled": False},
+        )
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", default="10k", help=f"タスク数（数値または {', '.join(SCALES)}）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--subscriptions", type=int, default=50)
+    parser.add_argument("--out", type=Path, required=True, help="作成する SQLite ファイル（既存なら上書き）")
+    args = parser.parse_args()
+
+    tasks = SCALES.get(args.tasks) or int(args.tasks)
+    args.out.unlink(missing_ok=True)
+    started = time.perf_counter()
+    counts = generate(f"sqlite:///{args.out}", tasks, seed=args.seed, subscriptions=args.subscriptions)
+    print(f"{args.out}: {counts} ({time.perf_counter() - started:.1f}s)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
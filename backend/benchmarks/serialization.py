@@ -0,0 +1,125 @@
+"""一覧 API のシリアライズ経路の比較（1 行あたりの CPU 時間）。
+
+- pydantic: 以前の経路。ORM オブジェクト（または dict）を response_model で検証してから JSON にする
+  （FastAPI の serialize_response + JSONResponse と同じ手順）
+- fast: 現在の経路。カラムを SELECT した行の dict を app.api.fast_json でそのまま JSON にする
+
+取得（fetch）と変換（encode）を分けて time.process_time で測り、反復の中央値を行数で割る。
+データは benchmarks.suite と同じ保存場所の合成データを読み取り専用で使う。
+
+    cd backend && python -m benchmarks.serialization --tasks 10k
+    cd backend && python -m benchmarks.serialization --tasks 100k --iterations 5
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import fast_json
+from app.db.session import engine_options
+from app.models.task import Task
+from app.schemas.task import CarryoverCandidateResponse, StaleTaskResponse, TaskResponse
+from app.services import carryover_service, task_service
+from benchmarks import datagen
+from benchmarks.suite import DEFAULT_DATA_DIR, _prepare_data
+
+
+def _pydantic_encoder(model) -> Callable[[Any], bytes]:
+    adapter = TypeAdapter(list[model])
+
+    def encode(rows) -> bytes:
+        validated = adapter.validate_python(rows, from_attributes=True)
+        content = adapter.dump_python(validated, mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return encode
+
+
+# 一覧ごとに (以前の取得, 現在の取得, response_model)
+LISTS = {
+    "GET /tasks": (
+        lambda db: db.query(Task).all(),
+        lambda db: task_service.get_tasks(db)["items"],
+        TaskResponse,
+    ),
+    "GET /tasks/stale": (
+        lambda db: task_service._query_stale_tasks(db, None, None, "desc"),
+        lambda db: task_service._query_stale_tasks(db, None, None, "desc"),
+        StaleTaskResponse,
+    ),
+    "GET /tasks/carryover-candidates": (
+        lambda db: carryover_service._query_carryover_candidates(db, date.today()),
+        lambda db: carryover_service._query_carryover_candidates(db, date.today()),
+        CarryoverCandidateResponse,
+    ),
+}
+
+
+def _measure(factory, fetch, encode, iterations: int) -> dict:
+    fetch_times, encode_times, rows = [], [], 0
+    for _ in range(iterations):
+        with factory() as db:
+            started = time.process_time()
+            items = fetch(db)
+            fetched = time.process_time()
+            encode(items)
+            fetch_times.append(fetched - started)
+            encode_times.append(time.process_time() - fetched)
+            rows = len(items)
+    return {
+        "rows": rows,
+        "fetch_us_per_row": statistics.median(fetch_times) / max(rows, 1) * 1e6,
+        "encode_us_per_row": statistics.median(encode_times) / max(rows, 1) * 1e6,
+    }
+
+
+def run(url: str, iterations: int) -> dict:
+    engine = create_engine(url, **engine_options(url))
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    results = {}
+    try:
+        for name, (old_fetch, new_fetch, model) in LISTS.items():
+            old = _measure(factory, old_fetch, _pydantic_encoder(model), iterations)
+            new = _measure(factory, new_fetch, fast_json.dumps, iterations)
+            results[name] = {"pydantic": old, "fast": new}
+            _report(name, old, new)
+    finally:
+        engine.dispose()
+    return results
+
+
+def _report(name: str, old: dict, new: dict) -> None:
+    old_total = old["fetch_us_per_row"] + old["encode_us_per_row"]
+    new_total = new["fetch_us_per_row"] + new["encode_us_per_row"]
+    sys.stdout.write(
+        f"{name:32s} rows={new['rows']:8d} "
+        f"pydantic={old_total:7.2f}us/row (fetch {old['fetch_us_per_row']:.2f} + encode {old['encode_us_per_row']:.2f}) "
+        f"fast={new_total:7.2f}us/row (fetch {new['fetch_us_per_row']:.2f} + encode {new['encode_us_per_row']:.2f}) "
+        f"x{old_total / max(new_total, 1e-9):.1f}\n"
+    )
+    sys.stdout.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", default="10k", help=f"タスク数（数値または {', '.join(datagen.SCALES)}）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    args = parser.parse_args()
+
+    tasks = datagen.SCALES.get(args.tasks) or int(args.tasks)
+    source = _prepare_data(args.data_dir, tasks, args.seed, regenerate=False)
+    run(f"sqlite:///{source}", args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""SQLite 接続プロファイルの並行読み書きベンチマーク。
+
+既定設定（rollback journal）と app/db/session.py のプロファイル（WAL など）で、
+書き込みスレッドと読み取りスレッドを同時に走らせたときのスループットを比較する。
+
+    cd backend && python -m benchmarks.sqlite_profile --seconds 5 --writers 2 --readers 8
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+import app.models.capture_item  # noqa: F401
+import app.models.checklist_item  # noqa: F401
+import app.models.completion_log  # noqa: F401
+from app.db.base import Base
+from app.db.session import _read_only_url, apply_sqlite_profile
+from app.models.task import Task
+
+SEED_TASKS = 5000
+
+
+def _make_engines(path: Path, profile: bool):
+    url = f"sqlite:///{path}"
+    write_engine = create_engine(url, connect_args={"check_same_thread": False})
+    if not profile:
+        return write_engine, write_engine
+    apply_sqlite_profile(write_engine)
+    read_engine = create_engine(_read_only_url(url), connect_args={"check_same_thread": False})
+    apply_sqlite_profile(read_engine, read_only=True)
+    return write_engine, read_engine
+
+
+def _seed(engine) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(
+            Task(title=f"task {i}", task_type="execution", priority="must", done_criteria="done")
+            for i in range(SEED_TASKS)
+        )
+        db.commit()
+
+
+def run(profile: bool, seconds: float, writers: int, readers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        write_engine, read_engine = _make_engines(Path(tmp) / "bench.db", profile)
+        _seed(write_engine)
+        counts = {"writes": 0, "reads": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def writer():
+            while time.perf_counter() < deadline:
+                try:
+                    with Session(write_engine) as db:
+                        db.add(Task(title="w", task_type="execution", priority="should", done_criteria="d"))
+                        db.commit()
+                    key = "writes"
+                except OperationalError:
+                    key = "locked"
+                with lock:
+                    counts[key] += 1
+
+        def reader():
+            query = select(Task.id, Task.title, Task.due_date).order_by(Task.id.desc()).limit(100)
+            while time.perf_counter() < deadline:
+                try:
+                    with Session(read_engine) as db:
+                        db.execute(query).all()
+                        db.execute(select(func.count(Task.id))).scalar()
+                    key = "reads"
+                except OperationalError:
+                    key = "locked"
+                with lock:
+                    counts[key] += 1
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        write_engine.dispose()
+        read_engine.dispose()
+
+    return {
+        "writes_per_sec": round(counts["writes"] / seconds, 1),
+        "reads_per_sec": round(counts["reads"] / seconds, 1),
+        "locked_errors": counts["locked"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    for name, profile in (("default", False), ("profile", True)):
+        result = run(profile, args.seconds, args.writers, args.readers)
+        print(f"{name:8s} {result}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+"""全 API ルートとサービス関数のベンチマーク（benchmarks.datagen の合成データ上）。
+
+- ルート: TestClient から順に叩き、p50 / p95 レイテンシ、req/s（1 クライアント）、1 リクエストあたりのクエリ数
+- サービス関数: 関数ごとに新しいセッションで呼び、p50 / p95 と 1 回あたりのクエリ数
+- 派生ビューのキャッシュは無効にして、毎回の計算コストを測る（--with-cache で有効）
+- Web Push の送信はネットワークに出さず、成功扱いの no-op に差し替える（DB 側の処理だけを測る）
+- GET /events（SSE）はストリームが終わらないため対象外
+
+生成したデータは --data-dir に (タスク数, seed) ごとに保存して使い回し、実行ごとに作業用コピーへ
+書き込む。結果は --save-baseline で benchmarks/baselines/ に保存し、--compare で前回と比較する
+（p50 が --threshold を超えて悪化したか、クエリ数が増えた項目を回帰として終了コード 1 を返す）。
+--with-cache の結果は別のファイル（-cached）に保存し、反復回数などの条件が違うベースラインとは比較しない。
+
+    cd backend && python -m benchmarks.suite --tasks 10k --save-baseline
+    cd backend && python -m benchmarks.suite --tasks 10k --compare
+    cd backend && python -m benchmarks.suite --tasks 100k --only get_stale_tasks "GET /tasks/stale"
+"""
+import argparse
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import apply_sqlite_profile, engine_options, get_db, get_read_db
+from app.models.capture_item import CaptureItem
+from app.models.change_counter import ChangeCounter
+from app.models.checklist_item import TaskChecklistItem
+from app.models.push_subscription import PushSubscription
+from app.models.sync_tombstone import SYNC_COUNTER
+from app.models.task import Task
+from app.schemas.checklist_item import ChecklistItemCreate, ChecklistItemUpdate, ExtractRequest
+from app.schemas.completion_log import CompleteRequest
+from app.schemas.capture_item import CaptureTriageRequest
+from app.schemas.enums import CarryoverAction
+from app.schemas.task import TaskBulkUpdate, TaskCreateRequest, TaskUpdateRequest
+from app.services import (
+    capture_service,
+    carryover_service,
+    event_service,
+    push_dispatcher,
+    push_service,
+    search_service,
+    sync_service,
+    task_service,
+)
+from app.services.view_cache import view_cache
+from benchmarks import datagen
+from main import app
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / "task_app_bench"
+# これ未満の p50 の悪化は計測誤差として回帰に数えない
+NOISE_FLOOR_MS = 2.0
+# ベースラインと条件が違えば比較しない（反復回数・キャッシュの有無でクエリ数や p50 が変わる）
+COMPARABLE_META = ("tasks", "seed", "iterations", "with_cache")
+
+NEW_TASK = {"title": "ベンチマーク", "task_type": "execution", "priority": "must", "done_criteria": "完了"}
+
+
+class Targets:
+    """各ケースが使う id を決定的に配る。
+
+    読み取り・更新は前半の id、削除は後半の id を末尾から使うため、削除済みの行を読まない。
+    キャプチャ・購読など消費するものは取り出したら戻さない（同じ行を二度消さない）。
+    """
+
+    def __init__(self, factory, seed: int, iterations: int):
+        self.rng = random.Random(seed)
+        with factory() as db:
+            self.task_count = db.query(Task.id).order_by(Task.id.desc()).limit(1).scalar()
+            half = self.task_count // 2
+            self.roots = list(db.scalars(select(Task.id).where(Task.parent_id.is_(None), Task.id <= half)))
+            self.checklist = list(
+                db.execute(
+                    select(TaskChecklistItem.task_id, TaskChecklistItem.id)
+                    .where(TaskChecklistItem.task_id <= half, TaskChecklistItem.extracted_task_id.is_(None))
+                    .order_by(TaskChecklistItem.id)
+                )
+            )
+            # 未完了のチェックリストがあると完了できないため、完了系のケースはこの中から使う
+            open_items = select(TaskChecklistItem.id).where(
+                TaskChecklistItem.task_id == Task.id, TaskChecklistItem.is_done.is_(False)
+            )
+            self.completable = list(
+                db.scalars(
+                    select(Task.id)
+                    .where(Task.id <= half, Task.status != "done", ~open_items.exists())
+                    .order_by(Task.id)
+                )
+            )
+            self.captures = list(
+                db.scalars(select(CaptureItem.id).where(CaptureItem.is_resolved.is_(False)).order_by(CaptureItem.id))
+            )
+            self.endpoints = list(db.scalars(select(PushSubscription.endpoint).order_by(PushSubscription.id)))
+            # 購読解除はウォームアップを含めて iterations + 1 回。足りない分は先に購読しておく
+            extra = [f"https://push.invalid/unsubscribe-{i}" for i in range(iterations + 1 - len(self.endpoints))]
+            if extra:
+                db.execute(insert(PushSubscription), [{"endpoint": e, "p256dh": "p", "auth": "a"} for e in extra])
+                db.commit()
+                self.endpoints += extra
+            self.sync_cursor = _sync_cursor(db)
+        self.half = half
+        self.next_victim = self.task_count
+        self.rng.shuffle(self.checklist)
+        self.rng.shuffle(self.captures)
+        self.rng.shuffle(self.completable)
+        self.rng.shuffle(self.endpoints)
+
+    def task_id(self) -> int:
+        return self.rng.randint(1, self.half)
+
+    def task_ids(self, count: int) -> list[int]:
+        return self.rng.sample(range(1, self.half + 1), count)
+
+    def root_id(self) -> int:
+        return self.rng.choice(self.roots)
+
+    def victim_id(self) -> int:
+        self.next_victim -= 1
+        return self.next_victim + 1
+
+    def checklist_item(self) -> tuple[int, int]:
+        return self.rng.choice(self.checklist)
+
+    def unextracted_item(self) -> tuple[int, int]:
+        return self.checklist.pop()
+
+    def completable_id(self) -> int:
+        return self.completable.pop()
+
+    def capture_id(self) -> int:
+        return self.captures.pop()
+
+    def subscribed_endpoint(self) -> str:
+        return self.endpoints.pop()
+
+    def subscription(self) -> dict:
+        n = self.rng.randint(0, 10**9)
+        return {"endpoint": f"https://push.invalid/bench-{n}", "keys": {"p256dh": "p", "auth": "a"}}
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[Any, Targets], Any]
+    # 1M 件で全件を返すような重いケースは反復回数を 1/10 にする
+    heavy: bool = False
+
+
+def _route(method: str, path: Callable[[Targets], str], body: Optional[Callable[[Targets], Any]] = None):
+    def run(client: TestClient, t: Targets):
+        kwargs = {"json": body(t)} if body else {}
+        res = client.request(method, path(t), **kwargs)
+        if res.status_code >= 400:
+            raise RuntimeError(f"{method} {res.url} -> {res.status_code}: {res.text[:200]}")
+        return res
+
+    return run
+
+
+def _sync_cursor(db) -> int:
+    return db.query(ChangeCounter.version).filter(ChangeCounter.name == SYNC_COUNTER).scalar() or 0
+
+
+ROUTES = [
+    Case("GET /tasks?limit=50", _route("GET", lambda t: "/tasks?limit=50")),
+    Case("GET /tasks?status=todo&limit=50", _route("GET", lambda t: "/tasks?status=todo&limit=50")),
+    Case("GET /tasks (all)", _route("GET", lambda t: "/tasks"), heavy=True),
+    Case("GET /tasks/stale", _route("GET", lambda t: "/tasks/stale?limit=100")),
+    Case("GET /tasks/carryover-candidates", _route("GET", lambda t: "/tasks/carryover-candidates")),
+    Case("GET /tasks/convergence?ids=", _route(
+        "GET", lambda t: "/tasks/convergence?" + "&".join(f"ids={i}" for i in t.task_ids(50)))),
+    Case("POST /tasks", _route("POST", lambda t: "/tasks", lambda t: NEW_TASK)),
+    Case("POST /tasks/bulk", _route("POST", lambda t: "/tasks/bulk", lambda t: {"operations": [
+        {"op": "update", "id": i, "data": {"category": "bench"}} for i in t.task_ids(50)]})),
+    Case("GET /tasks/{id}", _route("GET", lambda t: f"/tasks/{t.task_id()}")),
+    Case("PATCH /tasks/{id}", _route("PATCH", lambda t: f"/tasks/{t.task_id()}", lambda t: {"category": "bench"})),
+    Case("DELETE /tasks/{id}", _route("DELETE", lambda t: f"/tasks/{t.victim_id()}")),
+    Case("GET /tasks/{id}/children", _route("GET", lambda t: f"/tasks/{t.root_id()}/children")),
+    Case("POST /tasks/{id}/children", _route("POST", lambda t: f"/tasks/{t.task_id()}/children", lambda t: NEW_TASK)),
+    Case("GET /tasks/{id}/tree", _route("GET", lambda t: f"/tasks/{t.root_id()}/tree")),
+    Case("POST /tasks/{id}/complete", _route("POST", lambda t: f"/tasks/{t.completable_id()}/complete", lambda t: {})),
+    Case("GET /tasks/{id}/completion-log", _route("GET", lambda t: f"/tasks/{t.task_id()}/completion-log")),
+    Case("GET /tasks/{id}/convergence", _route("GET", lambda t: f"/tasks/{t.task_id()}/convergence")),
+    Case("POST /tasks/{id}/carryover", _route(
+        "POST", lambda t: f"/tasks/{t.task_id()}/carryover", lambda t: {"action": "plus_2d"})),
+    Case("POST /tasks/carryover/bulk", _route("POST", lambda t: "/tasks/carryover/bulk", lambda t: {"items": [
+        {"task_id": i, "action": "plus_7d"} for i in t.task_ids(50)]})),
+    Case("GET /tasks/{id}/checklist", _route("GET", lambda t: f"/tasks/{t.task_id()}/checklist")),
+    Case("POST /tasks/{id}/checklist", _route(
+        "POST", lambda t: f"/tasks/{t.task_id()}/checklist", lambda t: {"text": "ベンチマーク"})),
+    Case("PATCH /tasks/{id}/checklist/{item_id}", _route(
+        "PATCH", lambda t: "/tasks/{}/checklist/{}".format(*t.checklist_item()), lambda t: {"is_done": True})),
+    Case("POST /tasks/{id}/checklist/{item_id}/extract", _route(
+        "POST", lambda t: "/tasks/{}/checklist/{}/extract".format(*t.unextracted_item()), lambda t: {})),
+    Case("GET /captures?is_resolved=false&limit=50", _route("GET", lambda t: "/captures?is_resolved=false&limit=50")),
+    Case("POST /captures", _route("POST", lambda t: "/captures", lambda t: {"text": "ベンチマーク"})),
+    Case("PATCH /captures/{id}", _route(
+        "PATCH", lambda t: f"/captures/{t.capture_id()}", lambda t: {"text": "ベンチマーク"})),
+    Case("DELETE /captures/{id}", _route("DELETE", lambda t: f"/captures/{t.capture_id()}")),
+    Case("POST /captures/triage", _route("POST", lambda t: "/captures/triage", lambda t: {"items": [
+        {"capture_id": t.capture_id()} for _ in range(5)]})),
+    Case("GET /push/vapid-public-key", _route("GET", lambda t: "/push/vapid-public-key")),
+    Case("POST /push/subscribe", _route("POST", lambda t: "/push/subscribe", lambda t: t.subscription())),
+    Case("DELETE /push/subscribe", _route(
+        "DELETE", lambda t: "/push/subscribe",
+        lambda t: {"endpoint": t.subscribed_endpoint(), "keys": {"p256dh": "p", "auth": "a"}})),
+    Case("POST /push/send-test", _route("POST", lambda t: "/push/send-test", lambda t: {"title": "t", "body": "b"})),
+    Case("POST /push/send-today-due", _route("POST", lambda t: "/push/send-today-due")),
+    Case("GET /push/notification-setting", _route("GET", lambda t: "/push/notification-setting")),
+    Case("PUT /push/notification-setting", _route("PUT", lambda t: "/push/notification-setting", lambda t: {
+        "notify_time_1": "08:00", "notify_time_2": "19:00", "enabled": False})),
+    Case("GET /sync?since=", _route("GET", lambda t: f"/sync?since={max(t.sync_cursor - 1000, 0)}")),
+    Case("GET /search?q=", _route("GET", lambda t: "/search?q=見積書")),
+    Case("GET /search?q= (short terms)", _route("GET", lambda t: "/search?q=議事")),
+    Case("GET /health", _route("GET", lambda t: "/health")),
+    Case("GET /cache/stats", _route("GET", lambda t: "/cache/stats")),
+]
+
+SERVICES = [
+    Case("get_tasks(limit=50)", lambda db, t: task_service.get_tasks(db, limit=50)),
+    Case("get_tasks(status=todo, limit=50)", lambda db, t: task_service.get_tasks(db, statuses=["todo"], limit=50)),
+    Case("get_tasks(all)", lambda db, t: task_service.get_tasks(db), heavy=True),
+    Case("get_task_detail", lambda db, t: task_service.get_task_detail(db, t.task_id())),
+    Case("get_task_tree", lambda db, t: task_service.get_task_tree(db, t.root_id())),
+    Case("get_children", lambda db, t: task_service.get_children(db, t.root_id())),
+    Case("get_checklist", lambda db, t: task_service.get_checklist(db, t.task_id())),
+    Case("get_completion_logs", lambda db, t: task_service.get_completion_logs(db, t.task_id())),
+    Case("get_convergence_batch(50)", lambda db, t: task_service.get_convergence_batch(db, t.task_ids(50))),
+    Case("get_stale_tasks", lambda db, t: task_service.get_stale_tasks(db)),
+    Case("get_carryover_candidates", lambda db, t: carryover_service.get_carryover_candidates(db)),
+    Case("get_today_due_tasks", lambda db, t: push_service.get_today_due_tasks(db)),
+    Case("send_today_due_notification", lambda db, t: push_service.send_today_due_notification(db)),
+    Case("create_task", lambda db, t: task_service.create_task(db, TaskCreateRequest(**NEW_TASK))),
+    Case("update_task", lambda db, t: task_service.update_task(
+        db, t.task_id(), TaskUpdateRequest(category="bench"))),
+    Case("bulk_apply(50 updates)", lambda db, t: task_service.bulk_apply(db, [
+        TaskBulkUpdate(op="update", id=i, data=TaskUpdateRequest(category="bench")) for i in t.task_ids(50)])),
+    Case("delete_task", lambda db, t: task_service.delete_task(db, t.victim_id())),
+    Case("complete_task", lambda db, t: task_service.complete_task(db, t.completable_id(), CompleteRequest())),
+    Case("do_carryover", lambda db, t: carryover_service.do_carryover(db, t.task_id(), CarryoverAction.plus_2d)),
+    Case("bulk_carryover(50)", lambda db, t: carryover_service.bulk_carryover(
+        db, [(i, CarryoverAction.plus_7d) for i in t.task_ids(50)])),
+    Case("create_checklist_item", lambda db, t: task_service.create_checklist_item(
+        db, t.task_id(), ChecklistItemCreate(text="ベンチマーク"))),
+    Case("update_checklist_item", lambda db, t: task_service.update_checklist_item(
+        db, *t.checklist_item(), ChecklistItemUpdate(is_done=True))),
+    Case("extract_checklist_item", lambda db, t: task_service.extract_checklist_item(
+        db, *t.unextracted_item(), ExtractRequest())),
+    Case("get_captures(inbox, limit=50)", lambda db, t: capture_service.get_captures(db, is_resolved=False, limit=50)),
+    Case("triage_captures(5)", lambda db, t: capture_service.triage_captures(
+        db, CaptureTriageRequest(items=[{"capture_id": t.capture_id()} for _ in range(5)]))),
+    Case("search", lambda db, t: search_service.search(db, "見積書")),
+    Case("search(short terms)", lambda db, t: search_service.search(db, "議事")),
+    Case("get_changes(last 1000)", lambda db, t: sync_service.get_changes(db, since=max(_sync_cursor(db) - 1000, 0))),
+    Case("events_since", lambda db, t: event_service.events_since(db, 0, limit=100)),
+]
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+def _fake_deliver(target, data):
+    return push_dispatcher.PushResult(target.subscription_id, ok=True, latency_ms=0.0, status_code=201)
+
+
+def _summary(latencies: list[float], queries: list[int], elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "iterations": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "per_sec": round(len(latencies) / elapsed, 1),
+        "queries": statistics.median(queries),
+    }
+
+
+def _measure(case: Case, iterations: int, counter: QueryCounter, call: Callable[[], Any]) -> dict:
+    n = max(3, iterations // 10) if case.heavy else iterations
+    call()  # ウォームアップ（文のコンパイル・ページキャッシュ）
+    latencies, queries = [], []
+    started = time.perf_counter()
+    for _ in range(n):
+        before = counter.count
+        t0 = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t0)
+        queries.append(counter.count - before)
+    return _summary(latencies, queries, time.perf_counter() - started)
+
+
+@contextmanager
+def _bench_environment(url: str, with_cache: bool):
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_profile(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    ttl = view_cache.ttl_seconds
+    if not with_cache:
+        view_cache.ttl_seconds = 0
+    try:
+        # broadcast / スケジューラのログ出力で計測結果が埋もれないよう print も黙らせる
+        with mock.patch.object(push_dispatcher, "_deliver", _fake_deliver), mock.patch("builtins.print"):
+            yield engine, factory
+    finally:
+        view_cache.ttl_seconds = ttl
+        engine.dispose()
+
+
+def run(url: str, iterations: int, seed: int, only: Optional[list[str]], with_cache: bool) -> dict:
+    selected = (lambda name: name in only) if only else (lambda name: True)
+    results = {"routes": {}, "services": {}}
+    with _bench_environment(url, with_cache) as (engine, factory):
+        counter = QueryCounter(engine)
+        targets = Targets(factory, seed, iterations)
+
+        def override_get_db():
+            db = factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        try:
+            client = TestClient(app)  # lifespan（スケジューラ・SSE ポーラー）は起動しない
+            for case in ROUTES:
+                if selected(case.name):
+                    with factory() as db:
+                        targets.sync_cursor = _sync_cursor(db)
+                    results["routes"][case.name] = _measure(
+                        case, iterations, counter, lambda: case.run(client, targets)
+                    )
+                    _report("route", case.name, results["routes"][case.name])
+        finally:
+            app.dependency_overrides.clear()
+
+        for case in SERVICES:
+            if selected(case.name):
+
+                def call():
+                    with factory() as db:
+                        case.run(db, targets)
+
+                results["services"][case.name] = _measure(case, iterations, counter, call)
+                _report("service", case.name, results["services"][case.name])
+    return results
+
+
+def _report(kind: str, name: str, result: dict) -> None:
+    sys.stdout.write(
+        f"{kind:7s} {name:48s} p50={result['p50_ms']:9.3f}ms p95={result['p95_ms']:9.3f}ms "
+        f"{result['per_sec']:9.1f}/s queries={result['queries']}\n"
+    )
+    sys.stdout.flush()
+
+
+def baseline_name(tasks: int, seed: int, with_cache: bool) -> str:
+    return f"tasks-{tasks}-seed-{seed}{'-cached' if with_cache else ''}.json"
+
+
+def mismatched_meta(current: dict, baseline: dict) -> list[str]:
+    return [
+        f"{key}: {baseline['meta'].get(key)} -> {current['meta'][key]}"
+        for key in COMPARABLE_META
+        if baseline["meta"].get(key) != current["meta"][key]
+    ]
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """ベースラインより悪化した項目を返す。"""
+    regressions = []
+    for kind in ("routes", "services"):
+        for name, result in current[kind].items():
+            base = baseline.get(kind, {}).get(name)
+            if base is None:
+                continue
+            slower = result["p50_ms"] > base["p50_ms"] * (1 + threshold)
+            if slower and result["p50_ms"] - base["p50_ms"] >= NOISE_FLOOR_MS:
+                regressions.append(f"{name}: p50 {base['p50_ms']}ms -> {result['p50_ms']}ms")
+            if result["queries"] > base["queries"]:
+                regressions.append(f"{name}: queries {base['queries']} -> {result['queries']}")
+    return regressions
+
+
+def _prepare_data(data_dir: Path, tasks: int, seed: int, regenerate: bool) -> Path:
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / f"tasks-{tasks}-seed-{seed}.db"
+    if regenerate or not path.exists():
+        path.unlink(missing_ok=True)
+        started = time.perf_counter()
+        counts = datagen.generate(f"sqlite:///{path}", tasks, seed=seed)
+        sys.stdout.write(f"generated {path}: {counts} ({time.perf_counter() - started:.1f}s)\n")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", default="10k", help=f"タスク数（数値または {', '.join(datagen.SCALES)}）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--only", nargs="+", help="実行するケース名（ルートは 'GET /tasks/stale' の形）")
+    parser.add_argument("--with-cache", action="store_true", help="派生ビューのキャッシュを有効にして測る")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--regenerate", action="store_true", help="保存済みの合成データを作り直す")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="保存済みのベースラインと比較する")
+    parser.add_argument("--threshold", type=float, default=1.0, help="p50 の悪化を回帰とみなす割合（既定は 2 倍）")
+    args = parser.parse_args()
+
+    tasks = datagen.SCALES.get(args.tasks) or int(args.tasks)
+    source = _prepare_data(args.data_dir, tasks, args.seed, args.regenerate)
+    with tempfile.TemporaryDirectory() as tmp:
+        # 書き込みケースで保存済みデータを汚さないよう作業用コピーに対して実行する
+        work = Path(tmp) / "bench.db"
+        shutil.copyfile(source, work)
+        results = run(f"sqlite:///{work}", args.iterations, args.seed, args.only, args.with_cache)
+
+    report = {
+        "meta": {
+            "tasks": tasks,
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "with_cache": args.with_cache,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        **results,
+    }
+    baseline_path = BASELINE_DIR / baseline_name(tasks, args.seed, args.with_cache)
+
+    exit_code = 0
+    if args.compare:
+        if not baseline_path.exists():
+            sys.exit(f"ベースラインがありません: {baseline_path}（--save-baseline で作成する）")
+        baseline = json.loads(baseline_path.read_text())
+        mismatched = mismatched_meta(report, baseline)
+        if mismatched:
+            sys.exit(f"ベースラインと計測条件が違うため比較できません: {', '.join(mismatched)}")
+        regressions = compare(report, baseline, args.threshold)
+        sys.stdout.write(f"\nregressions vs {baseline_path.name}: {len(regressions)}\n")
+        for line in regressions:
+            sys.stdout.write(f"  {line}\n")
+        exit_code = 1 if regressions else 0
+    if args.save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+        sys.stdout.write(f"saved baseline: {baseline_path}\n")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
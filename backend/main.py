@@ -2,12 +2,29 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from app.api import captures, carryover, checklist, push, tasks
+from app.api import (
+    async_captures,
+    async_tasks,
+    backup,
+    captures,
+    carryover,
+    checklist,
+    conditional,
+    events,
+    push,
+    search,
+    sync,
+    tasks,
+)
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.notification_setting import NotificationSetting
+from app.services import metrics, sql_profiler
+from app.services.event_broker import broker
 from app.services.scheduler import start_scheduler, stop_scheduler, update_schedule
+from app.services.view_cache import view_cache
 
 
 @asynccontextmanager
@@ -21,7 +38,9 @@ async def lifespan(app: FastAPI):
             update_schedule(setting.notify_time_1, setting.notify_time_2, setting.enabled)
     finally:
         db.close()
+    broker.start()
     yield
+    await broker.stop()
     stop_scheduler()
 
 
@@ -32,16 +51,41 @@ app.add_middleware(
     allow_origins=settings.cors_origins_list,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[tasks.NEXT_CURSOR_HEADER, conditional.ETAG_HEADER],
 )
 
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+# SQL_PROFILE はリクエストごとに見る（off なら素通しするだけ）
+app.add_middleware(sql_profiler.SqlProfileMiddleware)
+
 # 固定パス（/stale, /carryover-candidates）を /{task_id} より先に登録する
 app.include_router(carryover.router, prefix="/tasks", tags=["carryover"])
-app.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
+# async_db 有効時は tasks / captures を AsyncSession 版のルーターに差し替える
+tasks_router = async_tasks.router if settings.async_db else tasks.router
+captures_router = async_captures.router if settings.async_db else captures.router
+app.include_router(tasks_router, prefix="/tasks", tags=["tasks"])
 app.include_router(checklist.router, prefix="/tasks", tags=["checklist"])
-app.include_router(captures.router, prefix="/captures", tags=["captures"])
+app.include_router(captures_router, prefix="/captures", tags=["captures"])
 app.include_router(push.router, prefix="/push", tags=["push"])
+app.include_router(events.router, prefix="/events", tags=["events"])
+app.include_router(sync.router, prefix="/sync", tags=["sync"])
+app.include_router(search.router, prefix="/search", tags=["search"])
+app.include_router(backup.router, tags=["backup"])
 
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    # 派生ビューキャッシュのヒット・ミス数（ワーカーごとの値）
+    return view_cache.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    # ルートごとのレイテンシ・SQL 回数と時間、接続プール、派生ビューキャッシュ（ワーカーごとの値）
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
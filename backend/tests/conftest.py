@@ -1,18 +1,27 @@
+import os
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 import app.models.capture_item  # noqa: F401
+import app.models.change_counter  # noqa: F401
+import app.models.change_event  # noqa: F401
 import app.models.checklist_item  # noqa: F401
 import app.models.completion_log  # noqa: F401
+import app.models.search_index  # noqa: F401
+import app.models.sync_tombstone  # noqa: F401
 import app.models.task  # noqa: F401
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import engine_options, get_db, get_read_db
+from app.services.view_cache import view_cache
 from main import app
 
-TEST_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+# TEST_DATABASE_URL=postgresql://... を指定すると PostgreSQL でテストを実行できる
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "sqlite:///./test.db")
+engine = create_engine(TEST_DATABASE_URL, **engine_options(TEST_DATABASE_URL))
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 TASK_PAYLOAD = {
@@ -26,6 +35,8 @@ TASK_PAYLOAD = {
 @pytest.fixture(scope="function")
 def db():
     Base.metadata.create_all(bind=engine)
+    # 変更カウンタはテストごとに 0 から数え直すため、前のテストのキャッシュを持ち越さない
+    view_cache.invalidate()
     session = TestingSessionLocal()
     try:
         yield session
@@ -40,6 +51,7 @@ def client(db):
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -51,3 +63,19 @@ def create_task(client, **kwargs) -> dict:
     assert res.status_code == 201, res.text
     return res.json()
 
+
+@contextmanager
+def capture_selects(db):
+    """ブロック内で発行された SELECT 文を (statement, parameters) のリストに記録する。"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
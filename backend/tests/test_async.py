@@ -0,0 +1,96 @@
+"""async ルーター（settings.async_db 有効時の経路）のテスト。"""
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import async_captures, async_tasks
+from app.api.tasks import NEXT_CURSOR_HEADER
+from app.db.session import async_url, get_async_db
+from tests.conftest import TASK_PAYLOAD, TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def async_client(db):
+    async_engine = create_async_engine(async_url(TEST_DATABASE_URL))
+    AsyncTestingSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(async_tasks.router, prefix="/tasks")
+    app.include_router(async_captures.router, prefix="/captures")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+    await async_engine.dispose()
+
+
+async def test_task_crud(async_client):
+    res = await async_client.post("/tasks", json=TASK_PAYLOAD)
+    assert res.status_code == 201
+    task_id = res.json()["id"]
+
+    res = await async_client.post(f"/tasks/{task_id}/children", json={**TASK_PAYLOAD, "title": "子"})
+    assert res.status_code == 201
+
+    res = await async_client.get(f"/tasks/{task_id}")
+    assert res.status_code == 200
+    assert [c["title"] for c in res.json()["children"]] == ["子"]
+
+    res = await async_client.patch(f"/tasks/{task_id}", json={"title": "変更後"})
+    assert res.json()["title"] == "変更後"
+
+    res = await async_client.delete(f"/tasks/{task_id}")
+    assert res.status_code == 204
+    assert (await async_client.get(f"/tasks/{task_id}")).status_code == 404
+
+
+async def test_list_tasks_pagination(async_client):
+    for i in range(3):
+        await async_client.post("/tasks", json={**TASK_PAYLOAD, "title": f"t{i}"})
+
+    res = await async_client.get("/tasks", params={"limit": 2, "sort_by": "created_at"})
+    assert len(res.json()) == 2
+    cursor = res.headers[NEXT_CURSOR_HEADER]
+
+    res = await async_client.get("/tasks", params={"limit": 2, "sort_by": "created_at", "cursor": cursor})
+    assert [t["title"] for t in res.json()] == ["t2"]
+    assert NEXT_CURSOR_HEADER not in res.headers
+
+
+async def test_not_found(async_client):
+    res = await async_client.get("/tasks/9999")
+    assert res.status_code == 404
+
+
+async def test_captures(async_client):
+    res = await async_client.post("/captures", json={"text": "メモ"})
+    assert res.status_code == 201
+    capture_id = res.json()["id"]
+
+    res = await async_client.patch(f"/captures/{capture_id}", json={"is_resolved": True})
+    assert res.json()["is_resolved"] is True
+
+    res = await async_client.get("/captures", params={"is_resolved": True})
+    assert [c["id"] for c in res.json()] == [capture_id]
+
+
+async def test_capture_triage(async_client):
+    capture_id = (await async_client.post("/captures", json={"text": "メモ"})).json()["id"]
+    res = await async_client.post("/captures/triage", json={"items": [{"capture_id": capture_id}]})
+    assert res.status_code == 200, res.text
+    (result,) = res.json()["results"]
+    assert result["capture"]["related_task_id"] == result["task"]["id"]
+
+
+async def test_conditional_get(async_client):
+    etag = (await async_client.get("/tasks")).headers["ETag"]
+    res = await async_client.get("/tasks", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+    await async_client.post("/tasks", json=TASK_PAYLOAD)
+    res = await async_client.get("/tasks", headers={"If-None-Match": etag})
+    assert res.status_code == 200
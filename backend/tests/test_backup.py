@@ -0,0 +1,144 @@
+"""GET /export・POST /import（NDJSON のバックアップと復元）のテスト。"""
+import json
+from datetime import date
+
+from sqlalchemy import delete
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.session import create_app_engine
+from app.models.checklist_item import TaskChecklistItem
+from app.models.task import Task
+from app.services import backup_service, event_service
+from tests.conftest import TASK_PAYLOAD, create_task
+
+
+def _seed(client) -> None:
+    root = create_task(client, title="根", due_date=str(date.today()))
+    child = client.post(
+        f"/tasks/{root['id']}/children",
+        json={"title": "子", "task_type": "research", "priority": "should", "done_criteria": "調べた"},
+    ).json()
+    item = client.post(f"/tasks/{root['id']}/checklist", json={"text": "見積もりを取る"}).json()
+    client.post(f"/tasks/{root['id']}/checklist/{item['id']}/extract", json={})
+    client.post(f"/tasks/{child['id']}/complete", json={"note": "済"})
+    client.post("/captures", json={"text": "メモ", "related_task_id": root["id"]})
+    client.put("/push/notification-setting", json={"notify_time_1": "07:30", "notify_time_2": "20:00", "enabled": False})
+
+
+def _export(client) -> list[dict]:
+    res = client.get("/export")
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+def _wipe(db) -> None:
+    for table in reversed(backup_service.TABLES.values()):
+        if table.name == "tasks":
+            db.execute(table.update().values(origin_checklist_item_id=None, parent_id=None))
+        db.execute(delete(table))
+    db.commit()
+
+
+def _chunks(body: bytes, size: int = 7):
+    # 行の途中で区切られた本文を受け取れること
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+def test_export_import_round_trip(client, db):
+    _seed(client)
+    records = _export(client)
+    assert records[0]["type"] == "meta"
+    order = ["notification_settings", "tasks", "checklist_items", "task_origins", "completion_logs", "captures"]
+    types = [r["type"] for r in records[1:]]
+    assert types == sorted(types, key=order.index)
+    [origin] = [r["data"] for r in records if r["type"] == "task_origins"]
+    assert origin["origin_checklist_item_id"] is not None
+    assert all("sync_version" not in r["data"] for r in records[1:])
+
+    body = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode()
+    _wipe(db)
+    after = event_service.latest_id(db)
+    res = client.post("/import", content=_chunks(body), headers={"content-type": "application/x-ndjson"})
+    assert res.status_code == 200, res.text
+    # 接続中の SSE クライアントには reset だけを送る
+    assert [e["type"] for e in event_service.events_since(db, after)] == [event_service.RESET]
+    assert res.json()["imported"] == {
+        "notification_settings": 1,
+        "tasks": 3,
+        "checklist_items": 1,
+        "task_origins": 1,
+        "completion_logs": 1,
+        "captures": 1,
+    }
+    assert _export(client)[1:] == records[1:]
+    # 取り込んだ id の続きから採番する
+    assert create_task(client)["id"] == 4
+    assert client.get("/push/notification-setting").json()["notify_time_1"] == "07:30"
+
+
+def test_import_rejects_non_empty_database(client):
+    records = _export(client)
+    create_task(client)
+    body = "".join(json.dumps(r) + "\n" for r in records)
+    res = client.post("/import", content=body)
+    assert res.status_code == 400
+    assert "既存のデータ" in res.json()["detail"]
+
+
+def test_import_rejects_missing_meta(client):
+    res = client.post("/import", content='{"type": "tasks", "data": {}}\n')
+    assert res.status_code == 400
+
+
+def test_invalid_line_rolls_back_everything(client, db):
+    _seed(client)
+    records = _export(client)
+    _wipe(db)
+    after = event_service.latest_id(db)
+    body = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records) + "{壊れた行\n"
+    res = client.post("/import", content=body)
+    assert res.status_code == 400
+    assert f"{len(records) + 1} 行目" in res.json()["detail"]
+    assert client.get("/tasks").json() == []
+    assert event_service.events_since(db, after) == []
+
+
+def test_import_batches(client, db, monkeypatch):
+    monkeypatch.setattr(backup_service, "IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(backup_service, "EXPORT_BATCH_SIZE", 2)
+    for i in range(5):
+        create_task(client, title=f"タスク{i}")
+    records = _export(client)
+    _wipe(db)
+    res = client.post("/import", content="".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+    assert res.json()["imported"]["tasks"] == 5
+    assert [t["title"] for t in client.get("/tasks?sort_by=created_at").json()] == [f"タスク{i}" for i in range(5)]
+
+
+def test_export_is_one_snapshot_on_sqlite(tmp_path):
+    # WAL のファイル DB で、テーブルを読む合間に別の接続からコミットする
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, bind=engine)
+    with Session() as writer:
+        writer.add(Task(**TASK_PAYLOAD))
+        writer.commit()
+
+    exported = []
+    for batch in backup_service.iter_export(Session()):
+        exported += batch
+        if batch[0]["type"] == "tasks":
+            with Session() as writer:
+                task = Task(**TASK_PAYLOAD)
+                writer.add(task)
+                writer.flush()
+                writer.add(TaskChecklistItem(task_id=task.id, text="後から", order_no=1))
+                writer.commit()
+    engine.dispose()
+
+    types = [r["type"] for r in exported]
+    assert types.count("tasks") == 1
+    assert "checklist_items" not in types
@@ -84,3 +84,28 @@ class TestCarryoverActions:
     def test_carryover_task_not_found(self, client):
         res = client.post("/tasks/9999/carryover", json={"action": "today"})
         assert res.status_code == 404
+
+    def test_carryover_bulk(self, client, db):
+        past = date.today() - timedelta(days=5)
+        a = create_task(client, due_date=past.isoformat())
+        b = create_task(client, due_date=past.isoformat())
+        res = client.post(
+            "/tasks/carryover/bulk",
+            json={
+                "items": [
+                    {"task_id": a["id"], "action": "plus_7d"},
+                    {"task_id": b["id"], "action": "needs_redefine"},
+                    {"task_id": 9999, "action": "today"},
+                ]
+            },
+        )
+        assert res.status_code == 200
+        assert [r["ok"] for r in res.json()["results"]] == [True, True, False]
+        assert client.get(f"/tasks/{a['id']}").json()["due_date"] == (past + timedelta(days=7)).isoformat()
+        assert client.get(f"/tasks/{b['id']}").json()["status"] == "needs_redefine"
+        assert client.get("/tasks/carryover-candidates").json() == []
+
+    def test_carryover_bulk_invalid_action(self, client, db):
+        t = create_overdue_task(client, db)
+        res = client.post("/tasks/carryover/bulk", json={"items": [{"task_id": t["id"], "action": "x"}]})
+        assert res.status_code == 422
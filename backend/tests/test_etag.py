@@ -0,0 +1,99 @@
+"""一覧 API の ETag / If-None-Match のテスト。"""
+from datetime import date, timedelta
+
+from tests.conftest import TASK_PAYLOAD, create_task
+
+
+def _revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+class TestTaskListEtag:
+    def test_unchanged_list_returns_304(self, client):
+        create_task(client)
+        first = client.get("/tasks")
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "no-cache"
+
+        res = _revalidate(client, "/tasks", etag)
+        assert res.status_code == 304
+        assert res.content == b""
+        assert res.headers["ETag"] == etag
+
+    def test_weak_and_multiple_tags_match(self, client):
+        etag = client.get("/tasks").headers["ETag"]
+        assert _revalidate(client, "/tasks", f'"other", W/{etag}').status_code == 304
+
+    def test_create_update_delete_change_etag(self, client):
+        task = create_task(client)
+        etags = {client.get("/tasks").headers["ETag"]}
+
+        client.patch(f"/tasks/{task['id']}", json={"title": "変更"})
+        etags.add(client.get("/tasks").headers["ETag"])
+
+        client.delete(f"/tasks/{task['id']}")
+        res = _revalidate(client, "/tasks", client.get("/tasks").headers["ETag"])
+        assert res.status_code == 304
+        etags.add(res.headers["ETag"])
+        assert len(etags) == 3
+
+    def test_delete_with_children_changes_etag(self, client):
+        parent = create_task(client)
+        client.post(f"/tasks/{parent['id']}/children", json={**TASK_PAYLOAD, "title": "子"})
+        etag = client.get("/tasks").headers["ETag"]
+
+        client.delete(f"/tasks/{parent['id']}")
+        assert _revalidate(client, "/tasks", etag).status_code == 200
+
+    def test_bulk_update_changes_etag(self, client):
+        task = create_task(client)
+        etag = client.get("/tasks").headers["ETag"]
+        res = client.post("/tasks/bulk", json={"operations": [{"op": "update", "id": task["id"], "data": {"title": "一括"}}]})
+        assert res.json()["results"][0]["error"] is None
+        assert _revalidate(client, "/tasks", etag).status_code == 200
+
+    def test_fields_projection_has_etag(self, client):
+        create_task(client)
+        res = client.get("/tasks?fields=title")
+        assert _revalidate(client, "/tasks?fields=title", res.headers["ETag"]).status_code == 304
+
+
+class TestDerivedListEtag:
+    def test_stale_revalidates(self, client):
+        etag = client.get("/tasks/stale").headers["ETag"]
+        assert _revalidate(client, "/tasks/stale", etag).status_code == 304
+        create_task(client)
+        assert _revalidate(client, "/tasks/stale", etag).status_code == 200
+
+    def test_carryover_candidates_revalidate(self, client):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        task = create_task(client, due_date=yesterday)
+        etag = client.get("/tasks/carryover-candidates").headers["ETag"]
+        assert _revalidate(client, "/tasks/carryover-candidates", etag).status_code == 304
+
+        client.post(f"/tasks/{task['id']}/carryover", json={"action": "today"})
+        res = _revalidate(client, "/tasks/carryover-candidates", etag)
+        assert res.status_code == 200
+        assert res.json() == []
+
+
+class TestCaptureListEtag:
+    def test_capture_writes_change_etag(self, client):
+        capture = client.post("/captures", json={"text": "メモ"}).json()
+        etag = client.get("/captures").headers["ETag"]
+        assert _revalidate(client, "/captures", etag).status_code == 304
+
+        client.patch(f"/captures/{capture['id']}", json={"is_resolved": True})
+        res = _revalidate(client, "/captures", etag)
+        assert res.status_code == 200
+        etag = res.headers["ETag"]
+
+        client.delete(f"/captures/{capture['id']}")
+        res = _revalidate(client, "/captures", etag)
+        assert res.status_code == 200
+        assert res.json() == []
+
+    def test_task_writes_do_not_change_capture_etag(self, client):
+        etag = client.get("/captures").headers["ETag"]
+        create_task(client)
+        assert _revalidate(client, "/captures", etag).status_code == 304
@@ -0,0 +1,169 @@
+"""変更イベント（GET /events の SSE）のテスト。"""
+import asyncio
+import json
+
+from app.api.events import RESET_EVENT, _backlog, event_stream, format_event
+from app.models.change_event import ChangeEvent
+from app.services import event_service
+from app.services.event_broker import EventBroker, broker
+from tests.conftest import TASK_PAYLOAD, TestingSessionLocal, create_task
+
+
+def _types(db, after_id: int = 0) -> list[str]:
+    return [e["type"] for e in event_service.events_since(db, after_id)]
+
+
+class FakeRequest:
+    """is_disconnected が指定回数目以降 True を返す。"""
+
+    def __init__(self, connected_checks: int):
+        self.remaining = connected_checks
+
+    async def is_disconnected(self) -> bool:
+        self.remaining -= 1
+        return self.remaining < 0
+
+
+class TestRecording:
+    def test_task_lifecycle_events(self, client, db):
+        task = create_task(client)
+        client.patch(f"/tasks/{task['id']}", json={"title": "変更"})
+        item = client.post(f"/tasks/{task['id']}/checklist", json={"text": "項目"}).json()
+        client.patch(f"/tasks/{task['id']}/checklist/{item['id']}", json={"is_done": True})
+        client.post(f"/tasks/{task['id']}/complete", json={})
+        client.delete(f"/tasks/{task['id']}")
+        assert _types(db) == [
+            "task.created",
+            "task.updated",
+            "checklist.updated",
+            "checklist.updated",
+            "task.completed",
+            "task.deleted",
+        ]
+        first = event_service.events_since(db, 0)[0]
+        assert first["data"] == {"id": task["id"], "parent_id": None}
+
+    def test_capture_events(self, client, db):
+        capture = client.post("/captures", json={"text": "メモ"}).json()
+        client.delete(f"/captures/{capture['id']}")
+        assert _types(db) == ["capture.created", "capture.deleted"]
+
+    def test_bulk_records_one_event_per_row(self, client, db):
+        task = create_task(client)
+        after = event_service.latest_id(db)
+        client.post(
+            "/tasks/bulk",
+            json={
+                "operations": [
+                    {"op": "create", "data": TASK_PAYLOAD},
+                    {"op": "update", "id": task["id"], "data": {"title": "一括"}},
+                ]
+            },
+        )
+        assert sorted(_types(db, after)) == ["task.created", "task.updated"]
+
+    def test_failed_write_records_nothing(self, client, db):
+        task = create_task(client)
+        after = event_service.latest_id(db)
+        res = client.patch(f"/tasks/{task['id']}", json={"status": "done"})
+        assert res.status_code == 400
+        assert _types(db, after) == []
+
+    def test_ids_follow_commit_order(self, db):
+        # 先に記録したトランザクションでも、後に commit すれば大きい id になる
+        first, second = TestingSessionLocal(), TestingSessionLocal()
+        try:
+            event_service.record(first, event_service.TASK_UPDATED, id=1)
+            event_service.record(second, event_service.TASK_UPDATED, id=2)
+            second.commit()
+            first.commit()
+        finally:
+            first.close()
+            second.close()
+        assert [e["data"]["id"] for e in event_service.events_since(db, 0)] == [2, 1]
+
+    def test_rolled_back_events_do_not_use_ids(self, db):
+        event_service.record(db, event_service.TASK_UPDATED, id=1)
+        db.rollback()
+        event_service.record(db, event_service.TASK_UPDATED, id=2)
+        db.commit()
+        assert [(e["id"], e["data"]["id"]) for e in event_service.events_since(db, 0)] == [(1, 2)]
+
+
+class TestBroker:
+    def test_poll_starts_at_tail(self, client, db):
+        create_task(client)
+        b = EventBroker(queue_size=10)
+        assert b.poll_once(db) == []
+        task = create_task(client)
+        assert [e["data"]["id"] for e in b.poll_once(db)] == [task["id"]]
+        assert b.poll_once(db) == []
+
+    async def test_publish_fans_out(self):
+        b = EventBroker(queue_size=10)
+        queues = [b.subscribe() for _ in range(3)]
+        b.publish([{"id": 1, "type": "task.created", "data": {"id": 1}}])
+        assert [q.get_nowait()["id"] for q in queues] == [1, 1, 1]
+
+    async def test_slow_subscriber_is_dropped(self):
+        b = EventBroker(queue_size=2)
+        queue = b.subscribe()
+        b.publish([{"id": i, "type": "task.updated", "data": {"id": i}} for i in range(1, 4)])
+        assert queue.get_nowait() is None
+        assert b.subscriber_count == 0
+
+
+class TestStream:
+    async def test_backlog_then_live_then_heartbeat(self):
+        queue = broker.subscribe()
+        backlog = [{"id": 5, "type": "task.created", "data": {"id": 1}}]
+        # backlog と重複する id 5 は読み飛ばされる
+        queue.put_nowait({"id": 5, "type": "task.created", "data": {"id": 1}})
+        queue.put_nowait({"id": 6, "type": "task.completed", "data": {"id": 1}})
+
+        stream = event_stream(FakeRequest(3), queue, backlog, last_event_id=4, heartbeat_seconds=0.01)
+        chunks = [chunk async for chunk in stream]
+
+        assert chunks[0].startswith("retry:")
+        assert chunks[1] == format_event(backlog[0])
+        assert chunks[2] == 'id: 6\nevent: task.completed\ndata: {"id":1}\n\n'
+        assert chunks[3] == ": heartbeat\n\n"
+        assert queue not in broker._subscribers
+
+    def test_resume_from_last_event_id(self, client, db):
+        create_task(client)
+        last_id = event_service.latest_id(db)
+        task = create_task(client)
+        events = _backlog(db, last_id)
+        assert [(e["type"], e["data"]["id"]) for e in events] == [("task.created", task["id"])]
+
+    def test_resume_past_retention_sends_reset(self, client, db):
+        create_task(client)
+        create_task(client)
+        db.query(ChangeEvent).filter(ChangeEvent.id == 1).delete()
+        db.commit()
+        events = _backlog(db, 0)
+        assert [e["type"] for e in events] == [RESET_EVENT]
+        assert events[0]["id"] == event_service.latest_id(db)
+
+    def test_resume_after_all_events_pruned_sends_reset(self, client, db):
+        create_task(client)
+        create_task(client)
+        db.query(ChangeEvent).delete()
+        db.commit()
+        events = _backlog(db, 1)
+        assert [(e["type"], e["id"]) for e in events] == [(RESET_EVENT, 2)]
+        # 最新まで受け取っているクライアントには何も送らない
+        assert _backlog(db, 2) == []
+
+    def test_format_event(self):
+        text = format_event({"id": 3, "type": "capture.created", "data": {"id": 9}})
+        lines = text.strip().split("\n")
+        assert lines[:2] == ["id: 3", "event: capture.created"]
+        assert json.loads(lines[2].removeprefix("data: ")) == {"id": 9}
+
+
+def test_broker_runs_with_app(client):
+    # lifespan でポーリングタスクが起動している
+    assert broker._task is not None and not broker._task.done()
+    assert isinstance(broker._task, asyncio.Task)
@@ -0,0 +1,83 @@
+"""一覧 API の高速 JSON 経路（Pydantic 検証なし）のテスト。"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.api import fast_json
+from app.models.task import Task
+from app.schemas.enums import Priority, TaskStatus, TaskType
+from app.schemas.task import CarryoverCandidateResponse, StaleTaskResponse, TaskResponse
+from tests.conftest import create_task
+
+
+def _detail_as_list_item(client, task_id: int) -> dict:
+    # 詳細は Pydantic を通るので、一覧の各行はこれと一致するはず
+    detail = client.get(f"/tasks/{task_id}").json()
+    return {name: detail[name] for name in TaskResponse.model_fields}
+
+
+def test_task_list_matches_pydantic_output(client):
+    parent = create_task(client, due_date=str(date.today()), category="仕事")
+    create_task(client, parent_id=parent["id"], task_type="decision", reversible=True)
+
+    res = client.get("/tasks")
+    assert res.headers["content-type"] == "application/json"
+    items = res.json()
+    assert [list(item) for item in items] == [list(TaskResponse.model_fields)] * 2
+    assert items == [_detail_as_list_item(client, item["id"]) for item in items]
+
+
+def test_stale_and_carryover_keep_response_model_keys(client, db):
+    task = create_task(client, priority="must", due_date=str(date.today() - timedelta(days=3)))
+    row = db.get(Task, task["id"])
+    row.last_updated_at = datetime.utcnow() - timedelta(days=10)
+    db.commit()
+
+    [stale] = client.get("/tasks/stale").json()
+    assert list(stale) == list(StaleTaskResponse.model_fields)
+    assert stale == StaleTaskResponse.model_validate(stale).model_dump(mode="json")
+    assert (stale["stale_days"], stale["threshold_days"]) == (10, 7)
+
+    [candidate] = client.get("/tasks/carryover-candidates").json()
+    assert list(candidate) == list(CarryoverCandidateResponse.model_fields)
+    assert candidate["overdue_days"] == 3
+
+
+def test_openapi_keeps_response_models(client):
+    paths = client.get("/openapi.json").json()["paths"]
+    expected = {
+        "/tasks": "TaskResponse",
+        "/tasks/stale": "StaleTaskResponse",
+        "/tasks/carryover-candidates": "CarryoverCandidateResponse",
+        "/captures": "CaptureItemResponse",
+    }
+    for path, model in expected.items():
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["items"]["$ref"] == f"#/components/schemas/{model}"
+
+
+def test_encoder_matches_pydantic_json():
+    row = {
+        "id": 1,
+        "title": "日本語",
+        "task_type": TaskType.decision,
+        "category": None,
+        "priority": Priority.must,
+        "status": TaskStatus.todo,
+        "due_date": date(2024, 1, 31),
+        "parent_id": None,
+        "origin_checklist_item_id": None,
+        "done_criteria": "完了基準",
+        "decision_criteria": None,
+        "reversible": True,
+        "exploration_limit": 3,
+        "last_updated_at": datetime(2024, 1, 31, 9, 30, 0, 123456),
+        "created_at": datetime(2024, 1, 31, 9, 30),
+    }
+    row = {name: row[name] for name in TaskResponse.model_fields}
+    adapter = TypeAdapter(list[TaskResponse])
+    assert fast_json.dumps([row]) == adapter.dump_json(adapter.validate_python([row]))
+    assert fast_json.loads(fast_json.dumps([row]))[0]["due_date"] == "2024-01-31"
+    with pytest.raises(TypeError):
+        fast_json.dumps([object()])
@@ -0,0 +1,84 @@
+"""GET /metrics（Prometheus 形式の計測値）のテスト。"""
+import re
+
+import pytest
+
+from app.services import metrics
+from tests.conftest import create_task, engine
+
+# テスト用エンジンにも SQL の計測フックを付ける（アプリのエンジンは session.py で計測済み）
+metrics.instrument_engine(engine, "test")
+
+
+def _scrape(client) -> str:
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return res.text
+
+
+def _value(text: str, series: str) -> float:
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    assert match, f"{series} がありません"
+    return float(match.group(1))
+
+
+def test_requests_are_labelled_by_route_template(client):
+    task = create_task(client)
+    before = _scrape(client)
+    series = 'http_requests_total{method="GET",route="/tasks/{task_id}",status="200"}'
+    count = _value(before, series) if series in before else 0
+
+    client.get(f"/tasks/{task['id']}")
+    client.get(f"/tasks/{task['id']}")
+    text = _scrape(client)
+    assert _value(text, series) == count + 2
+    assert f"/tasks/{task['id']}\"" not in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/tasks/{task_id}",le="+Inf"}' in text
+
+
+def test_request_query_counts_and_time(client):
+    task = create_task(client)
+    labels = '{method="GET",route="/tasks/{task_id}"}'
+    text = _scrape(client)
+    before = _value(text, f"http_request_queries_sum{labels}") if labels in text else 0
+
+    client.get(f"/tasks/{task['id']}")
+    text = _scrape(client)
+    # 本体 + 子タスク + チェックリストの 3 クエリ
+    assert _value(text, f"http_request_queries_sum{labels}") - before >= 3
+    assert _value(text, f"http_request_query_duration_seconds_sum{labels}") > 0
+    assert _value(text, 'db_queries_total{engine="test"}') > 0
+
+
+def test_unmatched_paths_share_one_label(client):
+    assert client.get("/no-such-path/123").status_code == 404
+    text = _scrape(client)
+    assert 'route="unmatched",status="404"' in text
+    assert "/no-such-path" not in text
+
+
+def test_pool_and_view_cache_metrics(client):
+    client.get("/tasks/stale")
+    text = _scrape(client)
+    assert 'db_pool_checked_out{engine="test"}' in text
+    assert 'view_cache_misses_total{view="stale_tasks"}' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("sample_seconds", "サンプル", (0.1, 1.0), ("route",))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, ("/a",))
+    lines = list(histogram.render())
+    assert 'sample_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'sample_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'sample_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'sample_seconds_count{route="/a"} 4' in lines
+    assert lines[-2] == f'sample_seconds_sum{{route="/a"}} {0.05 + 0.5 + 0.5 + 3.0!r}'
+
+
+@pytest.mark.parametrize("value, expected", [('a"b', 'a\\"b'), ("a\\b", "a\\\\b")])
+def test_label_values_are_escaped(value, expected):
+    counter = metrics.Counter("sample_total", "サンプル", ("route",))
+    counter.inc((value,))
+    assert f'sample_total{{route="{expected}"}} 1' in list(counter.render())
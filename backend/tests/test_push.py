@@ -0,0 +1,129 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from pywebpush import WebPushException
+
+from app.models.push_subscription import PushSubscription
+from app.services import push_dispatcher
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = ""
+
+
+def add_subscriptions(db, count: int) -> list[PushSubscription]:
+    subs = [
+        PushSubscription(endpoint=f"https://push.example.com/{i}", p256dh="key", auth="auth")
+        for i in range(count)
+    ]
+    db.add_all(subs)
+    db.commit()
+    return subs
+
+
+class TestPushFanOut:
+    def test_send_test_runs_concurrently(self, client, db, monkeypatch):
+        add_subscriptions(db, 8)
+        active, peak = 0, 0
+        lock = threading.Lock()
+
+        def fake_webpush(**kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return FakeResponse(201)
+
+        monkeypatch.setattr(push_dispatcher, "webpush", fake_webpush)
+        res = client.post("/push/send-test", json={"title": "t", "body": "b"})
+        assert res.status_code == 200
+        data = res.json()
+        assert data["sent"] == 8
+        assert data["total"] == 8
+        assert data["latency_ms"]["p50"] >= 50
+        assert peak > 1
+
+    def test_reuses_session_and_sets_timeout(self, db, monkeypatch):
+        add_subscriptions(db, 3)
+        calls = []
+        monkeypatch.setattr(push_dispatcher, "webpush", lambda **kw: calls.append(kw) or FakeResponse(201))
+        targets = [push_dispatcher.PushTarget(s.id, s.endpoint, s.p256dh, s.auth) for s in db.query(PushSubscription)]
+
+        push_dispatcher.fan_out(targets, "t", "b")
+
+        assert len({id(kw["requests_session"]) for kw in calls}) == 1
+        assert all(kw["timeout"] == push_dispatcher.settings.push_timeout_seconds for kw in calls)
+
+    def test_failures_are_aggregated(self, client, db, monkeypatch):
+        subs = add_subscriptions(db, 3)
+
+        def fake_webpush(subscription_info, **kwargs):
+            if subscription_info["endpoint"] == subs[0].endpoint:
+                raise WebPushException("gone", response=FakeResponse(410))
+            return FakeResponse(201)
+
+        monkeypatch.setattr(push_dispatcher, "webpush", fake_webpush)
+        data = client.post("/push/send-test", json={"title": "t", "body": "b"}).json()
+        assert data["sent"] == 2
+        assert data["failed"] == 1
+        assert data["errors"] == {"http_410": 1}
+
+    def test_send_test_without_subscriptions(self, client):
+        assert client.post("/push/send-test", json={"title": "t", "body": "b"}).status_code == 404
+
+
+class TestSubscriptionPruning:
+    def _send(self, client, monkeypatch, statuses: dict[str, int]):
+        def fake_webpush(subscription_info, **kwargs):
+            status = statuses.get(subscription_info["endpoint"], 201)
+            if status > 202:
+                raise WebPushException("failed", response=FakeResponse(status))
+            return FakeResponse(status)
+
+        monkeypatch.setattr(push_dispatcher, "webpush", fake_webpush)
+        return client.post("/push/send-test", json={"title": "t", "body": "b"}).json()
+
+    def test_gone_subscriptions_are_deleted(self, client, db, monkeypatch):
+        gone, missing, alive = add_subscriptions(db, 3)
+        data = self._send(client, monkeypatch, {gone.endpoint: 410, missing.endpoint: 404})
+        assert data["pruned"] == 2
+        db.expire_all()
+        assert [s.id for s in db.query(PushSubscription)] == [alive.id]
+
+    def test_transient_failure_backs_off(self, client, db, monkeypatch):
+        flaky, alive = add_subscriptions(db, 2)
+        data = self._send(client, monkeypatch, {flaky.endpoint: 503})
+        assert data["pruned"] == 0
+        db.refresh(flaky)
+        assert flaky.failure_count == 1
+        assert flaky.retry_after > datetime.utcnow()
+
+        # バックオフ中は送信対象から外れる
+        data = self._send(client, monkeypatch, {})
+        assert data["total"] == 1
+        assert data["skipped_backoff"] == 1
+
+    def test_success_after_backoff_resets_counter(self, client, db, monkeypatch):
+        (flaky,) = add_subscriptions(db, 1)
+        flaky.failure_count = 3
+        flaky.retry_after = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+
+        data = self._send(client, monkeypatch, {})
+        assert data["sent"] == 1
+        db.refresh(flaky)
+        assert flaky.failure_count == 0
+        assert flaky.retry_after is None
+
+    def test_backoff_grows_and_is_capped(self):
+        from app.services.push_service import _backoff
+
+        assert _backoff(2) == 2 * _backoff(1)
+        assert _backoff(50) == timedelta(seconds=push_dispatcher.settings.push_backoff_max_seconds)
@@ -0,0 +1,47 @@
+import pytest
+
+from app.models.task import Task
+from app.services import capture_service, carryover_service, push_service, sync_service, task_service
+from tests.conftest import capture_selects
+
+
+def full_scans(db, statements) -> list[str]:
+    """実行計画でテーブル全走査になっている行を返す（SQLite: SCAN / PostgreSQL: Seq Scan）。"""
+    scans = []
+    conn = db.connection()
+    if conn.dialect.name == "postgresql":
+        # 行数が少ないと Seq Scan が選ばれるため、インデックスが使えるかだけを確認する
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).scalars().all()
+            scans += [f"{line.strip()}  <-  {statement}" for line in plan if "Seq Scan" in line]
+        return scans
+
+    for statement, parameters in statements:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        scans += [f"{row[3]}  <-  {statement}" for row in plan if row[3].startswith("SCAN")]
+    return scans
+
+
+HOT_QUERIES = {
+    "carryover_candidates": lambda db, task_id: carryover_service.get_carryover_candidates(db),
+    "today_due_tasks": lambda db, task_id: push_service.get_today_due_tasks(db),
+    "stale_tasks": lambda db, task_id: task_service.get_stale_tasks(db),
+    "stale_tasks_by_priority": lambda db, task_id: task_service.get_stale_tasks(db, priority="must"),
+    "checklist": lambda db, task_id: task_service.get_checklist(db, task_id),
+    "sync_delta": lambda db, task_id: sync_service.get_changes(db, since=0),
+    "capture_inbox": lambda db, task_id: capture_service.get_captures(db, is_resolved=False, limit=50),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(db, name):
+    task = Task(title="計画確認", task_type="execution", priority="must", done_criteria="基準")
+    db.add(task)
+    db.commit()
+
+    with capture_selects(db) as statements:
+        HOT_QUERIES[name](db, task.id)
+
+    assert statements
+    assert full_scans(db, statements) == []
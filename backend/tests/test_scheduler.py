@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.models.notification_setting import NotificationSetting
+from app.models.scheduled_run import ScheduledRun
+from app.models.scheduler_lease import SchedulerLease
+from app.services import scheduler
+from app.services.scheduler_lease import claim_run, try_acquire_lease
+from tests.conftest import TestingSessionLocal
+
+
+class TestLease:
+    def test_only_one_holder(self, db):
+        assert try_acquire_lease(db, "scheduler", "worker-a", 60) is True
+        assert try_acquire_lease(db, "scheduler", "worker-b", 60) is False
+        # 保持者は更新できる
+        assert try_acquire_lease(db, "scheduler", "worker-a", 60) is True
+
+    def test_expired_lease_can_be_taken_over(self, db):
+        assert try_acquire_lease(db, "scheduler", "worker-a", 60)
+        lease = db.get(SchedulerLease, "scheduler")
+        lease.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+
+        assert try_acquire_lease(db, "scheduler", "worker-b", 60) is True
+        assert try_acquire_lease(db, "scheduler", "worker-a", 60) is False
+
+    def test_claim_run_is_idempotent(self, db):
+        assert claim_run(db, "daily_push_1:2026-10-18", "daily_push_1", "worker-a", 60, 1800, 3) is True
+        assert claim_run(db, "daily_push_1:2026-10-18", "daily_push_1", "worker-b", 60, 1800, 3) is False
+
+
+class TestDailyPush:
+    @pytest.fixture
+    def sent(self, db, monkeypatch):
+        calls = []
+        monkeypatch.setattr(scheduler, "SessionLocal", TestingSessionLocal)
+        monkeypatch.setattr(
+            scheduler, "send_today_due_notification", lambda db: calls.append(1) or {"sent": 1}
+        )
+        return calls
+
+    def test_non_leader_does_not_send(self, db, sent, monkeypatch):
+        try_acquire_lease(db, scheduler.LEASE_NAME, "other-worker", 60)
+        scheduler._run_daily_push(scheduler.JOB_ID_1)
+        assert sent == []
+
+    def test_daily_run_sent_once_across_failover(self, db, sent, monkeypatch):
+        monkeypatch.setattr(scheduler, "HOLDER_ID", "worker-a")
+        scheduler._run_daily_push(scheduler.JOB_ID_1)
+        assert len(sent) == 1
+        run = db.query(ScheduledRun).one()
+        assert run.finished_at is not None
+
+        # リーダーが落ちて別ワーカーが引き継いでも同じ回は送らない
+        lease = db.get(SchedulerLease, scheduler.LEASE_NAME)
+        lease.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+        monkeypatch.setattr(scheduler, "HOLDER_ID", "worker-b")
+        scheduler._run_daily_push(scheduler.JOB_ID_1)
+        assert len(sent) == 1
+
+        # 別ジョブ（第2通知）は送る
+        scheduler._run_daily_push(scheduler.JOB_ID_2)
+        assert len(sent) == 2
+
+    @pytest.fixture
+    def registered(self, monkeypatch):
+        # 再実行は登録中のジョブだけが対象
+        monkeypatch.setattr(scheduler.scheduler, "get_job", lambda job_id: True)
+
+    def test_failed_run_is_retried_up_to_max_attempts(self, db, registered, monkeypatch):
+        monkeypatch.setattr(scheduler, "SessionLocal", TestingSessionLocal)
+        monkeypatch.setattr(scheduler, "HOLDER_ID", "worker-a")
+        outcomes = [RuntimeError("push service down"), {"sent": 1}]
+
+        def send(db):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(scheduler, "send_today_due_notification", send)
+        scheduler._run_daily_push(scheduler.JOB_ID_1)
+        run = db.query(ScheduledRun).one()
+        assert run.result.startswith("error:")
+
+        scheduler._retry_runs(db)
+        db.expire_all()
+        run = db.query(ScheduledRun).one()
+        assert (run.result, run.attempts) == ('{"sent": 1}', 2)
+        # 成功した回は再実行しない
+        scheduler._retry_runs(db)
+        assert outcomes == []
+
+        # 最大試行回数に達した回は失敗のまま残す
+        monkeypatch.setattr(scheduler, "send_today_due_notification", lambda db: 1 / 0)
+        scheduler._run_daily_push(scheduler.JOB_ID_2)
+        for _ in range(5):
+            scheduler._retry_runs(db)
+        db.expire_all()
+        run = db.query(ScheduledRun).filter(ScheduledRun.job_id == scheduler.JOB_ID_2).one()
+        assert run.attempts == 3
+        assert run.result.startswith("error:")
+
+    def test_abandoned_claim_is_retaken_within_window(self, db, sent, registered, monkeypatch):
+        now = datetime.utcnow()
+        # worker-a が取得したまま（送信前に停止）
+        db.add_all(
+            [
+                ScheduledRun(
+                    run_key="daily_push_1:2026-10-18", job_id=scheduler.JOB_ID_1, holder="worker-a",
+                    started_at=now - timedelta(seconds=120), claimed_at=now - timedelta(seconds=120),
+                ),
+                # 取得したばかり（実行中の可能性がある）
+                ScheduledRun(
+                    run_key="daily_push_2:2026-10-18", job_id=scheduler.JOB_ID_2, holder="worker-a",
+                    started_at=now, claimed_at=now,
+                ),
+                # 再実行期間を過ぎた回は送らない
+                ScheduledRun(
+                    run_key="daily_push_1:2026-10-17", job_id=scheduler.JOB_ID_1, holder="worker-a",
+                    started_at=now - timedelta(days=1), claimed_at=now - timedelta(days=1),
+                ),
+            ]
+        )
+        db.commit()
+        monkeypatch.setattr(scheduler, "HOLDER_ID", "worker-b")
+
+        scheduler._retry_runs(db)
+        assert len(sent) == 1
+        db.expire_all()
+        run = db.get(ScheduledRun, "daily_push_1:2026-10-18")
+        assert (run.holder, run.attempts, run.finished_at is not None) == ("worker-b", 2, True)
+        assert db.get(ScheduledRun, "daily_push_2:2026-10-18").holder == "worker-a"
+        assert db.get(ScheduledRun, "daily_push_1:2026-10-17").finished_at is None
+
+    def test_new_leader_runs_slot_missed_during_failover(self, db, sent, registered, monkeypatch):
+        # worker-a が発火の直前に停止し、リースが切れる前に発火したため誰も実行していない
+        now = datetime.now(ZoneInfo(scheduler.TIMEZONE))
+        missed = (now - timedelta(minutes=5)).strftime("%H:%M")
+        future = (now + timedelta(hours=2)).strftime("%H:%M")
+        db.add(NotificationSetting(id=1, notify_time_1=missed, notify_time_2=future, enabled=True))
+        db.commit()
+        schedule = (missed, future, True)
+        monkeypatch.setattr(scheduler, "_current_schedule", schedule)
+        monkeypatch.setattr(scheduler, "_is_leader", False)
+        try_acquire_lease(db, scheduler.LEASE_NAME, "worker-a", 60)
+        lease = db.get(SchedulerLease, scheduler.LEASE_NAME)
+        lease.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+
+        monkeypatch.setattr(scheduler, "HOLDER_ID", "worker-b")
+        scheduler._heartbeat()
+        assert len(sent) == 1
+        [run] = db.query(ScheduledRun).all()
+        assert run.job_id == scheduler.JOB_ID_1 and run.holder == "worker-b"
+
+        # 引き継ぎ後のハートビートでは繰り返さない。まだ来ていない枠も実行しない
+        scheduler._heartbeat()
+        assert len(sent) == 1
@@ -0,0 +1,94 @@
+"""GET /search（全文検索）のテスト。"""
+from sqlalchemy import text
+
+from app.services import search_service
+from tests.conftest import create_task
+
+
+def _search(client, q, **params) -> dict:
+    res = client.get("/search", params={"q": q, **params})
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def _hits(body) -> list[tuple[str, int]]:
+    return [(h["type"], h["id"]) for h in body["items"]]
+
+
+def test_search_covers_tasks_checklist_items_and_captures(client):
+    task = create_task(client, title="見積書を作成する", done_criteria="見積書を送付済み", decision_criteria="金額の確定")
+    item = client.post(f"/tasks/{task['id']}/checklist", json={"text": "見積書のテンプレート確認"}).json()
+    capture = client.post("/captures", json={"text": "見積書の宛名を確認"}).json()
+    create_task(client, title="関係ないタスク")
+
+    body = _search(client, "見積書")
+    assert set(_hits(body)) == {("task", task["id"]), ("checklist_item", item["id"]), ("capture", capture["id"])}
+    hits = {h["type"]: h for h in body["items"]}
+    assert hits["checklist_item"]["task_id"] == task["id"]
+    assert all(h["score"] is not None for h in body["items"])
+
+    # decision_criteria も対象
+    assert _hits(_search(client, "金額の確定")) == [("task", task["id"])]
+
+
+def test_title_match_ranks_above_body_match(client):
+    body_only = create_task(client, title="別件", done_criteria="請求書の発行を確認")
+    in_title = create_task(client, title="請求書の発行")
+    body = _search(client, "請求書")
+    assert [h["id"] for h in body["items"]] == [in_title["id"], body_only["id"]]
+
+
+def test_all_terms_must_match(client):
+    both = create_task(client, title="議事録を共有する", done_criteria="チーム全員に共有")
+    create_task(client, title="議事録を書く")
+    assert _hits(_search(client, "議事録 チーム全員")) == [("task", both["id"])]
+
+
+def test_index_follows_updates_and_deletes(client):
+    task = create_task(client, title="旧タイトルです")
+    client.patch(f"/tasks/{task['id']}", json={"title": "新タイトルです"})
+    assert _search(client, "旧タイトル")["items"] == []
+    assert _hits(_search(client, "新タイトル")) == [("task", task["id"])]
+
+    client.delete(f"/tasks/{task['id']}")
+    assert _search(client, "新タイトル")["items"] == []
+
+
+def test_short_terms_fall_back_to_like(client):
+    task = create_task(client, title="A案の検討")
+    create_task(client, title="B案の検討")
+    body = _search(client, "A案")
+    assert _hits(body) == [("task", task["id"])]
+    assert body["items"][0]["score"] is None
+
+
+def test_query_operators_are_treated_as_text(client):
+    task = create_task(client, title='"OR" AND NOT の扱い')
+    assert _hits(_search(client, '"OR"')) == [("task", task["id"])]
+    assert _search(client, "NOT*")["items"] == []
+
+
+def test_pagination_and_type_filter(client):
+    ids = [create_task(client, title=f"週次レポート {i}")["id"] for i in range(5)]
+    client.post("/captures", json={"text": "週次レポートの書式"})
+
+    first = _search(client, "週次レポート", type="task", limit=3)
+    assert len(first["items"]) == 3 and first["next_offset"] == 3
+    second = _search(client, "週次レポート", type="task", limit=3, offset=first["next_offset"])
+    assert second["next_offset"] is None
+    assert sorted(h["id"] for h in first["items"] + second["items"]) == ids
+
+
+def test_blank_query_and_unknown_type_are_rejected(client):
+    assert client.get("/search", params={"q": "   "}).status_code == 400
+    assert client.get("/search", params={"q": "abc", "type": "unknown"}).status_code == 422
+
+
+def test_rebuild_index_restores_missing_rows(client, db):
+    task = create_task(client, title="再構築のテスト")
+    db.execute(text("DELETE FROM search_index"))
+    db.commit()
+    assert _search(client, "再構築")["items"] == []
+
+    assert search_service.rebuild_index(db) == 1
+    assert _hits(_search(client, "再構築")) == [("task", task["id"])]
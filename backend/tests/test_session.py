@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.session import _read_only_url, apply_sqlite_profile, engine_options
+
+
+class TestSqliteProfile:
+    def test_pragmas_applied_on_connect(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+        apply_sqlite_profile(engine)
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == settings.sqlite_journal_mode
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.sqlite_busy_timeout_ms
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == settings.sqlite_cache_size
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+
+    def test_read_only_engine_rejects_writes(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'ro.db'}"
+        writer = create_engine(url)
+        apply_sqlite_profile(writer)
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER)"))
+
+        reader = create_engine(_read_only_url(url))
+        apply_sqlite_profile(reader, read_only=True)
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
+            with pytest.raises(OperationalError, match="readonly"):
+                conn.execute(text("INSERT INTO t VALUES (1)"))
+
+    def test_memory_database_has_no_read_only_url(self):
+        assert _read_only_url("sqlite://") is None
+        assert _read_only_url("sqlite:///:memory:") is None
+
+
+class TestEngineOptions:
+    def test_sqlite_has_no_pool_settings(self):
+        assert engine_options("sqlite:///./tasks.db") == {"connect_args": {"check_same_thread": False}}
+
+    def test_postgresql_pool_and_statement_timeout(self):
+        options = engine_options("postgresql://user:pass@db:5432/taskdb")
+        assert options["pool_size"] == settings.db_pool_size
+        assert options["max_overflow"] == settings.db_max_overflow
+        assert options["pool_recycle"] == settings.db_pool_recycle
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"] == {
+            "options": f"-c statement_timeout={settings.db_statement_timeout_ms}"
+        }
@@ -0,0 +1,98 @@
+"""スロークエリログと SQL プロファイル（X-SQL-Profile）のテスト。"""
+import json
+import logging
+
+import pytest
+
+from app.core.config import settings
+from app.models.task import Task
+from app.services import sql_profiler
+from tests.conftest import create_task, engine
+
+sql_profiler.instrument_engine(engine)
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.payloads: list[dict] = []
+
+    def emit(self, record):
+        self.payloads.append(json.loads(record.getMessage()))
+
+    def events(self, name: str) -> list[dict]:
+        return [p for p in self.payloads if p["event"] == name]
+
+
+@pytest.fixture
+def sql_log(monkeypatch):
+    handler = _Records()
+    sql_profiler.logger.addHandler(handler)
+    monkeypatch.setattr(sql_profiler.logger, "level", logging.DEBUG)
+    yield handler
+    sql_profiler.logger.removeHandler(handler)
+
+
+def test_profile_only_with_header(client, sql_log, monkeypatch):
+    monkeypatch.setattr(settings, "sql_profile", "header")
+    task = create_task(client)
+
+    res = client.get(f"/tasks/{task['id']}")
+    assert "server-timing" not in res.headers
+    assert sql_log.events("sql_profile") == []
+
+    res = client.get(f"/tasks/{task['id']}", headers={sql_profiler.PROFILE_HEADER: "1"})
+    assert res.status_code == 200
+    assert res.headers["server-timing"].startswith("db;dur=")
+    [report] = sql_log.events("sql_profile")
+    assert report["path"] == f"/tasks/{task['id']}"
+    # 本体 + 子タスク + チェックリスト（selectinload）
+    assert report["queries"] >= 3
+    assert report["n_plus_one"] == []
+    # パラメータは型だけを残し、値は出さない
+    assert all(str(task["id"]) not in json.dumps(s["params"]) for s in report["statements"])
+
+
+def test_profile_off_ignores_header(client, sql_log, monkeypatch):
+    monkeypatch.setattr(settings, "sql_profile", "off")
+    res = client.get("/tasks", headers={sql_profiler.PROFILE_HEADER: "1"})
+    assert "server-timing" not in res.headers
+    assert sql_log.events("sql_profile") == []
+
+
+def test_lazy_loads_are_flagged_as_n_plus_one(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "sql_profile_n_plus_one", 3)
+    for i in range(4):
+        create_task(client, title=f"親{i}")
+
+    with sql_profiler.profile_sql() as profile:
+        for task in db.query(Task).all():
+            task.children  # 遅延ロードで 1 件ずつ SELECT する
+    [suspect] = profile.n_plus_one()
+    assert suspect["count"] >= 4
+    assert "parent_id" in suspect["sql"]
+
+
+def test_slow_query_is_logged_with_plan(client, db, sql_log, monkeypatch):
+    task = create_task(client)
+    monkeypatch.setattr(settings, "slow_query_ms", 1e-9)
+    db.get(Task, task["id"])
+
+    entry = sql_log.events("slow_query")[-1]
+    assert entry["sql"].startswith("SELECT")
+    assert entry["params"] == ["int"]
+    assert entry["plan"] and "EXPLAIN に失敗" not in entry["plan"][0]
+
+
+def test_slow_query_log_disabled(db, sql_log, monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    db.query(Task).count()
+    assert sql_log.events("slow_query") == []
+
+
+def test_parameter_shape():
+    assert sql_profiler.parameter_shape({"a": 1, "b": "x"}) == {"a": "int", "b": "str"}
+    assert sql_profiler.parameter_shape([(1, None), (2, None)], executemany=True) == {
+        "rows": 2,
+        "row": ["int", "NoneType"],
+    }
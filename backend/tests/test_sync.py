@@ -0,0 +1,86 @@
+"""GET /sync（差分同期）のテスト。"""
+from tests.conftest import TASK_PAYLOAD, create_task
+
+
+def _sync(client, since=None) -> dict:
+    res = client.get("/sync", params={} if since is None else {"since": since})
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def _ids(rows) -> list[int]:
+    return [r["id"] for r in rows]
+
+
+def test_initial_sync_returns_everything(client):
+    task = create_task(client)
+    client.post(f"/tasks/{task['id']}/checklist", json={"text": "項目"})
+    client.post("/captures", json={"text": "メモ"})
+    body = _sync(client)
+    assert _ids(body["tasks"]) == [task["id"]]
+    assert len(body["checklist_items"]) == 1
+    assert len(body["captures"]) == 1
+    assert body["cursor"] > 0
+
+
+def test_no_changes_returns_empty_delta(client):
+    create_task(client)
+    cursor = _sync(client)["cursor"]
+    body = _sync(client, cursor)
+    assert body["cursor"] == cursor
+    assert body["tasks"] == [] and body["captures"] == []
+    assert body["deleted"] == {"tasks": [], "checklist_items": [], "completion_logs": [], "captures": []}
+
+
+def test_only_changed_rows_are_returned(client):
+    a = create_task(client, title="A")
+    create_task(client, title="B")
+    cursor = _sync(client)["cursor"]
+
+    client.patch(f"/tasks/{a['id']}", json={"title": "A2"})
+    body = _sync(client, cursor)
+    assert [t["title"] for t in body["tasks"]] == ["A2"]
+    assert body["cursor"] > cursor
+
+
+def test_completion_and_bulk_changes(client):
+    a = create_task(client)
+    b = create_task(client)
+    cursor = _sync(client)["cursor"]
+
+    client.post(f"/tasks/{a['id']}/complete", json={"note": "done"})
+    client.post("/tasks/bulk", json={"operations": [{"op": "update", "id": b["id"], "data": {"title": "一括"}}]})
+    body = _sync(client, cursor)
+    assert sorted(_ids(body["tasks"])) == sorted([a["id"], b["id"]])
+    assert [log["task_id"] for log in body["completion_logs"]] == [a["id"]]
+
+
+def test_delete_task_tombstones_and_cascade(client):
+    parent = create_task(client)
+    child = client.post(f"/tasks/{parent['id']}/children", json=TASK_PAYLOAD).json()
+    item = client.post(f"/tasks/{parent['id']}/checklist", json={"text": "項目"}).json()
+    capture = client.post("/captures", json={"text": "メモ", "related_task_id": parent["id"]}).json()
+    cursor = _sync(client)["cursor"]
+
+    client.delete(f"/tasks/{parent['id']}")
+    body = _sync(client, cursor)
+    assert body["deleted"]["tasks"] == [parent["id"]]
+    assert body["deleted"]["checklist_items"] == [item["id"]]
+    # 参照を外された子タスク・キャプチャは更新として返る
+    assert _ids(body["tasks"]) == [child["id"]]
+    assert body["tasks"][0]["parent_id"] is None
+    assert _ids(body["captures"]) == [capture["id"]]
+    assert body["captures"][0]["related_task_id"] is None
+
+
+def test_delete_capture_tombstone(client):
+    capture = client.post("/captures", json={"text": "メモ"}).json()
+    cursor = _sync(client)["cursor"]
+    client.delete(f"/captures/{capture['id']}")
+    body = _sync(client, cursor)
+    assert body["deleted"]["captures"] == [capture["id"]]
+    assert body["captures"] == []
+
+
+def test_invalid_since(client):
+    assert client.get("/sync", params={"since": -1}).status_code == 422
@@ -1,8 +1,10 @@
+import json
 from datetime import datetime, timedelta
 
 import pytest
+from sqlalchemy import event
 
-from tests.conftest import create_task
+from tests.conftest import TASK_PAYLOAD, capture_selects, create_task
 
 
 class TestTaskCRUD:
@@ -55,6 +57,29 @@ class TestTaskCRUD:
         assert "children" in data
         assert "checklist" in data
 
+    def test_get_task_detail_query_count(self, client, db):
+        parent = create_task(client, title="親")
+        item = client.post(f"/tasks/{parent['id']}/checklist", json={"text": "切り出し元"}).json()
+        extracted = client.post(
+            f"/tasks/{parent['id']}/checklist/{item['id']}/extract", json={}
+        ).json()["extracted_task"]
+        for i in range(3):
+            client.post(f"/tasks/{extracted['id']}/checklist", json={"text": f"項目{i}"})
+            client.post(
+                f"/tasks/{extracted['id']}/children",
+                json={"title": f"子{i}", "task_type": "execution", "priority": "must", "done_criteria": "基準"},
+            )
+        db.expire_all()
+
+        with capture_selects(db) as statements:
+            res = client.get(f"/tasks/{extracted['id']}")
+        data = res.json()
+        assert len(data["children"]) == 3
+        assert len(data["checklist"]) == 3
+        assert data["origin"]["parent_task_id"] == parent["id"]
+        # 本体+origin / 子タスク / チェックリスト
+        assert len(statements) <= 3
+
     def test_get_task_not_found(self, client):
         res = client.get("/tasks/9999")
         assert res.status_code == 404
@@ -82,6 +107,134 @@ class TestTaskCRUD:
         assert res.status_code == 404
 
 
+class TestBulk:
+    def test_bulk_create_and_update(self, client):
+        t = create_task(client, title="既存")
+        res = client.post(
+            "/tasks/bulk",
+            json={
+                "operations": [
+                    {"op": "create", "data": {**TASK_PAYLOAD, "title": "新規1"}},
+                    {"op": "update", "id": t["id"], "data": {"status": "doing"}},
+                    {"op": "create", "data": {**TASK_PAYLOAD, "title": "子", "parent_id": t["id"]}},
+                ]
+            },
+        )
+        assert res.status_code == 200
+        results = res.json()["results"]
+        assert [r["ok"] for r in results] == [True, True, True]
+        assert client.get(f"/tasks/{results[0]['id']}").json()["title"] == "新規1"
+        assert client.get(f"/tasks/{t['id']}").json()["status"] == "doing"
+        assert client.get(f"/tasks/{results[2]['id']}").json()["parent_id"] == t["id"]
+
+    def test_bulk_reports_per_item_errors(self, client):
+        t = create_task(client)
+        res = client.post(
+            "/tasks/bulk",
+            json={
+                "operations": [
+                    {"op": "update", "id": 9999, "data": {"title": "x"}},
+                    {"op": "update", "id": t["id"], "data": {"status": "done"}},
+                    {"op": "create", "data": {**TASK_PAYLOAD, "parent_id": 9999}},
+                    {"op": "update", "id": t["id"], "data": {"title": "更新"}},
+                ]
+            },
+        )
+        results = res.json()["results"]
+        assert [r["ok"] for r in results] == [False, False, False, True]
+        assert all(r["error"] for r in results[:3])
+        assert client.get(f"/tasks/{t['id']}").json()["title"] == "更新"
+        assert len(client.get("/tasks").json()) == 1
+
+    def test_bulk_null_on_required_column_fails_only_that_item(self, client):
+        t = create_task(client, title="元")
+        other = create_task(client)
+        res = client.post(
+            "/tasks/bulk",
+            json={
+                "operations": [
+                    {"op": "update", "id": t["id"], "data": {"title": None, "category": "仕事"}},
+                    {"op": "update", "id": other["id"], "data": {"category": None, "priority": "should"}},
+                    {"op": "create", "data": {**TASK_PAYLOAD, "title": "新規"}},
+                ]
+            },
+        )
+        assert res.status_code == 200
+        results = res.json()["results"]
+        assert [r["ok"] for r in results] == [False, True, True]
+        assert "title" in results[0]["error"]
+        assert client.get(f"/tasks/{t['id']}").json()["title"] == "元"
+        assert client.get(f"/tasks/{other['id']}").json()["priority"] == "should"
+
+    def test_bulk_invalid_payload(self, client):
+        res = client.post("/tasks/bulk", json={"operations": [{"op": "create", "data": {"title": "x"}}]})
+        assert res.status_code == 422
+        assert client.post("/tasks/bulk", json={"operations": []}).status_code == 422
+
+
+class TestTaskPagination:
+    def test_limit_returns_next_cursor(self, client):
+        for i in range(3):
+            create_task(client, title=f"T{i}", due_date=f"2026-01-0{i + 1}")
+        res = client.get("/tasks?limit=2")
+        assert res.status_code == 200
+        assert [t["title"] for t in res.json()] == ["T0", "T1"]
+        cursor = res.headers["X-Next-Cursor"]
+
+        res = client.get(f"/tasks?limit=2&cursor={cursor}")
+        assert [t["title"] for t in res.json()] == ["T2"]
+        assert "X-Next-Cursor" not in res.headers
+
+    def test_cursor_walks_into_null_due_dates(self, client):
+        create_task(client, title="期限なし1")
+        create_task(client, title="期限あり", due_date="2026-01-01")
+        create_task(client, title="期限なし2")
+
+        titles, cursor = [], None
+        while True:
+            url = "/tasks?limit=1" + (f"&cursor={cursor}" if cursor else "")
+            res = client.get(url)
+            titles += [t["title"] for t in res.json()]
+            cursor = res.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert titles == ["期限あり", "期限なし1", "期限なし2"]
+
+    def test_cursor_desc_order(self, client):
+        for i in range(3):
+            create_task(client, title=f"T{i}", due_date=f"2026-01-0{i + 1}")
+        create_task(client, title="期限なし")
+        first = client.get("/tasks?order=desc&limit=2")
+        assert [t["title"] for t in first.json()] == ["T2", "T1"]
+        cursor = first.headers["X-Next-Cursor"]
+        rest = client.get(f"/tasks?order=desc&limit=2&cursor={cursor}")
+        assert [t["title"] for t in rest.json()] == ["T0", "期限なし"]
+
+    def test_cursor_on_created_at(self, client):
+        # 同一秒に作成された行でも id のタイブレークで次ページへ進める
+        for i in range(3):
+            create_task(client, title=f"T{i}")
+        first = client.get("/tasks?sort_by=created_at&limit=2")
+        assert [t["title"] for t in first.json()] == ["T0", "T1"]
+        cursor = first.headers["X-Next-Cursor"]
+        rest = client.get(f"/tasks?sort_by=created_at&limit=2&cursor={cursor}")
+        assert [t["title"] for t in rest.json()] == ["T2"]
+
+    def test_invalid_cursor(self, client):
+        res = client.get("/tasks?limit=1&cursor=not-a-cursor")
+        assert res.status_code == 400
+
+    def test_fields_projection(self, client):
+        create_task(client, title="射影", due_date="2026-01-01")
+        res = client.get("/tasks?fields=title,status")
+        assert res.status_code == 200
+        assert res.json() == [{"id": res.json()[0]["id"], "title": "射影", "status": "todo"}]
+
+    def test_fields_unknown(self, client):
+        res = client.get("/tasks?fields=title,secret")
+        assert res.status_code == 400
+
+
 class TestChildren:
     def test_get_children_empty(self, client):
         t = create_task(client)
@@ -114,6 +267,122 @@ class TestChildren:
         assert len(res.json()["children"]) == 1
 
 
+class TestTaskTree:
+    def _child(self, client, parent_id, title):
+        res = client.post(
+            f"/tasks/{parent_id}/children",
+            json={"title": title, "task_type": "research", "priority": "must", "done_criteria": "基準"},
+        )
+        return res.json()
+
+    def test_tree_returns_subtree_with_depth(self, client):
+        root = create_task(client, title="根")
+        a = self._child(client, root["id"], "A")
+        self._child(client, root["id"], "B")
+        a1 = self._child(client, a["id"], "A-1")
+        self._child(client, a1["id"], "A-1-a")
+        create_task(client, title="無関係")
+
+        res = client.get(f"/tasks/{root['id']}/tree")
+        assert res.status_code == 200
+        nodes = {n["title"]: n for n in res.json()}
+        assert set(nodes) == {"根", "A", "B", "A-1", "A-1-a"}
+        assert nodes["根"]["depth"] == 0
+        assert nodes["A-1-a"]["depth"] == 3
+        assert nodes["A-1"]["parent_id"] == a["id"]
+
+    def test_tree_depth_limit(self, client):
+        root = create_task(client, title="根")
+        a = self._child(client, root["id"], "A")
+        self._child(client, a["id"], "A-1")
+        res = client.get(f"/tasks/{root['id']}/tree?depth=1")
+        assert [n["title"] for n in res.json()] == ["根", "A"]
+
+    def test_tree_checklist_progress(self, client):
+        root = create_task(client)
+        item = client.post(f"/tasks/{root['id']}/checklist", json={"text": "1"}).json()
+        client.post(f"/tasks/{root['id']}/checklist", json={"text": "2"})
+        client.patch(f"/tasks/{root['id']}/checklist/{item['id']}", json={"is_done": True})
+        self._child(client, root["id"], "子")
+
+        nodes = client.get(f"/tasks/{root['id']}/tree").json()
+        assert (nodes[0]["checklist_total"], nodes[0]["checklist_done"]) == (2, 1)
+        assert (nodes[1]["checklist_total"], nodes[1]["checklist_done"]) == (0, 0)
+
+    def test_tree_not_found(self, client):
+        assert client.get("/tasks/9999/tree").status_code == 404
+
+
+class TestRecursiveDelete:
+    def _child(self, client, parent_id, title="子"):
+        return client.post(f"/tasks/{parent_id}/children", json={**TASK_PAYLOAD, "title": title}).json()
+
+    def _chain(self, client, length):
+        root = create_task(client)
+        parent = root
+        for i in range(length - 1):
+            parent = self._child(client, parent["id"], f"子{i}")
+            client.post(f"/tasks/{parent['id']}/checklist", json={"text": "項目"})
+        return root
+
+    def test_deletes_subtree_and_detaches_references(self, client, db):
+        from app.models.capture_item import CaptureItem
+        from app.models.change_event import ChangeEvent
+        from app.models.completion_log import CompletionLog
+        from app.models.task import Task
+
+        root = create_task(client, title="根")
+        a = self._child(client, root["id"], "A")
+        a1 = self._child(client, a["id"], "A-1")
+        b = self._child(client, root["id"], "B")
+        outside = create_task(client, title="無関係")
+        item = client.post(f"/tasks/{a['id']}/checklist", json={"text": "項目"}).json()
+        client.post(f"/tasks/{a1['id']}/complete", json={})
+        capture = client.post("/captures", json={"text": "メモ", "related_task_id": a["id"]}).json()
+        db.get(Task, outside["id"]).origin_checklist_item_id = item["id"]
+        db.commit()
+
+        res = client.delete(f"/tasks/{root['id']}?recursive=true")
+        assert res.status_code == 204
+        db.expire_all()
+        subtree = [root["id"], a["id"], a1["id"], b["id"]]
+        assert db.query(Task).filter(Task.id.in_(subtree)).count() == 0
+        assert db.query(CompletionLog).filter(CompletionLog.task_id == a1["id"]).count() == 0
+        assert client.get(f"/tasks/{a['id']}/checklist").status_code == 404
+        assert db.get(Task, outside["id"]).origin_checklist_item_id is None
+        assert db.get(CaptureItem, capture["id"]).related_task_id is None
+        deleted = db.query(ChangeEvent).filter(ChangeEvent.event_type == "task.deleted").all()
+        assert sorted(json.loads(e.payload)["id"] for e in deleted) == sorted(subtree)
+
+    def test_statement_count_does_not_depend_on_subtree_size(self, client, db):
+        def statements_for(root_id):
+            statements = []
+
+            def listener(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            bind = db.get_bind()
+            event.listen(bind, "before_cursor_execute", listener)
+            try:
+                assert client.delete(f"/tasks/{root_id}?recursive=true").status_code == 204
+            finally:
+                event.remove(bind, "before_cursor_execute", listener)
+            return len(statements)
+
+        small = self._chain(client, 2)
+        large = self._chain(client, 12)
+        assert statements_for(small["id"]) == statements_for(large["id"])
+
+    def test_without_recursive_children_are_kept(self, client):
+        root = create_task(client)
+        child = self._child(client, root["id"])
+        assert client.delete(f"/tasks/{root['id']}").status_code == 204
+        assert client.get(f"/tasks/{child['id']}").json()["parent_id"] is None
+
+    def test_recursive_not_found(self, client):
+        assert client.delete("/tasks/9999?recursive=true").status_code == 404
+
+
 class TestComplete:
     def test_complete_task(self, client):
         t = create_task(client)
@@ -184,6 +453,42 @@ class TestConvergence:
         assert data["convergence_checklist"]["options_within_limit"] is False
         assert data["is_convergeable"] is False
 
+    def test_convergence_single_query(self, client, db):
+        t = create_task(client, task_type="decision", exploration_limit=5)
+        for i in range(4):
+            client.post(
+                f"/tasks/{t['id']}/children",
+                json={"title": f"案{i}", "task_type": "research", "priority": "must", "done_criteria": "基準"},
+            )
+        db.expire_all()
+        with capture_selects(db) as statements:
+            data = client.get(f"/tasks/{t['id']}/convergence").json()
+        assert data["exploration_used"] == 4
+        assert data["convergence_checklist"]["structure_simplified"] is False
+        assert len(statements) == 1
+
+    def test_convergence_not_found(self, client):
+        assert client.get("/tasks/9999/convergence").status_code == 404
+
+    def test_convergence_batch(self, client):
+        a = create_task(client, task_type="decision", exploration_limit=1, reversible=True)
+        b = create_task(client, task_type="decision", exploration_limit=1)
+        for _ in range(2):
+            client.post(
+                f"/tasks/{b['id']}/children",
+                json={"title": "案", "task_type": "research", "priority": "must", "done_criteria": "基準"},
+            )
+        res = client.get(f"/tasks/convergence?ids={b['id']}&ids={a['id']}&ids=9999")
+        assert res.status_code == 200
+        data = res.json()
+        assert [d["task_id"] for d in data] == [b["id"], a["id"]]
+        assert data[0]["exploration_used"] == 2
+        assert data[0]["convergence_checklist"]["options_within_limit"] is False
+        assert data[1]["is_convergeable"] is True
+
+    def test_convergence_batch_requires_ids(self, client):
+        assert client.get("/tasks/convergence").status_code == 422
+
 
 class TestStale:
     def test_stale_tasks(self, client, db):
@@ -221,6 +526,32 @@ class TestStale:
         res = client.get("/tasks/stale?priority=must")
         assert all(t["priority"] == "must" for t in res.json())
 
+    def test_stale_order_and_limit(self, client, db):
+        from app.models.task import Task
+
+        for days, title in [(10, "10日"), (40, "40日"), (25, "25日")]:
+            t = create_task(client, title=title, priority="should" if days > 21 else "must")
+            task = db.get(Task, t["id"])
+            task.last_updated_at = datetime.utcnow() - timedelta(days=days)
+            db.commit()
+
+        res = client.get("/tasks/stale")
+        assert [t["title"] for t in res.json()] == ["40日", "25日", "10日"]
+        assert [t["threshold_days"] for t in res.json()] == [21, 21, 7]
+
+        res = client.get("/tasks/stale?order=asc&limit=2")
+        assert [t["title"] for t in res.json()] == ["10日", "25日"]
+
+    def test_should_not_stale_before_threshold(self, client, db):
+        from app.models.task import Task
+
+        t = create_task(client, priority="should")
+        task = db.get(Task, t["id"])
+        task.last_updated_at = datetime.utcnow() - timedelta(days=20)
+        db.commit()
+
+        assert client.get("/tasks/stale").json() == []
+
 
 class TestCaptures:
     def test_create_capture(self, client):
@@ -257,3 +588,72 @@ class TestCaptures:
         t = create_task(client)
         res = client.post("/captures", json={"text": "関連メモ", "related_task_id": t["id"]})
         assert res.json()["related_task_id"] == t["id"]
+
+    def test_list_captures_keyset_pagination(self, client):
+        # 同一秒に作成された行も id のタイブレークで漏れなく辿れる
+        ids = [client.post("/captures", json={"text": f"メモ{i}"}).json()["id"] for i in range(5)]
+        seen, cursor = [], None
+        while True:
+            url = "/captures?is_resolved=false&limit=2" + (f"&cursor={cursor}" if cursor else "")
+            res = client.get(url)
+            seen += [c["id"] for c in res.json()]
+            cursor = res.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert seen == sorted(ids, reverse=True)
+
+    def test_list_captures_invalid_cursor(self, client):
+        assert client.get("/captures?limit=1&cursor=not-a-cursor").status_code == 400
+
+
+class TestCaptureTriage:
+    def test_triage_creates_tasks_and_resolves_captures(self, client):
+        parent = create_task(client, priority="must")
+        a = client.post("/captures", json={"text": "資料を集める"}).json()
+        b = client.post("/captures", json={"text": "日程を決める"}).json()
+        res = client.post(
+            "/captures/triage",
+            json={
+                "parent_id": parent["id"],
+                "items": [
+                    {"capture_id": a["id"]},
+                    {"capture_id": b["id"], "title": "日程調整", "task_type": "decision", "priority": "should"},
+                ],
+            },
+        )
+        assert res.status_code == 200, res.text
+        results = res.json()["results"]
+        assert [r["capture"]["id"] for r in results] == [a["id"], b["id"]]
+
+        first, second = results
+        assert first["task"]["title"] == "資料を集める"
+        assert first["task"]["done_criteria"] == "資料を集める"
+        assert first["task"]["priority"] == "must"
+        assert second["task"]["title"] == "日程調整"
+        assert second["task"]["task_type"] == "decision"
+        assert second["task"]["priority"] == "should"
+        for r in results:
+            assert r["task"]["parent_id"] == parent["id"]
+            assert r["capture"]["is_resolved"] is True
+            assert r["capture"]["related_task_id"] == r["task"]["id"]
+
+        children = client.get(f"/tasks/{parent['id']}/children").json()
+        assert {c["id"] for c in children} == {r["task"]["id"] for r in results}
+        assert client.get("/captures?is_resolved=false").json() == []
+
+    def test_triage_is_all_or_nothing(self, client):
+        a = client.post("/captures", json={"text": "未解決"}).json()
+        b = client.post("/captures", json={"text": "解決済み"}).json()
+        client.patch(f"/captures/{b['id']}", json={"is_resolved": True})
+
+        res = client.post("/captures/triage", json={"items": [{"capture_id": a["id"]}, {"capture_id": b["id"]}]})
+        assert res.status_code == 400
+        res = client.post("/captures/triage", json={"items": [{"capture_id": a["id"]}, {"capture_id": 9999}]})
+        assert res.status_code == 404
+        res = client.post("/captures/triage", json={"items": [{"capture_id": a["id"]}, {"capture_id": a["id"]}]})
+        assert res.status_code == 400
+        res = client.post("/captures/triage", json={"parent_id": 9999, "items": [{"capture_id": a["id"]}]})
+        assert res.status_code == 404
+
+        assert client.get("/tasks").json() == []
+        assert client.get("/captures?is_resolved=false").json()[0]["id"] == a["id"]
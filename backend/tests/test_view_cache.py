@@ -0,0 +1,133 @@
+"""派生ビューキャッシュ（app/services/view_cache.py）のテスト。"""
+import sys
+import types
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.task import Task
+from app.services import push_service, view_cache as view_cache_module
+from app.services.view_cache import (
+    DAY_BOUNDARY_TZ,
+    MemoryBackend,
+    RedisBackend,
+    seconds_until_day_boundary,
+    view_cache,
+)
+from tests.conftest import create_task
+
+
+@pytest.fixture(autouse=True)
+def _reset_counters():
+    view_cache._counters.clear()
+    yield
+
+
+def _stats(view: str) -> dict:
+    return view_cache.stats()["views"].get(view, {"hits": 0, "misses": 0})
+
+
+class TestMemoryBackend:
+    def test_lru_evicts_least_recently_used(self):
+        backend = MemoryBackend(max_entries=2)
+        backend.set("a", 1, ttl=60)
+        backend.set("b", 2, ttl=60)
+        backend.get("a")
+        backend.set("c", 3, ttl=60)
+        assert backend.get("a") == 1
+        assert backend.get("b") is view_cache_module._MISSING
+        assert backend.size() == 2
+
+    def test_expired_entry_is_missing(self, monkeypatch):
+        backend = MemoryBackend(max_entries=2)
+        backend.set("a", 1, ttl=10)
+        now = view_cache_module.time.monotonic()
+        monkeypatch.setattr(view_cache_module.time, "monotonic", lambda: now + 11)
+        assert backend.get("a") is view_cache_module._MISSING
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, px):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1).encode()
+
+
+def test_redis_backend_stores_json(monkeypatch):
+    client = _FakeRedis()
+    fake_redis = types.SimpleNamespace(Redis=types.SimpleNamespace(from_url=lambda url: client))
+    monkeypatch.setitem(sys.modules, "redis", fake_redis)
+    backend = RedisBackend("redis://localhost")
+
+    backend.set("stale_tasks:1", [{"id": 1, "due_date": date(2026, 1, 31), "title": "日本語"}], ttl=60)
+    [raw] = client.data.values()
+    assert raw.startswith(b"[")
+    assert backend.get("stale_tasks:1") == [{"id": 1, "due_date": "2026-01-31", "title": "日本語"}]
+    backend.clear()
+    assert backend.get("stale_tasks:1") is view_cache_module._MISSING
+
+
+def test_redis_backend_rejected_on_async_path():
+    # 同期の redis 呼び出しがイベントループを止めるため、起動時に拒否する
+    with pytest.raises(RuntimeError, match="ASYNC_DB"):
+        view_cache_module._make_backend("redis", async_db=True)
+    assert isinstance(view_cache_module._make_backend("memory", async_db=True), MemoryBackend)
+
+
+def test_seconds_until_day_boundary():
+    now = datetime(2026, 1, 1, 23, 59, 30, tzinfo=DAY_BOUNDARY_TZ)
+    assert seconds_until_day_boundary(now) == 30
+
+
+class TestCachedViews:
+    def test_stale_is_served_from_cache(self, client):
+        client.get("/tasks/stale")
+        client.get("/tasks/stale")
+        assert _stats("stale_tasks") == {"hits": 1, "misses": 1}
+
+    def test_service_write_invalidates(self, client):
+        client.get("/tasks/carryover-candidates")
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        task = create_task(client, due_date=yesterday)
+        assert [t["id"] for t in client.get("/tasks/carryover-candidates").json()] == [task["id"]]
+
+        client.post(f"/tasks/{task['id']}/carryover", json={"action": "today"})
+        assert client.get("/tasks/carryover-candidates").json() == []
+        assert _stats("carryover_candidates")["hits"] == 0
+
+    def test_write_outside_services_misses_by_version(self, client, db):
+        task = create_task(client, priority="must")
+        assert client.get("/tasks/stale").json() == []
+
+        # サービス層を通らない書き込みでも変更カウンタでキーが変わる
+        row = db.get(Task, task["id"])
+        row.last_updated_at = datetime.utcnow() - timedelta(days=30)
+        db.commit()
+        assert [t["id"] for t in client.get("/tasks/stale").json()] == [task["id"]]
+
+    def test_today_due_tasks_are_plain_rows(self, client, db):
+        create_task(client, title="今日", due_date=date.today().isoformat())
+        first = push_service.get_today_due_tasks(db)
+        assert push_service.get_today_due_tasks(db) is first
+        assert [t["title"] for t in first] == ["今日"]
+
+    def test_not_stored_past_day_boundary(self, client, monkeypatch):
+        monkeypatch.setattr(view_cache_module, "seconds_until_day_boundary", lambda: 0)
+        client.get("/tasks/stale")
+        client.get("/tasks/stale")
+        assert _stats("stale_tasks")["hits"] == 0
+
+    def test_stats_endpoint(self, client):
+        client.get("/tasks/stale")
+        res = client.get("/cache/stats")
+        assert res.status_code == 200
+        body = res.json()
+        assert body["backend"] == "memory"
+        assert body["views"]["stale_tasks"]["misses"] >= 1